@@ -1,17 +1,35 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from src.identity import DEFAULT_IDENTITY_ROOT
 from src.ml_engine import ScoutBrain
+from src.storage import SnapshotStore, fingerprint
+# plotly & ValueTimeSeries di-import di dalam tab yang memakainya (cold start lebih cepat)
 
 # --- KONFIGURASI HALAMAN ---
 st.set_page_config(page_title="Garuda Scout AI", layout="wide")
 st.title("🇮🇩 Garuda Scout AI v5.1: Pro Scouting Suite")
 
 # --- LOAD DATA ---
+# Brain & time series dipakai bersama oleh semua sesi/user dalam satu proses server.
+# Cache di-key dengan sidik jari file data (mtime + ukuran): hanya di-load ulang jika file berubah.
+@st.cache_resource(max_entries=1, show_spinner="Memuat database pemain...")
+def load_brain(use_store, data_version):
+    if use_store:
+        # Hanya snapshot terbaru & kolom yang dipakai dashboard, dalam mode compact
+        return ScoutBrain(store_path=SnapshotStore.DEFAULT_ROOT, snapshots='latest',
+                          columns=ScoutBrain.REQUIRED_COLUMNS + ['scraped_date'], compact=True)
+    return ScoutBrain(compact=True)
+
+@st.cache_resource(max_entries=1, show_spinner="Memuat riwayat market value...")
+def load_trends(data_version):
+    from src.timeseries import ValueTimeSeries
+    return ValueTimeSeries(SnapshotStore.DEFAULT_ROOT)
+
 try:
-    brain = ScoutBrain()
-    df = brain.df
+    # Pakai snapshot store jika sudah ada, kalau tidak CSV master
+    use_store = SnapshotStore().exists()
+    data_source = SnapshotStore.DEFAULT_ROOT if use_store else 'data/processed/master_player_db.csv'
+    data_version = fingerprint(data_source)
+    brain = load_brain(use_store, data_version)
 except Exception as e:
     st.error(f"Gagal memuat data: {e}")
     st.stop()
@@ -23,211 +41,353 @@ st.sidebar.header("🛠️ Filter Utama")
 st.sidebar.caption("Filter ini mempengaruhi Tab Market Explorer & Data")
 
 # 1. Filter Negara/Liga
-all_leagues = sorted(df['league'].unique())
+# (Semua opsi diambil dari index liga -> tim -> posisi di ScoutBrain, tanpa scan dataframe)
+all_leagues = brain.leagues()
 sel_leagues = st.sidebar.multiselect("1. Pilih Negara", options=all_leagues, default=all_leagues)
 
-# Filter Data Sementara (Level 1)
-df_l1 = df[df['league'].isin(sel_leagues)]
-
 # 2. Filter Klub (Dinamis berdasarkan Liga yg dipilih)
 # Jika User belum pilih klub, anggap semua klub terpilih
-available_teams = sorted(df_l1['team'].unique())
+available_teams = brain.teams_in(sel_leagues)
 sel_teams = st.sidebar.multiselect("2. Pilih Klub (Opsional)", options=available_teams)
 
-# Filter Data Sementara (Level 2)
-if sel_teams:
-    df_l2 = df_l1[df_l1['team'].isin(sel_teams)]
-else:
-    df_l2 = df_l1 # Tidak ada filter klub
-
 # 3. Filter Posisi (Dinamis berdasarkan Klub yg dipilih)
-available_positions = sorted(df_l2['position'].unique())
+available_positions = brain.positions_in(sel_leagues, sel_teams or None)
 sel_positions = st.sidebar.multiselect("3. Pilih Posisi (Opsional)", options=available_positions)
 
-# --- FINAL FILTERED DATAFRAME ---
-# Ini adalah Dataframe utama yang akan dipakai di Tab 1 & Tab 5 (Data)
-main_df = df_l2.copy()
-if sel_positions:
-    main_df = main_df[main_df['position'].isin(sel_positions)]
+# --- FINAL FILTER ---
+# Filter utama yang dipakai di Tab 1 & Tab 5 (Data); dataframe-nya baru diambil di tab tsb
+main_filter = dict(leagues=sel_leagues, teams=sel_teams or None, positions=sel_positions or None)
 
-# Tampilkan Info Jumlah Data di Sidebar
+# Tampilkan Info Jumlah Data di Sidebar (jumlah ukuran grup di index, tanpa dataframe)
 st.sidebar.markdown("---")
-st.sidebar.metric("Data Terpantau", f"{len(main_df)} Pemain")
+st.sidebar.metric("Data Terpantau", f"{brain.count(**main_filter)} Pemain")
 
 # ==========================================
 # 📑 TABS MENU
 # ==========================================
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📊 Market Explorer", 
-    "🤖 Squad Planner", 
-    "🔄 Replacement Finder", 
+# on_change="rerun": hanya isi tab yang sedang dibuka yang dijalankan (tab.open)
+TAB_LABELS = [
+    "📊 Market Explorer",
+    "🤖 Squad Planner",
+    "🔄 Replacement Finder",
     "📱 Content Creator",
-    "📝 Database"
-])
+    "📝 Database",
+    "📈 Trending"
+]
+try:
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(TAB_LABELS, key="main_tab", on_change="rerun")
+except TypeError:
+    # Streamlit lama tanpa state tab: semua tab dirender seperti sebelumnya
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(TAB_LABELS)
+    for tab in (tab1, tab2, tab3, tab4, tab5, tab6):
+        tab.open = True
 
 # ==========================================
 # TAB 1: MARKET EXPLORER (Updated with Sidebar)
 # ==========================================
 with tab1:
-    st.subheader(f"Analisis Pasar: {', '.join(sel_leagues)}")
-    
-    if not main_df.empty:
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            # Grafik Scatter yang merespon filter Sidebar
-            fig = px.scatter(
-                main_df, 
-                x="position", 
-                y="market_value_est", 
-                color="league", 
-                size="market_value_est",
-                hover_data=['player_name', 'team', 'age', 'market_value_raw'],
-                title=f"Sebaran Harga Pemain ({len(main_df)} Data)",
-                labels={"market_value_est": "Valuasi (Est)", "position": "Posisi"},
-                height=550
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            
-        with col2:
-            st.info("💡 Insight Filter")
-            if sel_teams:
-                st.write(f"Menampilkan data spesifik untuk klub: **{', '.join(sel_teams)}**")
-            else:
-                st.write("Menampilkan seluruh klub di liga yang dipilih.")
-                
-            st.markdown("---")
-            avg_val = main_df['market_value_est'].mean()
-            st.metric("Rata-rata Harga", f"Rp {avg_val/1e6:,.0f} Jt")
-            st.metric("Pemain Termahal", f"Rp {main_df['market_value_est'].max()/1e9:,.1f} M")
-    else:
-        st.warning("Data kosong. Silakan atur ulang filter di Sidebar.")
+    if tab1.open:
+        import plotly.express as px
+
+        st.subheader(f"Analisis Pasar: {', '.join(sel_leagues)}")
+        main_df = brain.filter(**main_filter)
+
+        if not main_df.empty:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                # Grafik Scatter yang merespon filter Sidebar
+                fig = px.scatter(
+                    main_df, 
+                    x="position", 
+                    y="market_value_est", 
+                    color="league", 
+                    size="market_value_est",
+                    hover_data=['player_name', 'team', 'age', 'market_value_raw'],
+                    title=f"Sebaran Harga Pemain ({len(main_df)} Data)",
+                    labels={"market_value_est": "Valuasi (Est)", "position": "Posisi"},
+                    height=550
+                )
+                st.plotly_chart(fig, use_container_width=True)
+
+            with col2:
+                st.info("💡 Insight Filter")
+                if sel_teams:
+                    st.write(f"Menampilkan data spesifik untuk klub: **{', '.join(sel_teams)}**")
+                else:
+                    st.write("Menampilkan seluruh klub di liga yang dipilih.")
+
+                st.markdown("---")
+                # Dari tabel agregat (liga x tim x posisi), bukan scan ulang main_df
+                stats = brain.market_stats(leagues=sel_leagues, teams=sel_teams or None, positions=sel_positions or None)
+                st.metric("Rata-rata Harga", f"Rp {stats['avg_value']/1e6:,.0f} Jt")
+                st.metric("Pemain Termahal", f"Rp {stats['max_value']/1e9:,.1f} M")
+        else:
+            st.warning("Data kosong. Silakan atur ulang filter di Sidebar.")
 
 # ==========================================
 # TAB 2: SQUAD PLANNER (Independent)
 # ==========================================
 with tab2:
-    st.header("🤖 AI Squad Planner")
-    st.write("Cari pemain baru berdasarkan **Kebutuhan & Budget Tim**.")
-    st.caption("*(Fitur ini menggunakan database global, tidak terpengaruh filter sidebar)*")
-    
-    c1, c2 = st.columns(2)
-    with c1:
-        # Menggunakan df original agar bisa memilih tim di luar filter sidebar
-        target_team_planner = st.selectbox("Pilih Tim Target", options=sorted(df['team'].unique()), key="t2_team")
-    with c2:
-        target_pos_planner = st.selectbox("Posisi Dibutuhkan", options=sorted(df['position'].unique()), key="t2_pos")
-        
-    if st.button("🔍 Cari Pemain Sesuai Budget", key="btn_planner"):
-        with st.spinner("Menghitung budget & mencari kandidat..."):
-            recs_planner = brain.recommend_for_team_needs(target_team_planner, target_pos_planner)
-            
-        if recs_planner is not None and not recs_planner.empty:
-            st.success(f"Kandidat {target_pos_planner} yang pas untuk budget {target_team_planner}:")
-            st.table(recs_planner)
-        else:
-            st.warning("Tidak ditemukan kandidat yang cocok.")
+    if tab2.open:
+        st.header("🤖 AI Squad Planner")
+        st.write("Cari pemain baru berdasarkan **Kebutuhan & Budget Tim**.")
+        st.caption("*(Fitur ini menggunakan database global, tidak terpengaruh filter sidebar)*")
+
+        c1, c2 = st.columns(2)
+        with c1:
+            # Semua tim dari index brain (tanpa filter sidebar), agar bisa memilih tim di luar filter
+            target_team_planner = st.selectbox("Pilih Tim Target", options=brain.teams_in(), key="t2_team")
+        with c2:
+            target_pos_planner = st.selectbox("Posisi Dibutuhkan", options=brain.positions_in(), key="t2_pos")
+
+        if st.button("🔍 Cari Pemain Sesuai Budget", key="btn_planner"):
+            with st.spinner("Menghitung budget & mencari kandidat..."):
+                recs_planner = brain.recommend_for_team_needs(target_team_planner, target_pos_planner)
+
+            if recs_planner is not None and not recs_planner.empty:
+                st.success(f"Kandidat {target_pos_planner} yang pas untuk budget {target_team_planner}:")
+                st.table(recs_planner)
+            else:
+                st.warning("Tidak ditemukan kandidat yang cocok.")
+
+        st.markdown("---")
+        st.subheader("📋 Laporan Transfer Target (Semua Tim x Semua Posisi)")
+        c3, c4 = st.columns([1, 3])
+        with c3:
+            report_top_n = st.number_input("Kandidat per posisi", min_value=1, max_value=10, value=3, key="t2_report_topn")
+            report_leagues = st.multiselect("Liga tim target", options=brain.leagues(), default=brain.leagues(), key="t2_report_leagues")
+        if st.button("📋 Buat Laporan Liga", key="btn_planner_report"):
+            with st.spinner("Menyusun rekomendasi untuk semua tim..."):
+                report = brain.squad_planner_report(top_n=int(report_top_n), teams=brain.teams_in(report_leagues))
+            with c4:
+                st.success(f"{report['target_team'].nunique()} tim, {len(report)} rekomendasi")
+                st.dataframe(report.drop(columns='scout_score'), hide_index=True)
+                st.download_button("⬇️ Download CSV", report.to_csv(index=False), file_name="transfer_targets.csv", mime="text/csv")
 
 # ==========================================
 # TAB 3: REPLACEMENT FINDER (Player Specific)
 # ==========================================
 with tab3:
-    st.header("🔄 Replacement Finder")
-    st.write("Cari pengganti yang **identik** dengan pemain tertentu.")
-    
-    col_f1, col_f2, col_f3, col_f4 = st.columns(4)
-    # Filter khusus tab ini (agar user bisa cari pemain di luar filter sidebar)
-    with col_f1:
-        leagues_list = sorted(df['league'].unique())
-        sel_league_t3 = st.selectbox("1. Liga", options=leagues_list, key="t3_league")
-    with col_f2:
-        teams_in_league = sorted(df[df['league'] == sel_league_t3]['team'].unique())
-        sel_team_t3 = st.selectbox("2. Klub", options=teams_in_league, key="t3_team")
-    with col_f3:
-        pos_in_team = sorted(df[(df['league'] == sel_league_t3) & (df['team'] == sel_team_t3)]['position'].unique())
-        sel_pos_t3 = st.selectbox("3. Posisi", options=pos_in_team, key="t3_pos")
-    with col_f4:
-        players_final = sorted(df[(df['league'] == sel_league_t3) & (df['team'] == sel_team_t3) & (df['position'] == sel_pos_t3)]['player_name'].unique())
-        sel_player_t3 = st.selectbox("4. Pemain", options=players_final, key="t3_player")
-        
-    if st.button(f"🔍 Cari Pengganti {sel_player_t3}", key="btn_replace"):
-        similar_players = brain.get_similar_players(sel_player_t3, top_n=10)
-        if similar_players is not None:
-            st.success(f"Rekomendasi Pengganti untuk {sel_player_t3}:")
-            st.dataframe(similar_players, hide_index=True)
+    if tab3.open:
+        st.header("🔄 Replacement Finder")
+        st.write("Cari pengganti yang **identik** dengan pemain tertentu.")
+
+        replace_mode = st.radio("Mode", ["👤 Satu Pemain", "👥 Satu Skuad Penuh"], horizontal=True, key="t3_mode")
+
+        col_f1, col_f2, col_f3, col_f4 = st.columns(4)
+        # Filter khusus tab ini (agar user bisa cari pemain di luar filter sidebar)
+        with col_f1:
+            leagues_list = brain.leagues()
+            sel_league_t3 = st.selectbox("1. Liga", options=leagues_list, key="t3_league")
+        with col_f2:
+            teams_in_league = brain.teams_in(sel_league_t3)
+            sel_team_t3 = st.selectbox("2. Klub", options=teams_in_league, key="t3_team")
+        if "Satu Pemain" in replace_mode:
+            with col_f3:
+                pos_in_team = brain.positions_in(sel_league_t3, sel_team_t3)
+                sel_pos_t3 = st.selectbox("3. Posisi", options=pos_in_team, key="t3_pos")
+            with col_f4:
+                players_final = brain.players_in(sel_league_t3, sel_team_t3, sel_pos_t3)
+                sel_player_t3 = st.selectbox("4. Pemain", options=players_final, key="t3_player")
+
+            with st.expander("🎯 Filter Lanjutan (liga, umur, harga)"):
+                col_c1, col_c2, col_c3 = st.columns(3)
+                with col_c1:
+                    knn_leagues = st.multiselect("Liga Kandidat", options=leagues_list, key="t3_knn_leagues")
+                with col_c2:
+                    knn_max_age = st.number_input("Umur Maksimal (0 = bebas)", min_value=0, max_value=45, value=0, key="t3_knn_age")
+                with col_c3:
+                    knn_max_value = st.number_input("Harga Maksimal (Rp, 0 = bebas)", min_value=0, value=0, step=100000000, key="t3_knn_value")
+
+            if st.button(f"🔍 Cari Pengganti {sel_player_t3}", key="btn_replace"):
+                if knn_leagues or knn_max_age or knn_max_value:
+                    similar_players = brain.find_similar(
+                        sel_player_t3, top_n=10, leagues=knn_leagues or None,
+                        max_age=knn_max_age or None, max_value=knn_max_value or None)
+                else:
+                    similar_players = brain.get_similar_players(sel_player_t3, top_n=10)
+                if similar_players is not None:
+                    st.success(f"Rekomendasi Pengganti untuk {sel_player_t3}:")
+                    st.dataframe(similar_players, hide_index=True)
+                else:
+                    st.error("Data pemain tidak ditemukan.")
         else:
-            st.error("Data pemain tidak ditemukan.")
+            with col_f3:
+                top_n_squad = st.number_input("3. Kandidat per Pemain", min_value=1, max_value=20, value=3, key="t3_topn")
+
+            if st.button(f"🔍 Cari Pengganti Seluruh Skuad {sel_team_t3}", key="btn_replace_squad"):
+                with st.spinner("Menghitung pengganti untuk seluruh skuad..."):
+                    squad_replacements = brain.get_similar_players_batch(team_name=sel_team_t3, top_n=int(top_n_squad))
+                if not squad_replacements.empty:
+                    st.success(f"Rekomendasi Pengganti untuk skuad {sel_team_t3}:")
+                    st.dataframe(squad_replacements, hide_index=True)
+                else:
+                    st.error("Data skuad tidak ditemukan.")
 
 # ==========================================
 # TAB 4: CONTENT CREATOR
 # ==========================================
 with tab4:
-    st.header("📱 Content Creator Studio")
-    st.markdown("Generasi konten visual otomatis.")
-    
-    st.subheader("1. Fact Finding (Global Data)")
-    col_fact1, col_fact2 = st.columns(2)
-    
-    # Gunakan DF Original untuk Fact Finding agar valid secara statistik global
-    with col_fact1:
-        st.markdown("#### 💰 The Sultan Clubs")
-        team_values = df.groupby('team')['market_value_est'].sum().sort_values(ascending=False).head(5)
-        fig_sultan = px.bar(x=team_values.values/1e9, y=team_values.index, orientation='h', 
-                           title="Top 5 Skuad Termahal (Milyar Rp)", labels={'x':'Value (Milyar)', 'y':'Club'},
-                           color=team_values.values, color_continuous_scale='Viridis')
-        fig_sultan.update_layout(yaxis={'categoryorder':'total ascending'})
-        st.plotly_chart(fig_sultan, use_container_width=True)
-
-    with col_fact2:
-        st.markdown("#### 👶 The Young Guns")
-        team_age = df.groupby('team')['age'].mean().sort_values(ascending=True).head(5)
-        fig_age = px.bar(x=team_age.values, y=team_age.index, orientation='h',
-                        title="Top 5 Skuad Termuda", labels={'x':'Rata-rata Umur', 'y':'Club'},
-                        color=team_age.values, color_continuous_scale='Blues_r')
-        fig_age.update_layout(yaxis={'categoryorder':'total descending'})
-        st.plotly_chart(fig_age, use_container_width=True)
-
-    st.markdown("---")
-    st.subheader("2. Player to Watch Generator 📸")
-    
-    c_gen1, c_gen2 = st.columns([1, 2])
-    with c_gen1:
-        target_league_content = st.selectbox("Liga Target", options=sorted(df['league'].unique()))
-        criteria = st.radio("Tipe Konten", ["💎 Wonderkid", "🛡️ Senior Leader"])
-        generate_btn = st.button("🎲 Generate Visual!", type="primary")
-    
-    if generate_btn:
-        with c_gen2:
-            subset = df[df['league'] == target_league_content]
-            avg_val = subset['market_value_est'].mean()
-            
-            if "Wonderkid" in criteria:
-                candidates = subset[(subset['age'] <= 23) & (subset['market_value_est'] > avg_val)]
-                tag, desc = "#Wonderkid", "bintang muda"
-            else:
-                candidates = subset[(subset['age'] >= 30) & (subset['market_value_est'] > avg_val)]
-                tag, desc = "#Veteran", "pemain senior"
-            
-            if not candidates.empty:
-                player = candidates.sample(1).iloc[0]
-                
-                # Visualisasi Kotak Instagram
-                fig_ig = go.Figure()
-                fig_ig.add_trace(go.Bar(
-                    x=[player['age'], player['market_value_est']], y=['Umur', 'Market Value'],
-                    name=player['player_name'], orientation='h', marker_color='#E1306C'
-                ))
-                fig_ig.update_layout(title=f"PLAYER TO WATCH: {player['player_name']}", template="plotly_dark", height=400, width=400)
-                st.plotly_chart(fig_ig)
-                
-                caption = f"""🔥 PLAYER TO WATCH: {player['player_name']} 🔥\n\nNama: {player['player_name']}\nKlub: {player['team']}\nUmur: {player['age']}\nValue: {player['market_value_raw']}\n\n#GarudaScout {tag} #{player['team'].replace(' ','')}"""
-                st.text_area("Caption:", value=caption)
-            else:
-                st.warning("Belum ada kandidat di kategori ini.")
+    if tab4.open:
+        import plotly.express as px
+        import plotly.graph_objects as go
+
+        st.header("📱 Content Creator Studio")
+        st.markdown("Generasi konten visual otomatis.")
+
+        st.subheader("1. Fact Finding (Global Data)")
+        col_fact1, col_fact2 = st.columns(2)
+
+        # Fact Finding global dari tabel agregat per tim (dihitung sekali per snapshot)
+        team_summary = brain.aggregates['team_summary'].set_index('team')
+        with col_fact1:
+            st.markdown("#### 💰 The Sultan Clubs")
+            team_values = team_summary['total_value'].sort_values(ascending=False).head(5)
+            fig_sultan = px.bar(x=team_values.values/1e9, y=team_values.index, orientation='h', 
+                               title="Top 5 Skuad Termahal (Milyar Rp)", labels={'x':'Value (Milyar)', 'y':'Club'},
+                               color=team_values.values, color_continuous_scale='Viridis')
+            fig_sultan.update_layout(yaxis={'categoryorder':'total ascending'})
+            st.plotly_chart(fig_sultan, use_container_width=True)
+
+        with col_fact2:
+            st.markdown("#### 👶 The Young Guns")
+            team_age = team_summary['avg_age'].sort_values(ascending=True).head(5)
+            fig_age = px.bar(x=team_age.values, y=team_age.index, orientation='h',
+                            title="Top 5 Skuad Termuda", labels={'x':'Rata-rata Umur', 'y':'Club'},
+                            color=team_age.values, color_continuous_scale='Blues_r')
+            fig_age.update_layout(yaxis={'categoryorder':'total descending'})
+            st.plotly_chart(fig_age, use_container_width=True)
+
+        st.markdown("---")
+        st.subheader("2. Player to Watch Generator 📸")
+
+        c_gen1, c_gen2 = st.columns([1, 2])
+        with c_gen1:
+            target_league_content = st.selectbox("Liga Target", options=brain.leagues())
+            criteria = st.radio("Tipe Konten", ["💎 Wonderkid", "🛡️ Senior Leader"])
+            generate_btn = st.button("🎲 Generate Visual!", type="primary")
+
+        if generate_btn:
+            with c_gen2:
+                # Pool kandidat per liga sudah disiapkan di tabel agregat
+                if "Wonderkid" in criteria:
+                    candidates = brain.eligible(target_league_content, 'wonderkid')
+                    tag, desc = "#Wonderkid", "bintang muda"
+                else:
+                    candidates = brain.eligible(target_league_content, 'senior')
+                    tag, desc = "#Veteran", "pemain senior"
+
+                if not candidates.empty:
+                    player = candidates.sample(1).iloc[0]
+
+                    # Visualisasi Kotak Instagram
+                    fig_ig = go.Figure()
+                    fig_ig.add_trace(go.Bar(
+                        x=[player['age'], player['market_value_est']], y=['Umur', 'Market Value'],
+                        name=player['player_name'], orientation='h', marker_color='#E1306C'
+                    ))
+                    fig_ig.update_layout(title=f"PLAYER TO WATCH: {player['player_name']}", template="plotly_dark", height=400, width=400)
+                    st.plotly_chart(fig_ig)
+
+                    caption = f"""🔥 PLAYER TO WATCH: {player['player_name']} 🔥\n\nNama: {player['player_name']}\nKlub: {player['team']}\nUmur: {player['age']}\nValue: {player['market_value_raw']}\n\n#GarudaScout {tag} #{player['team'].replace(' ','')}"""
+                    st.text_area("Caption:", value=caption)
+                else:
+                    st.warning("Belum ada kandidat di kategori ini.")
 
 # ==========================================
 # TAB 5: DATABASE (Raw Data)
 # ==========================================
 with tab5:
-    st.header("📝 Database Pemain")
-    st.write("Data di bawah ini mengikuti filter Sidebar.")
-    st.dataframe(main_df)
+    if tab5.open:
+        st.header("📝 Database Pemain")
+        st.write("Data di bawah ini mengikuti filter Sidebar.")
+
+        # Pagination & sorting di server: hanya halaman yang terlihat yang dikirim ke browser
+        c_db1, c_db2, c_db3, c_db4 = st.columns(4)
+        with c_db1:
+            sort_col = st.selectbox("Urutkan", options=list(brain.df.columns),
+                                    index=list(brain.df.columns).index('market_value_est'), key="t5_sort")
+        with c_db2:
+            sort_dir = st.radio("Arah", ["⬇️ Terbesar", "⬆️ Terkecil"], horizontal=True, key="t5_dir")
+        with c_db3:
+            page_size = st.selectbox("Baris per Halaman", options=[25, 50, 100, 250], index=1, key="t5_page_size")
+
+        total_rows = brain.count(**main_filter)
+        n_pages = max(1, -(-total_rows // page_size))
+        # Filter/urutan/ukuran halaman berubah -> kembali ke halaman 1;
+        # data di-load ulang lebih sedikit -> jangan melewati halaman terakhir
+        page_state = (repr(main_filter), sort_col, sort_dir, page_size)
+        if st.session_state.get("t5_page_state") != page_state:
+            st.session_state["t5_page_state"] = page_state
+            st.session_state["t5_page"] = 1
+        elif st.session_state.get("t5_page", 1) > n_pages:
+            st.session_state["t5_page"] = n_pages
+        with c_db4:
+            page_no = st.number_input(f"Halaman (dari {n_pages})", min_value=1, max_value=n_pages, key="t5_page")
+
+        offset = (int(page_no) - 1) * page_size
+        total_rows, page_df = brain.page(**main_filter, sort_by=sort_col, ascending="Terkecil" in sort_dir,
+                                         offset=offset, limit=page_size)
+        st.caption(f"Baris {min(offset + 1, total_rows)}-{min(offset + page_size, total_rows)} dari {total_rows}")
+        st.dataframe(page_df, hide_index=True)
+
+# ==========================================
+# TAB 6: TRENDING (Riwayat Market Value)
+# ==========================================
+with tab6:
+    if tab6.open:
+        import plotly.express as px
+
+        st.header("📈 Trending Market Value")
+        if use_store:
+            # Di-key sidik jari store + registry player_id: snapshot baru / ditulis ulang atau
+            # selesai di-resolve ulang -> load ulang (registry hanya dibaca dari dashboard)
+            trends = load_trends((data_version, fingerprint(DEFAULT_IDENTITY_ROOT)))
+        else:
+            trends = None
+        if trends is None or len(trends.weeks) < 2:
+            st.info("Butuh minimal 2 snapshot di store. Jalankan: python -m src.storage migrate")
+        else:
+            st.caption(f"{len(trends.weeks)} snapshot mingguan: {trends.week_dates[0]:%d %b %Y} - {trends.week_dates[-1]:%d %b %Y}")
+
+            c_tr1, c_tr2, c_tr3 = st.columns(3)
+            with c_tr1:
+                trend_league = st.selectbox("Liga", options=["Semua"] + sorted(trends.players['league'].dropna().unique()), key="t6_league")
+            with c_tr2:
+                trend_pos = st.selectbox("Posisi", options=["Semua"] + sorted(trends.players['position'].dropna().unique()), key="t6_pos")
+            with c_tr3:
+                trend_weeks = st.slider("Rentang (minggu)", min_value=1, max_value=len(trends.weeks) - 1,
+                                        value=min(4, len(trends.weeks) - 1), key="t6_weeks")
+
+            league_arg = None if trend_league == "Semua" else trend_league
+            pos_arg = None if trend_pos == "Semua" else trend_pos
+            trend_cols = ['player_name', 'team', 'league', 'position', 'value_start', 'value_now', 'change', 'change_pct']
+
+            col_up, col_down = st.columns(2)
+            with col_up:
+                st.markdown("#### 🚀 Biggest Risers")
+                risers = trends.movers(10, trend_weeks, league_arg, pos_arg, direction='up')
+                if risers.empty:
+                    st.write("Tidak ada kenaikan di rentang ini.")
+                else:
+                    st.dataframe(risers[trend_cols], hide_index=True)
+            with col_down:
+                st.markdown("#### 📉 Biggest Fallers")
+                fallers = trends.movers(10, trend_weeks, league_arg, pos_arg, direction='down')
+                if fallers.empty:
+                    st.write("Tidak ada penurunan di rentang ini.")
+                else:
+                    st.dataframe(fallers[trend_cols], hide_index=True)
+
+            st.markdown("---")
+            st.subheader("Riwayat Value Pemain")
+            # Opsi = player_id (pemain senama di tim berbeda tetap terpisah)
+            trend_players = trends.players.sort_values(['player_name', 'team'])
+            history_player = st.selectbox("Pilih Pemain", options=trend_players.index.tolist(), key="t6_player",
+                                          format_func=lambda pid: f"{trend_players.at[pid, 'player_name']} ({trend_players.at[pid, 'team']})")
+            history = trends.history(history_player)
+            if history is not None:
+                fig_hist = px.line(x=history.index, y=history.values, markers=True,
+                                   labels={'x': 'Snapshot', 'y': 'Valuasi (Est)'},
+                                   title=f"Market Value: {history.name}")
+                st.plotly_chart(fig_hist, use_container_width=True)
@@ -0,0 +1,82 @@
+"""
+Micro-benchmark backend parsing HTML di halaman tim Transfermarkt tersimpan.
+
+    python -m benchmarks.bench_parsers [--pages DIR] [--repeat 20] [--json]
+
+Output: rows/detik & ms/halaman per backend, plus cek bahwa semua backend
+mengekstrak record yang identik dengan backend 'bs4' (referensi lama).
+"""
+import argparse
+import glob
+import json
+import os
+import time
+
+from src.parsers import HAS_LXML, PARSER_BACKENDS, get_parser
+
+DEFAULT_PAGES = os.path.join('tests', 'fixtures', 'transfermarkt')
+
+
+def load_team_pages(pages_dir):
+    paths = sorted(glob.glob(os.path.join(pages_dir, '**', 'verein', '**', '*.html'), recursive=True))
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def bench_backend(backend, pages, repeat):
+    parser = get_parser(backend)
+    results = [parser.squad(page) for page in pages]  # warm-up + hasil untuk verifikasi
+    n_rows = sum(len(rows or []) for _, rows in results)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            parser.squad(page)
+    elapsed = time.perf_counter() - start
+
+    return results, {
+        'backend': backend,
+        'pages': len(pages) * repeat,
+        'rows': n_rows * repeat,
+        'seconds': round(elapsed, 4),
+        'rows_per_sec': round(n_rows * repeat / elapsed, 1),
+        'ms_per_page': round(elapsed * 1000 / (len(pages) * repeat), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', default=DEFAULT_PAGES, help="Folder berisi halaman tim tersimpan (*/verein/*.html)")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help="Cetak hasil sebagai JSON")
+    args = parser.parse_args()
+
+    pages = load_team_pages(args.pages)
+    if not pages:
+        raise SystemExit(f"Tidak ada halaman tim di {args.pages}")
+
+    backends = [b for b in PARSER_BACKENDS if b != 'lxml' or HAS_LXML]
+    reference = None
+    report = []
+    for backend in backends:
+        results, stats = bench_backend(backend, pages, args.repeat)
+        if reference is None:
+            reference = results
+        stats['identical_to_bs4'] = results == reference
+        report.append(stats)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{len(pages)} halaman tim x {args.repeat} repeat")
+    print(f"{'backend':<14}{'rows/s':>12}{'ms/page':>10}{'identik':>10}")
+    for stats in report:
+        print(f"{stats['backend']:<14}{stats['rows_per_sec']:>12,.0f}{stats['ms_per_page']:>10.2f}{str(stats['identical_to_bs4']):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""
+Benchmark suite ScoutBrain & scraper di atas database sintetis (2k / 100k / 1M baris).
+
+    python -m benchmarks.bench_suite [--sizes 2k,100k,1m] [--repeat 100] [--out hasil.json] [--compare baseline.json]
+
+Per operasi dicatat: latency p50/p90/p99/mean/max (ms), throughput (operasi/detik,
+plus rows/detik untuk scraper) dan peak memory (MB, alokasi yang dilacak tracemalloc
+selama satu panggilan). Hasil ditulis sebagai JSON agar bisa dibandingkan antar run
+lewat --compare.
+
+Query ScoutBrain dipanggil tanpa memo & instrumentasi (inspect.unwrap) supaya
+yang diukur adalah komputasinya, bukan cache LRU.
+"""
+import argparse
+import contextlib
+import inspect
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_player_db, team_pages
+from src.knn_engine import ConstrainedKNN
+from src.ml_engine import ScoutBrain
+from src.scraper import RealScout
+
+SIZES = {'2k': 2_000, '100k': 100_000, '1m': 1_000_000}
+FIXTURE_PAGES = os.path.join('tests', 'fixtures', 'transfermarkt')
+BENCH_HOST = 'https://bench.transfermarkt.local'
+
+
+def summarize(latencies, peak_bytes, **extra):
+    lat = np.asarray(latencies) * 1000
+    total = lat.sum() / 1000
+    return {
+        'n': len(lat),
+        'p50_ms': round(float(np.percentile(lat, 50)), 3),
+        'p90_ms': round(float(np.percentile(lat, 90)), 3),
+        'p99_ms': round(float(np.percentile(lat, 99)), 3),
+        'mean_ms': round(float(lat.mean()), 3),
+        'max_ms': round(float(lat.max()), 3),
+        'throughput_per_sec': round(len(lat) / total, 2) if total > 0 else None,
+        'peak_mem_mb': round(peak_bytes / 2**20, 2),
+        **extra,
+    }
+
+
+def measure(fn, calls, warmup=1):
+    """Jalankan fn(*args) untuk setiap args di calls. Return (latencies detik, peak bytes 1 panggilan)."""
+    for args in calls[:warmup]:
+        fn(*args)
+    latencies = []
+    for args in calls:
+        start = time.perf_counter()
+        fn(*args)
+        latencies.append(time.perf_counter() - start)
+
+    # Peak memory diukur terpisah, tracemalloc memperlambat eksekusi
+    tracemalloc.start()
+    fn(*calls[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return latencies, peak
+
+
+def bench_brain(label, csv_path, repeat, load_repeat, seed):
+    rows = SIZES.get(label)
+    results = []
+
+    def record(operation, latencies, peak, **extra):
+        stats = summarize(latencies, peak, **extra)
+        results.append({'size': label, 'rows': rows, 'operation': operation, **stats})
+        print(f"   {operation:<28} p50 {stats['p50_ms']:>10.2f} ms   p99 {stats['p99_ms']:>10.2f} ms   peak {stats['peak_mem_mb']:>8.1f} MB")
+
+    latencies, peak = measure(lambda: ScoutBrain(data_path=csv_path), [()] * load_repeat, warmup=0)
+    record('brain_load', latencies, peak)
+
+    brain = ScoutBrain(data_path=csv_path)
+    df = brain.df
+    rng = np.random.default_rng(seed)
+    pick = lambda values: [values[i] for i in rng.integers(len(values), size=repeat)]
+
+    names = pick(df['player_name'].to_numpy())
+    record('get_similar_players', *measure(
+        lambda name: inspect.unwrap(ScoutBrain.get_similar_players)(brain, name, 10), [(n,) for n in names]))
+
+    record('knn_build', *measure(lambda: ConstrainedKNN(df, features=brain.features), [()], warmup=0))
+    leagues = brain.leagues()
+    league_pairs = [list(rng.choice(leagues, size=min(2, len(leagues)), replace=False)) for _ in range(repeat)]
+    record('find_similar_constrained', *measure(
+        lambda name, lg: inspect.unwrap(ScoutBrain.find_similar)(brain, name, 10, leagues=lg, max_age=25, max_value=5e9),
+        list(zip(names, league_pairs))))
+
+    teams = pick(df['team'].to_numpy())
+    positions = pick(df['position'].to_numpy())
+    record('recommend_for_team_needs', *measure(
+        lambda team, pos: inspect.unwrap(ScoutBrain.recommend_for_team_needs)(brain, team, pos, 5), list(zip(teams, positions))))
+
+    record('similar_players_batch_team', *measure(
+        lambda team: inspect.unwrap(ScoutBrain.get_similar_players_batch)(brain, team_name=team, top_n=3), [(t,) for t in teams[:max(1, repeat // 10)]]))
+
+    # Cascade filter sidebar app.py: liga -> klub -> posisi -> DataFrame terfilter
+    def cascade(league):
+        team = brain.teams_in([league])[0]
+        position = brain.positions_in([league], [team])[0]
+        return inspect.unwrap(ScoutBrain.filter)(brain, leagues=[league], teams=[team], positions=[position])
+    record('filter_cascade', *measure(cascade, [(lg,) for lg in pick(leagues)]))
+
+    return results
+
+
+def bench_scraper(label, pages, repeat):
+    """scrape_players_from_team lewat RealScout (mode replay dari cache lokal) untuk halaman tersimpan"""
+    with tempfile.TemporaryDirectory() as tmp:
+        scout = RealScout(base_url=BENCH_HOST, raw_path=os.path.join(tmp, 'raw'), processed_path=os.path.join(tmp, 'processed'),
+                          cache_dir=os.path.join(tmp, 'cache'), replay=True, store_path=os.path.join(tmp, 'store'))
+        urls = []
+        for i, content in enumerate(pages):
+            url = f"{BENCH_HOST}/team/startseite/verein/{i}"
+            scout.cache.store(url, content)
+            urls.append(url)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            n_rows = sum(len(scout.scrape_players_from_team(url, 'Indonesia')) for url in urls)
+            calls = [(url,) for url in urls] * repeat
+            latencies, peak = measure(lambda url: scout.scrape_players_from_team(url, 'Indonesia'), calls)
+
+    stats = summarize(latencies, peak, parser=scout.parser.name,
+                      rows_per_sec=round(n_rows * repeat / sum(latencies), 1))
+    print(f"   {'scrape_players_from_team':<28} p50 {stats['p50_ms']:>10.2f} ms   {stats['rows_per_sec']:>10,.0f} rows/s ({label})")
+    return {'size': label, 'rows': n_rows, 'operation': 'scrape_players_from_team', **stats}
+
+
+def load_fixture_pages(pages_dir):
+    pages = []
+    for root, _, files in os.walk(pages_dir):
+        if os.sep + 'verein' + os.sep in root + os.sep:
+            for name in sorted(files):
+                with open(os.path.join(root, name), 'rb') as f:
+                    pages.append(f.read())
+    return pages
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline_path):
+    """Cetak rasio p50 & peak memory terhadap run sebelumnya (>1 = lebih lambat/boros)"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['size'], r['operation']): r for r in json.load(f)['results']}
+    print(f"\n📊 Dibanding {baseline_path}")
+    print(f"{'size':<10}{'operation':<30}{'p50 x':>8}{'p99 x':>8}{'mem x':>8}")
+    for r in report['results']:
+        old = baseline.get((r['size'], r['operation']))
+        if old is None:
+            continue
+        ratio = lambda key: r[key] / old[key] if old[key] else float('nan')
+        print(f"{r['size']:<10}{r['operation']:<30}{ratio('p50_ms'):>8.2f}{ratio('p99_ms'):>8.2f}{ratio('peak_mem_mb'):>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='2k,100k,1m', help=f"Ukuran database sintetis ({', '.join(SIZES)})")
+    parser.add_argument('--repeat', type=int, default=100, help="Jumlah query per operasi")
+    parser.add_argument('--load-repeat', type=int, default=3, help="Jumlah load ScoutBrain per ukuran")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', help="Simpan/pakai ulang CSV sintetis di folder ini (default: folder sementara)")
+    parser.add_argument('--pages', default=FIXTURE_PAGES, help="Folder halaman tim tersimpan untuk benchmark scraper")
+    parser.add_argument('--out', help="Tulis hasil JSON ke file ini (default: stdout)")
+    parser.add_argument('--compare', help="JSON hasil run sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    labels = [s.strip().lower() for s in args.sizes.split(',') if s.strip()]
+    unknown = [s for s in labels if s not in SIZES]
+    if unknown:
+        raise SystemExit(f"Ukuran tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(SIZES)})")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        os.makedirs(data_dir, exist_ok=True)
+
+        for label in labels:
+            csv_path = os.path.join(data_dir, f"players_{label}_seed{args.seed}.csv")
+            if not os.path.exists(csv_path):
+                print(f"🧪 Generate database sintetis {label} ({SIZES[label]:,} baris)...")
+                df = generate_player_db(SIZES[label], seed=args.seed)
+                df.to_csv(csv_path, index=False)
+            print(f"⏱️ ScoutBrain @ {label}")
+            load_repeat = 1 if SIZES[label] >= 1_000_000 else args.load_repeat
+            report['results'] += bench_brain(label, csv_path, args.repeat, load_repeat, args.seed)
+
+        print("⏱️ Scraper")
+        fixture_pages = load_fixture_pages(args.pages)
+        if fixture_pages:
+            report['results'].append(bench_scraper('fixtures', fixture_pages, max(1, args.repeat // 10)))
+        synthetic_pages = list(team_pages(generate_player_db(2_000, seed=args.seed), max_teams=20).values())
+        report['results'].append(bench_scraper('synthetic', synthetic_pages, max(1, args.repeat // 10)))
+
+    # ru_maxrss: KB di Linux, byte di macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    report['meta']['max_rss_mb'] = round(max_rss / (2**20 if platform.system() == 'Darwin' else 2**10), 1)
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"\n💾 Hasil disimpan ke {args.out}")
+    else:
+        print(output)
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
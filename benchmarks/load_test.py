@@ -0,0 +1,170 @@
+"""
+Load test untuk layanan query (src.service) terhadap instance lokal.
+
+    python -m benchmarks.load_test [--url http://127.0.0.1:8765] [--concurrency 16] [--requests 5000]
+    python -m benchmarks.load_test --spawn [--store data/store/snapshots]   # jalankan instance sendiri
+
+Campuran query (similar / similar + filter / team-needs / filter / market-stats) dibangun
+dari data instance itu sendiri. --distinct membatasi jumlah query unik sehingga
+rasio hit cache LRU mendekati pola pemakaian nyata (banyak query berulang).
+Dilaporkan: throughput (request/detik, wall clock), latency p50/p90/p99/max per endpoint
+dan total, jumlah error, serta statistik cache dari /health.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+import numpy as np
+
+# Bobot tiap jenis query di campuran load test
+MIX = {'similar': 0.35, 'similar_filtered': 0.15, 'team_needs': 0.25, 'filter': 0.15, 'market_stats': 0.10}
+
+
+def get_json(base_url, path, params=None, timeout=30):
+    url = f"{base_url}{path}" + (f"?{urlencode(params)}" if params else '')
+    with urlopen(url, timeout=timeout) as resp:
+        return json.loads(resp.read())
+
+
+def build_queries(base_url, distinct, seed=42):
+    """Daftar (endpoint, path + query string) unik dari liga/tim/posisi/pemain yang ada di instance"""
+    rng = random.Random(seed)
+    leagues = get_json(base_url, '/leagues')
+    teams = get_json(base_url, '/teams')
+    positions = get_json(base_url, '/positions')
+    players = [r['player_name'] for r in get_json(base_url, '/filter', {'limit': 1000})['rows']]
+
+    makers = {
+        'similar': lambda: {'player': rng.choice(players), 'top_n': 10},
+        'similar_filtered': lambda: {'player': rng.choice(players), 'top_n': 10, 'max_age': rng.choice([23, 25, 30]),
+                                     'leagues': ','.join(rng.sample(leagues, min(2, len(leagues))))},
+        'team_needs': lambda: {'team': rng.choice(teams), 'position': rng.choice(positions), 'top_n': 5},
+        'filter': lambda: {'leagues': rng.choice(leagues), 'positions': rng.choice(positions), 'limit': 100},
+        'market_stats': lambda: {'leagues': rng.choice(leagues), 'teams': rng.choice(teams)},
+    }
+    paths = {'similar': '/similar', 'similar_filtered': '/similar', 'team_needs': '/team-needs',
+             'filter': '/filter', 'market_stats': '/market-stats'}
+    kinds = rng.choices(list(MIX), weights=list(MIX.values()), k=distinct)
+    return [(kind, f"{paths[kind]}?{urlencode(makers[kind]())}") for kind in kinds]
+
+
+def percentiles(latencies):
+    lat = np.asarray(latencies) * 1000
+    return {
+        'n': len(lat),
+        'p50_ms': round(float(np.percentile(lat, 50)), 3),
+        'p90_ms': round(float(np.percentile(lat, 90)), 3),
+        'p99_ms': round(float(np.percentile(lat, 99)), 3),
+        'max_ms': round(float(lat.max()), 3),
+    }
+
+
+def run_load(base_url, queries, n_requests, concurrency, seed=42):
+    """Kirim n_requests (acak dari queries) dengan `concurrency` klien paralel"""
+    rng = random.Random(seed)
+    plan = [rng.choice(queries) for _ in range(n_requests)]
+    results = []
+    lock = threading.Lock()
+
+    def send(item):
+        kind, path = item
+        start = time.perf_counter()
+        try:
+            with urlopen(Request(f"{base_url}{path}"), timeout=60) as resp:
+                resp.read()
+                status = resp.status
+        except HTTPError as e:
+            status = e.code
+        except OSError:
+            status = None
+        with lock:
+            results.append((kind, status, time.perf_counter() - start))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, plan))
+    wall = time.perf_counter() - start
+
+    by_kind = {}
+    for kind, status, latency in results:
+        by_kind.setdefault(kind, []).append(latency)
+    errors = sum(1 for _, status, _ in results if status != 200)
+    return {
+        'requests': len(results),
+        'concurrency': concurrency,
+        'wall_s': round(wall, 3),
+        'throughput_per_sec': round(len(results) / wall, 2),
+        'errors': errors,
+        'total': percentiles([r[2] for r in results]),
+        'endpoints': {kind: percentiles(lat) for kind, lat in sorted(by_kind.items())},
+    }
+
+
+def spawn_service(store, csv, workers, cache_size):
+    """Jalankan src.service di thread background pada port bebas. Return (base_url, server)."""
+    from src.ml_engine import ScoutBrain
+    from src.service import PooledHTTPServer, ScoutService, make_handler
+
+    if csv:
+        factory = lambda: ScoutBrain(data_path=csv, compact=True)
+    else:
+        factory = lambda: ScoutBrain(store_path=store, snapshots='latest', compact=True)
+    service = ScoutService(factory, cache_size=cache_size)
+    server = PooledHTTPServer(('127.0.0.1', 0), make_handler(service), workers=workers)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8765', help="Alamat instance src.service")
+    parser.add_argument('--spawn', action='store_true', help="Jalankan instance lokal sendiri (abaikan --url)")
+    parser.add_argument('--store', default='data/store/snapshots', help="Snapshot store untuk --spawn")
+    parser.add_argument('--csv', default=None, help="CSV master untuk --spawn (bukan store)")
+    parser.add_argument('--workers', type=int, default=8, help="Ukuran thread pool instance --spawn")
+    parser.add_argument('--cache-size', type=int, default=1024, help="Ukuran cache LRU instance --spawn")
+    parser.add_argument('--concurrency', type=int, default=16, help="Jumlah klien paralel")
+    parser.add_argument('--requests', type=int, default=5000, help="Total request")
+    parser.add_argument('--distinct', type=int, default=500, help="Jumlah query unik dalam campuran")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=None, help="Simpan hasil sebagai JSON")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if args.spawn:
+        base_url, server = spawn_service(args.store, args.csv, args.workers, args.cache_size)
+
+    try:
+        queries = build_queries(base_url, args.distinct, args.seed)
+        report = run_load(base_url, queries, args.requests, args.concurrency, args.seed)
+        report['url'] = base_url
+        report['cache'] = get_json(base_url, '/health')['cache']
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    print(f"\n⚡ {report['requests']} request, {report['concurrency']} klien -> "
+          f"{report['throughput_per_sec']:,.1f} req/detik, p99 {report['total']['p99_ms']:.1f} ms, "
+          f"{report['errors']} error")
+    print(f"{'endpoint':<18}{'n':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for kind, stats in list(report['endpoints'].items()) + [('TOTAL', report['total'])]:
+        print(f"{kind:<18}{stats['n']:>7}{stats['p50_ms']:>10.2f}{stats['p90_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+    cache = report['cache']
+    print(f"🗄️ Cache: {cache['entries']} entri, hit rate {cache['hit_rate']}")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Hasil disimpan ke {args.out}")
+
+
+if __name__ == '__main__':
+    main()
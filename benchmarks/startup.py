@@ -0,0 +1,135 @@
+"""
+Waktu cold start dashboard (app.py), diukur di proses Python baru per percobaan.
+
+    python -m benchmarks.startup [--repeat 5] [--out startup.json] [--compare baseline.json]
+
+Per percobaan dicatat:
+- import_s       : import streamlit + modul src yang di-import app.py di level atas
+- first_paint_s  : run pertama app.py lewat streamlit AppTest (cache kosong: load data,
+                   sidebar & tab default) -> proxy time to first paint
+- process_s      : wall clock dari start proses sampai run pertama selesai
+- rerun_s        : run kedua (cache_resource sudah hangat), misal setelah klik widget
+- tab_s          : durasi run saat masing-masing tab dibuka
+Dilaporkan median & maks dari semua percobaan. Hasil JSON bisa dibandingkan antar commit.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+APP_PATH = 'app.py'
+
+
+def child(app_path):
+    """Satu percobaan cold start (dijalankan di proses baru). Cetak hasil sebagai JSON."""
+    start = time.perf_counter()
+    import streamlit  # noqa: F401
+    from src import ml_engine, storage  # noqa: F401
+    import_s = time.perf_counter() - start
+
+    from streamlit.testing.v1 import AppTest
+
+    t = time.perf_counter()
+    at = AppTest.from_file(os.path.abspath(app_path), default_timeout=300).run()
+    first_paint_s = time.perf_counter() - t
+    errors = [e.message for e in at.exception]
+
+    t = time.perf_counter()
+    at.run()
+    rerun_s = time.perf_counter() - t
+
+    tab_s = {}
+    labels = [tab.label for tab in at.tabs]
+    for label in labels:
+        at.session_state['main_tab'] = label
+        t = time.perf_counter()
+        at.run()
+        tab_s[label] = time.perf_counter() - t
+        errors += [e.message for e in at.exception]
+
+    print(json.dumps({
+        'import_s': import_s,
+        'first_paint_s': first_paint_s,
+        'rerun_s': rerun_s,
+        'tab_s': tab_s,
+        'errors': errors,
+    }))
+
+
+def run_trial(app_path):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-m', 'benchmarks.startup', '--child', '--app', app_path],
+                          capture_output=True, text=True)
+    process_s = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"Percobaan gagal:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result['process_s'] = process_s
+    return result
+
+
+def summarize(trials):
+    def stats(values):
+        return {'median_s': round(float(np.median(values)), 3), 'max_s': round(float(np.max(values)), 3)}
+
+    report = {key: stats([t[key] for t in trials]) for key in ('import_s', 'first_paint_s', 'process_s', 'rerun_s')}
+    report['tab_s'] = {label: stats([t['tab_s'][label] for t in trials]) for label in trials[0]['tab_s']}
+    report['errors'] = sorted({e for t in trials for e in t['errors']})
+    return report
+
+
+def compare(report, baseline_path):
+    """Cetak rasio median terhadap run sebelumnya (>1 = lebih lambat)"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    print(f"\n📏 Dibandingkan dengan {baseline_path}:")
+    for key in ('import_s', 'first_paint_s', 'process_s', 'rerun_s'):
+        if key in baseline:
+            before, after = baseline[key]['median_s'], report[key]['median_s']
+            print(f"   {key:<15}{before:>8.3f}s -> {after:>8.3f}s  ({after / before:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help="Jumlah percobaan cold start (proses baru)")
+    parser.add_argument('--app', default=APP_PATH, help="Path script Streamlit")
+    parser.add_argument('--out', default=None, help="Simpan hasil sebagai JSON")
+    parser.add_argument('--compare', default=None, help="JSON hasil run sebelumnya")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.app)
+        return
+
+    trials = []
+    for i in range(args.repeat):
+        trials.append(run_trial(args.app))
+        print(f"⏱️ Percobaan {i + 1}/{args.repeat}: first paint {trials[-1]['first_paint_s']:.2f}s, "
+              f"proses {trials[-1]['process_s']:.2f}s")
+
+    report = summarize(trials)
+    print(f"\n🚀 Cold start app.py (median dari {args.repeat} proses):")
+    for key in ('import_s', 'first_paint_s', 'process_s', 'rerun_s'):
+        print(f"   {key:<15}{report[key]['median_s']:>8.3f}s  (maks {report[key]['max_s']:.3f}s)")
+    for label, stats in report['tab_s'].items():
+        print(f"   tab {label:<24}{stats['median_s']:>8.3f}s")
+    if report['errors']:
+        print(f"❌ Error: {report['errors']}")
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump({'meta': {'python': sys.version.split()[0], 'repeat': args.repeat,
+                                'date': time.strftime('%Y-%m-%dT%H:%M:%S')}, 'results': report}, f, indent=2)
+        print(f"💾 Hasil disimpan ke {args.out}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
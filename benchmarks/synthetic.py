@@ -0,0 +1,175 @@
+"""
+Generator database pemain sintetis berbentuk master_player_db.csv, plus
+halaman skuad Transfermarkt tiruan untuk benchmark scraper.
+
+    python -m benchmarks.synthetic --rows 100000 --out data/bench/players_100k.csv [--html-dir DIR --html-teams 50]
+
+Distribusi dibuat mirip data asli: ~31 pemain per tim, ~16 tim per liga,
+frekuensi posisi sama dengan master DB, ~58% umur tidak diketahui (0),
+~13% market value "-" dan sisanya log-normal di sekitar Rp2 Mlyr.
+"""
+import argparse
+import html
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.market_value import format_market_values, parse_market_values
+
+COLUMNS = ['player_name', 'team', 'league_country', 'position', 'age',
+           'market_value_raw', 'market_value_est', 'scraped_date']
+
+# Frekuensi posisi di master DB (mei 2026)
+POSITIONS = {
+    'Bek-Tengah': 308, 'Kiper': 243, 'Depan-Tengah': 222, 'Gel. Tengah': 216,
+    'Sayap Kanan': 154, 'Bek-Kanan': 152, 'Gel. Bertahan': 151, 'Bek-Kiri': 147,
+    'Sayap Kiri': 143, 'Gel. Serang': 109, 'Gelandang Kanan': 22, 'Gelandang Kiri': 19,
+    'Gelandang': 13, 'Penyerang': 7, 'Depan-Kedua': 6, 'Bek': 5,
+}
+REAL_LEAGUES = ['Indonesia', 'Thailand', 'Malaysia', 'Vietnam']
+TEAMS_PER_LEAGUE = 16
+SQUAD_MEAN, SQUAD_STD, SQUAD_MIN, SQUAD_MAX = 31, 3.3, 24, 42
+
+AGE_UNKNOWN_RATE = 0.58
+AGE_MEAN, AGE_STD = 26, 7.3
+VALUE_UNKNOWN_RATE = 0.135
+LOG_VALUE_MEAN, LOG_VALUE_STD = 21.48, 0.85
+
+FIRST_NAMES = [
+    'Adi', 'Andrian', 'Bagas', 'Bayu', 'Dimas', 'Egy', 'Evan', 'Fachruddin', 'Hansamu', 'Irfan',
+    'Marselino', 'Pratama', 'Rizky', 'Witan', 'Yakob', 'Asnawi', 'Ernando', 'Ramadhan', 'Saddil', 'Sandy',
+    'Chanathip', 'Supachok', 'Theerathon', 'Teerasil', 'Ekanit', 'Suphanat', 'Kawin', 'Pansa', 'Sarach', 'Worachit',
+    'Quang', 'Van', 'Duc', 'Tien', 'Hoang', 'Cong', 'Xuan', 'Minh', 'Thanh', 'Tuan',
+    'Safawi', 'Arif', 'Faisal', 'Syamer', 'Akhyar', 'Brendan', 'Dion', 'Matthew', 'Lucas', 'Victor',
+]
+LAST_NAMES = [
+    'Satryo', 'Casvari', 'Arhan', 'Ferdinan', 'Alfeandra', 'Marhaen', 'Hubner', 'Dendi', 'Sayuri', 'Struick',
+    'Songkrasin', 'Hemviboon', 'Bunmathan', 'Dangda', 'Vanggruen', 'Mueanta', 'Thamsatchanan', 'Phromrut', 'Yooyen', 'Kanitsribampen',
+    'Nguyen', 'Tran', 'Le', 'Pham', 'Hoang', 'Phan', 'Vu', 'Dang', 'Bui', 'Do',
+    'Rasid', 'Halim', 'Halil', 'Rashid', 'Lee', 'Davies', 'Cardozo', 'Frigeri', 'Clough', 'Creevey',
+]
+CITIES = [
+    'Arema', 'Bali', 'Bandung', 'Bangkok', 'Buriram', 'Chiangrai', 'Da Nang', 'Hanoi', 'Johor', 'Kedah',
+    'Kuala Lumpur', 'Madura', 'Makassar', 'Medan', 'Penang', 'Port', 'Rayong', 'Sabah', 'Saigon', 'Selangor',
+]
+CLUB_SUFFIXES = ['FC', 'United', 'City', 'Athletic', 'Warriors', 'Raya']
+
+
+def generate_player_db(n_rows, seed=42, scraped_date='2026-05-04'):
+    """DataFrame sintetis n_rows baris dengan kolom & distribusi seperti master_player_db.csv"""
+    rng = np.random.default_rng(seed)
+
+    # Ukuran skuad per tim, lalu potong agar total tepat n_rows
+    n_teams = max(1, int(np.ceil(n_rows / SQUAD_MEAN)) + 1)
+    squad_sizes = np.clip(np.rint(rng.normal(SQUAD_MEAN, SQUAD_STD, n_teams)), SQUAD_MIN, SQUAD_MAX).astype(int)
+    team_idx = np.repeat(np.arange(n_teams), squad_sizes)
+    while len(team_idx) < n_rows:
+        team_idx = np.concatenate([team_idx, np.full(SQUAD_MEAN, team_idx[-1] + 1)])
+    team_idx = team_idx[:n_rows]
+
+    team_names = np.array([f"{CITIES[t % len(CITIES)]} {CLUB_SUFFIXES[(t // len(CITIES)) % len(CLUB_SUFFIXES)]} {t // (len(CITIES) * len(CLUB_SUFFIXES)) + 1}"
+                           for t in range(team_idx[-1] + 1)])
+    league_of_team = np.arange(team_idx[-1] + 1) // TEAMS_PER_LEAGUE
+    league_names = np.array([REAL_LEAGUES[i] if i < len(REAL_LEAGUES) else f"Liga Sintetis {i:04d}"
+                             for i in range(league_of_team[-1] + 1)])
+
+    positions = np.array(list(POSITIONS))
+    weights = np.array(list(POSITIONS.values()), dtype=float)
+    position = positions[rng.choice(len(positions), n_rows, p=weights / weights.sum())]
+
+    age = np.clip(np.rint(rng.normal(AGE_MEAN, AGE_STD, n_rows)), 16, 44).astype('int64')
+    age[rng.random(n_rows) < AGE_UNKNOWN_RATE] = 0
+
+    # Format 2 desimal seperti Transfermarkt, lalu parse ulang agar raw == est
+    value = np.exp(rng.normal(LOG_VALUE_MEAN, LOG_VALUE_STD, n_rows))
+    value[rng.random(n_rows) < VALUE_UNKNOWN_RATE] = 0
+    raw = format_market_values(value)
+
+    names = pd.Series(rng.choice(FIRST_NAMES, n_rows)) + ' ' + pd.Series(rng.choice(LAST_NAMES, n_rows))
+    dup = names.groupby(names).cumcount()
+    names = names.where(dup == 0, names + ' ' + (dup + 1).astype(str))
+
+    return pd.DataFrame({
+        'player_name': names.to_numpy(),
+        'team': team_names[team_idx],
+        'league_country': league_names[league_of_team[team_idx]],
+        'position': position,
+        'age': age,
+        'market_value_raw': raw,
+        'market_value_est': parse_market_values(raw).to_numpy(),
+        'scraped_date': scraped_date,
+    }, columns=COLUMNS)
+
+
+def render_team_page(team_name, squad):
+    """HTML halaman skuad ala Transfermarkt (struktur sama dengan tests/fixtures) untuk satu tim"""
+    rows = []
+    for i, player in enumerate(squad.itertuples(index=False)):
+        name = html.escape(player.player_name)
+        slug = player.player_name.lower().replace(' ', '-')
+        age = player.age if player.age else '-'
+        rows.append(
+            f'<tr class="{"odd" if i % 2 == 0 else "even"}">\n'
+            f'<td class="zentriert rueckennummer" title="{html.escape(player.position)}"><div class="rn_nummer">-</div></td>\n'
+            f'<td class="posrela"><table class="inline-table"><tr><td rowspan="2"><img title="{name}" alt="{name}"></td>'
+            f'<td class="hauptlink"><a href="/{slug}/profil/spieler/{i}">\n                        {name}                    </a></td></tr>'
+            f'<tr><td>{html.escape(player.position)}</td></tr></table></td>\n'
+            f'<td class="zentriert">{age}</td>\n'
+            f'<td class="zentriert"><img title="Indonesia" alt="Indonesia" class="flaggenrahmen"></td>\n'
+            f'<td class="rechts hauptlink"><a href="/{slug}/marktwertverlauf/spieler/{i}">{html.escape(player.market_value_raw)}</a></td>\n'
+            f'</tr>')
+    return (
+        '<!DOCTYPE html>\n<html lang="id"><head><meta charset="utf-8"><title>'
+        f'{html.escape(team_name)} - Profil klub | Transfermarkt</title></head><body>\n<main>\n'
+        '<header class="data-header"><div class="data-header__headline-container">'
+        f'<h1 class="data-header__headline-wrapper data-header__headline-wrapper--oswald">\n                        {html.escape(team_name)}\n            </h1></div></header>\n'
+        '<div id="yw1" class="grid-view"><table class="items">\n'
+        '<thead><tr><th>#</th><th>Pemain</th><th>Umur</th><th>Kewarganegaraan</th><th>Nilai pasar</th></tr></thead>\n<tbody>\n'
+        + '\n'.join(rows) +
+        '\n</tbody></table></div>\n</main></body></html>\n')
+
+
+def team_pages(df, max_teams=None):
+    """Dict {nama tim: HTML bytes} untuk (max_teams pertama) tim di df"""
+    pages = {}
+    for team, squad in df.groupby('team', sort=False):
+        if max_teams is not None and len(pages) >= max_teams:
+            break
+        pages[team] = render_team_page(team, squad).encode('utf-8')
+    return pages
+
+
+def write_team_pages(df, out_dir, max_teams=None):
+    """Simpan halaman skuad sintetis ke out_dir/<slug>/startseite/verein/<id>/saison_id/2025.html"""
+    paths = []
+    for i, (team, content) in enumerate(team_pages(df, max_teams).items()):
+        path = os.path.join(out_dir, team.lower().replace(' ', '-'), 'startseite', 'verein', str(i), 'saison_id', '2025.html')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', required=True, help="Path CSV output")
+    parser.add_argument('--html-dir', help="Simpan juga halaman skuad sintetis ke folder ini")
+    parser.add_argument('--html-teams', type=int, default=50, help="Jumlah tim yang dirender ke HTML")
+    args = parser.parse_args()
+
+    df = generate_player_db(args.rows, seed=args.seed)
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    df.to_csv(args.out, index=False)
+    print(f"💾 {len(df)} baris, {df['team'].nunique()} tim, {df['league_country'].nunique()} liga -> {args.out}")
+
+    if args.html_dir:
+        paths = write_team_pages(df, args.html_dir, args.html_teams)
+        print(f"📄 {len(paths)} halaman skuad -> {args.html_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+import argparse
+import glob
+import json
+import os
+
+import pandas as pd
+
+from src.storage import SnapshotStore
+
+DEFAULT_AGGREGATES_ROOT = 'data/store/aggregates'
+
+# Kategori "Player to Watch": umur & harus di atas rata-rata value liganya
+CATEGORIES = {
+    'wonderkid': lambda age: age <= 23,
+    'senior': lambda age: age >= 30,
+}
+TABLES = ['team_summary', 'league_summary', 'group_summary', 'eligibility']
+
+
+def _league_col(df):
+    return 'league_country' if 'league_country' in df.columns else 'league'
+
+
+def compute_aggregates(df):
+    """
+    Tabel ringkasan untuk dashboard, dihitung sekali per snapshot:
+    - team_summary   : per tim -> liga, jumlah pemain, total/rata-rata/maks value, rata-rata umur
+    - league_summary : per liga -> jumlah pemain & tim, total/rata-rata/maks value, rata-rata umur
+    - group_summary  : per liga + tim + posisi -> jumlah pemain, total & maks value
+                       (cukup untuk statistik Market Explorer di filter apapun)
+    - eligibility    : kandidat Wonderkid/Senior per liga (value > rata-rata liga)
+    """
+    df = df.rename(columns={_league_col(df): 'league'})
+
+    team_summary = df.groupby('team', sort=True, observed=True).agg(
+        league=('league', 'first'),
+        players=('player_name', 'size'),
+        total_value=('market_value_est', 'sum'),
+        avg_value=('market_value_est', 'mean'),
+        max_value=('market_value_est', 'max'),
+        avg_age=('age', 'mean'),
+    ).reset_index()
+
+    league_summary = df.groupby('league', sort=True, observed=True).agg(
+        players=('player_name', 'size'),
+        teams=('team', 'nunique'),
+        total_value=('market_value_est', 'sum'),
+        avg_value=('market_value_est', 'mean'),
+        max_value=('market_value_est', 'max'),
+        avg_age=('age', 'mean'),
+    ).reset_index()
+
+    group_summary = df.groupby(['league', 'team', 'position'], sort=True, observed=True).agg(
+        players=('player_name', 'size'),
+        value_sum=('market_value_est', 'sum'),
+        value_max=('market_value_est', 'max'),
+    ).reset_index()
+
+    league_avg = df['league'].map(league_summary.set_index('league')['avg_value']).astype(float)
+    above_avg = df['market_value_est'] > league_avg
+    pools = []
+    for category, age_rule in CATEGORIES.items():
+        pool = df.loc[above_avg & age_rule(df['age']),
+                      ['league', 'player_name', 'team', 'position', 'age', 'market_value_raw', 'market_value_est']]
+        pools.append(pool.assign(category=category))
+    eligibility = pd.concat(pools, ignore_index=True)
+
+    return {
+        'team_summary': team_summary,
+        'league_summary': league_summary,
+        'group_summary': group_summary,
+        'eligibility': eligibility,
+    }
+
+
+def write_aggregates(aggregates, root=DEFAULT_AGGREGATES_ROOT, snapshot=None, source_hash=None):
+    """
+    Simpan tabel ke root/snapshot=YYYYMMDD/{tabel}.parquet (ditulis via file sementara lalu rename).
+    source_hash: SnapshotStore.snapshot_hash() dari snapshot sumber, disimpan di source.json
+    supaya pembaca bisa mendeteksi agregat yang basi setelah snapshot ditulis ulang.
+    """
+    path = os.path.join(root, f"snapshot={snapshot}")
+    os.makedirs(path, exist_ok=True)
+    source_file = os.path.join(path, 'source.json')
+    if os.path.exists(source_file):
+        os.remove(source_file)
+    for name in TABLES:
+        target = os.path.join(path, f"{name}.parquet")
+        aggregates[name].to_parquet(f"{target}.tmp", index=False)
+        os.replace(f"{target}.tmp", target)
+    if source_hash is not None:
+        with open(f"{source_file}.tmp", 'w', encoding='utf-8') as f:
+            json.dump({'source_hash': source_hash}, f)
+        os.replace(f"{source_file}.tmp", source_file)
+    return path
+
+
+def available_snapshots(root=DEFAULT_AGGREGATES_ROOT):
+    """Snapshot yang semua tabel agregatnya lengkap"""
+    snapshots = []
+    for path in sorted(glob.glob(os.path.join(root, 'snapshot=*'))):
+        if all(os.path.exists(os.path.join(path, f"{name}.parquet")) for name in TABLES):
+            snapshots.append(os.path.basename(path).split('=', 1)[1])
+    return snapshots
+
+
+def source_hash_of(root=DEFAULT_AGGREGATES_ROOT, snapshot=None):
+    """Hash snapshot sumber yang tercatat saat agregat ditulis (None jika tidak tercatat)"""
+    source_file = os.path.join(root, f"snapshot={snapshot}", 'source.json')
+    if not os.path.exists(source_file):
+        return None
+    with open(source_file, encoding='utf-8') as f:
+        return json.load(f).get('source_hash')
+
+
+def load_aggregates(root=DEFAULT_AGGREGATES_ROOT, snapshot=None, source_hash=None):
+    """
+    Baca tabel agregat satu snapshot (default: terbaru). None jika belum ada, atau jika
+    source_hash diberikan dan tidak sama dengan hash snapshot saat agregat ditulis (basi).
+    """
+    snapshots = available_snapshots(root)
+    if snapshot is None:
+        snapshot = snapshots[-1] if snapshots else None
+    if snapshot not in snapshots:
+        return None
+    if source_hash is not None and source_hash_of(root, snapshot) != source_hash:
+        return None
+    path = os.path.join(root, f"snapshot={snapshot}")
+    return {name: pd.read_parquet(os.path.join(path, f"{name}.parquet")) for name in TABLES}
+
+
+def build_aggregates(store_path=SnapshotStore.DEFAULT_ROOT, root=DEFAULT_AGGREGATES_ROOT, snapshots=None):
+    """Hitung & simpan agregat untuk snapshot di store (default: terbaru). Return list snapshot yang dibangun."""
+    store = SnapshotStore(store_path)
+    if snapshots is None:
+        latest = store.latest_snapshot()
+        snapshots = [latest] if latest else []
+    for snapshot in snapshots:
+        write_aggregates(compute_aggregates(store.load(snapshots=[snapshot])), root, snapshot,
+                         source_hash=store.snapshot_hash(snapshot))
+    return snapshots
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Garuda Scout - tabel agregat dashboard per snapshot")
+    parser.add_argument('--store', default=SnapshotStore.DEFAULT_ROOT, help="Folder snapshot store")
+    parser.add_argument('--out', default=DEFAULT_AGGREGATES_ROOT, help="Folder output agregat")
+    parser.add_argument('--snapshot', action='append', help="Snapshot (YYYYMMDD), bisa diulang. Default: terbaru")
+    parser.add_argument('--all', action='store_true', help="Bangun ulang untuk semua snapshot di store")
+    args = parser.parse_args()
+
+    snapshots = SnapshotStore(args.store).snapshots() if args.all else args.snapshot
+    built = build_aggregates(args.store, args.out, snapshots)
+    print(f"📊 Agregat dibangun untuk {len(built)} snapshot -> {args.out}")
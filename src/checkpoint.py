@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+
+class ScrapeCheckpoint:
+    """
+    Antrian kerja persisten untuk satu run scraping (URL liga & tim).
+    - queue.json : status per URL (pending / done / failed), jumlah percobaan,
+                   error terakhir, daftar tim (liga) atau jumlah baris (tim)
+    - teams/     : hasil scraping per tim (JSON), jadi tim yang sudah selesai
+                   tidak perlu di-fetch lagi saat run dilanjutkan
+    Semua file ditulis atomik (file sementara lalu rename), aman dipakai banyak thread.
+    """
+
+    PENDING = 'pending'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, root, run_id, fresh=False):
+        self.run_id = run_id
+        self.path = os.path.join(root, f"run={run_id}")
+        if fresh and os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        os.makedirs(os.path.join(self.path, 'teams'), exist_ok=True)
+        self._queue_path = os.path.join(self.path, 'queue.json')
+        self._lock = threading.Lock()
+        self.items = self._load()
+
+    def _load(self):
+        if not os.path.exists(self._queue_path):
+            return {}
+        with open(self._queue_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _atomic_write(path, text):
+        tmp_path = f"{path}.tmp.{threading.get_ident()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def _save(self):
+        self._atomic_write(self._queue_path, json.dumps(self.items, indent=1, ensure_ascii=False))
+
+    def _rows_path(self, url):
+        return os.path.join(self.path, 'teams', hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def add(self, url, kind, country):
+        """Daftarkan URL ke antrian (jika belum ada). Return salinan item-nya."""
+        with self._lock:
+            if url not in self.items:
+                self.items[url] = {'kind': kind, 'country': country, 'status': self.PENDING,
+                                   'attempts': 0, 'error': None, 'updated_at': None}
+                self._save()
+            return dict(self.items[url])
+
+    def is_done(self, url):
+        with self._lock:
+            return self.items.get(url, {}).get('status') == self.DONE
+
+    def _update(self, url, **fields):
+        with self._lock:
+            item = self.items[url]
+            item.update(fields)
+            item['attempts'] += 1
+            item['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+            self._save()
+
+    def mark_done(self, url, **fields):
+        self._update(url, status=self.DONE, error=None, **fields)
+
+    def mark_failed(self, url, error):
+        self._update(url, status=self.FAILED, error=str(error))
+
+    def league_teams(self, url):
+        with self._lock:
+            return list(self.items[url].get('teams', []))
+
+    def save_rows(self, url, rows):
+        """Simpan hasil scraping satu tim lalu tandai selesai"""
+        self._atomic_write(self._rows_path(url), json.dumps(rows, ensure_ascii=False))
+        self.mark_done(url, rows=len(rows))
+
+    def load_rows(self, url):
+        with open(self._rows_path(url), encoding='utf-8') as f:
+            return json.load(f)
+
+    def summary(self):
+        """Jumlah item per jenis & status, misal {'team': {'done': 60, 'failed': 1}}"""
+        with self._lock:
+            counts = {}
+            for item in self.items.values():
+                by_status = counts.setdefault(item['kind'], {})
+                by_status[item['status']] = by_status.get(item['status'], 0) + 1
+            return counts
+
+    def failed(self):
+        with self._lock:
+            return {url: dict(item) for url, item in self.items.items() if item['status'] == self.FAILED}
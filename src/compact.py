@@ -0,0 +1,85 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from src.market_value import format_market_values
+from src.storage import SnapshotStore
+
+# Kolom string berulang -> categorical (kode integer + satu salinan tiap string).
+# player_name ikut di-intern: kode kategorinya adalah ID pemain.
+CATEGORY_COLUMNS = ['player_name', 'team', 'league', 'league_country', 'position', 'scraped_date', 'snapshot']
+# Kolom integer -> tipe terkecil yang muat (umur: int8; value tetap int64 jika > 2^31)
+INTEGER_COLUMNS = ['age', 'market_value_est', 'player_id']
+
+
+def raw_from_values(values):
+    """
+    market_value_raw diturunkan dari market_value_est sebagai categorical:
+    hanya nilai unik yang diformat, bukan satu string per baris.
+    """
+    codes, uniques = pd.factorize(pd.Series(values), sort=True)
+    labels, label_codes = np.unique(format_market_values(uniques).astype(str), return_inverse=True)
+    return pd.Categorical.from_codes(label_codes[codes], categories=labels)
+
+
+def compact_frame(df):
+    """
+    Versi hemat memori dari DataFrame pemain: kolom string -> categorical,
+    integer di-downcast, dan market_value_raw (jika tidak di-load) dibentuk
+    ulang dari market_value_est sebagai categorical.
+    """
+    out = {}
+    for col in df.columns:
+        series = df[col]
+        if col in CATEGORY_COLUMNS:
+            series = series.astype('category').cat.remove_unused_categories()
+            # Partisi hive bisa terbaca sebagai angka (snapshot=20260504) -> tetap string
+            if not pd.api.types.is_string_dtype(series.cat.categories):
+                series = series.cat.rename_categories(series.cat.categories.astype(str))
+        elif col in INTEGER_COLUMNS and pd.api.types.is_integer_dtype(series):
+            series = pd.to_numeric(series, downcast='integer')
+        elif col == 'market_value_raw':
+            series = series.astype('category')
+        out[col] = series
+    columns = list(df.columns)
+    if 'market_value_raw' not in df.columns and 'market_value_est' in df.columns:
+        out['market_value_raw'] = pd.Series(raw_from_values(df['market_value_est'].to_numpy()), index=df.index)
+        columns.insert(columns.index('market_value_est'), 'market_value_raw')
+    return pd.DataFrame(out, index=df.index)[columns]
+
+
+def memory_report(df):
+    """Pemakaian memori (deep) total, per baris, dan per kolom per baris"""
+    usage = df.memory_usage(deep=True, index=True)
+    rows = max(len(df), 1)
+    return {
+        'rows': len(df),
+        'total_bytes': int(usage.sum()),
+        'bytes_per_row': round(usage.sum() / rows, 1),
+        'columns': {col: round(usage[col] / rows, 1) for col in usage.index},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Garuda Scout - bandingkan memori mode default vs compact")
+    parser.add_argument('--store', default=SnapshotStore.DEFAULT_ROOT, help="Folder snapshot store")
+    parser.add_argument('--all', action='store_true', help="Load semua snapshot (riwayat penuh), bukan hanya terbaru")
+    args = parser.parse_args()
+
+    from src.ml_engine import ScoutBrain
+
+    snapshots = None if args.all else 'latest'
+    reports = {}
+    for label, compact in (('default', False), ('compact', True)):
+        brain = ScoutBrain(store_path=args.store, snapshots=snapshots, compact=compact)
+        reports[label] = brain.memory_report()
+
+    print(f"{'kolom':<20}{'default B/row':>15}{'compact B/row':>15}")
+    for col in reports['default']['columns']:
+        print(f"{col:<20}{reports['default']['columns'][col]:>15,.1f}{reports['compact']['columns'].get(col, 0):>15,.1f}")
+    default, compact = reports['default'], reports['compact']
+    print(f"\n📦 {default['rows']} baris")
+    print(f"   default : {default['bytes_per_row']:,.1f} B/baris ({default['total_bytes'] / 2**20:,.2f} MB)")
+    print(f"   compact : {compact['bytes_per_row']:,.1f} B/baris ({compact['total_bytes'] / 2**20:,.2f} MB)"
+          f" -> {default['total_bytes'] / compact['total_bytes']:.1f}x lebih kecil")
@@ -0,0 +1,124 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+class HttpCache:
+    """
+    Cache HTML di disk untuk scraper.
+    - Isi halaman disimpan content-addressed (sha256 dari isi) di `blobs/`, jadi halaman
+      yang tidak berubah antar minggu hanya disimpan sekali.
+    - Metadata per URL (ETag, Last-Modified, riwayat versi) disimpan di `meta/`.
+    - Entry yang umurnya < ttl dianggap fresh dan dipakai tanpa request sama sekali;
+      yang lebih tua direvalidasi dengan If-None-Match / If-Modified-Since.
+    """
+
+    DEFAULT_TTL = 12 * 3600  # 12 jam: re-run di hari yang sama tidak perlu ke server
+
+    def __init__(self, cache_dir='data/cache/http', ttl=DEFAULT_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.meta_dir = os.path.join(cache_dir, 'meta')
+        self.blob_dir = os.path.join(cache_dir, 'blobs')
+        os.makedirs(self.meta_dir, exist_ok=True)
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+    @staticmethod
+    def _url_key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _meta_path(self, url):
+        return os.path.join(self.meta_dir, f"{self._url_key(url)}.json")
+
+    def _blob_path(self, content_hash):
+        return os.path.join(self.blob_dir, content_hash[:2], f"{content_hash}.html.gz")
+
+    @staticmethod
+    def _atomic_write(path, data):
+        """Tulis ke file sementara lalu rename, aman dipakai beberapa thread sekaligus"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _write_meta(self, meta):
+        self._atomic_write(self._meta_path(meta['url']), json.dumps(meta, indent=1).encode('utf-8'))
+
+    def load_meta(self, url):
+        try:
+            with open(self._meta_path(url), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def is_fresh(self, meta):
+        return meta is not None and (time.time() - meta['checked_at']) < self.ttl
+
+    def conditional_headers(self, meta):
+        """Header revalidasi untuk entry yang sudah stale"""
+        headers = {}
+        if meta and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta and meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def read(self, url, as_of=None):
+        """
+        Ambil isi halaman dari cache (bytes) atau None jika tidak ada.
+        as_of (unix timestamp) -> versi terakhir yang di-fetch sebelum waktu tersebut.
+        """
+        meta = self.load_meta(url)
+        if meta is None:
+            return None
+
+        content_hash = meta['content_hash']
+        if as_of is not None:
+            versions = [v for v in meta['history'] if v['fetched_at'] <= as_of]
+            if not versions:
+                return None
+            content_hash = versions[-1]['content_hash']
+
+        try:
+            with gzip.open(self._blob_path(content_hash), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def store(self, url, content, headers=None):
+        """Simpan response 200 beserta validator-nya"""
+        headers = headers or {}
+        content_hash = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(content_hash)
+        if not os.path.exists(blob_path):
+            self._atomic_write(blob_path, gzip.compress(content))
+
+        now = time.time()
+        meta = self.load_meta(url) or {'url': url, 'history': []}
+        if not meta['history'] or meta['history'][-1]['content_hash'] != content_hash:
+            meta['history'].append({'fetched_at': now, 'content_hash': content_hash})
+        meta.update({
+            'content_hash': content_hash,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'fetched_at': now,
+            'checked_at': now,
+        })
+        self._write_meta(meta)
+        return meta
+
+    def touch(self, url, headers=None):
+        """Tandai entry masih valid setelah server menjawab 304 Not Modified"""
+        meta = self.load_meta(url)
+        if meta is None:
+            return None
+        headers = headers or {}
+        meta['checked_at'] = time.time()
+        meta['etag'] = headers.get('ETag', meta.get('etag'))
+        meta['last_modified'] = headers.get('Last-Modified', meta.get('last_modified'))
+        self._write_meta(meta)
+        return meta
@@ -0,0 +1,378 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import unicodedata
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+from src.storage import SnapshotStore
+
+DEFAULT_IDENTITY_ROOT = 'data/store/identity'
+
+
+def name_key(name):
+    """Nama ternormalisasi: tanpa aksen/tanda baca, huruf kecil, urutan token dipertahankan"""
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return ' '.join(re.findall(r'[a-z0-9]+', text))
+
+
+def _league_col(df):
+    return 'league_country' if 'league_country' in df.columns else 'league'
+
+
+class PlayerRegistry:
+    """
+    Entity resolution pemain lintas snapshot mingguan -> player_id stabil.
+    - Blocking: kandidat hanya dicari di blok nama ternormalisasi yang sama, lalu
+      (untuk variasi ejaan) di blok token nama yang jarang + rentang tahun lahir.
+      Tidak ada perbandingan semua pasangan, jadi biaya per minggu ~linear.
+    - Skor kandidat: kemiripan nama + tim sama + tahun lahir (tahun snapshot - umur)
+      konsisten + posisi/value sama. Umur hasil scraping kadang salah baca (nomor punggung),
+      jadi tahun lahir yang bertentangan hanya mengurangi skor untuk nama identik.
+    - Nama mirip tapi tidak identik (variasi ejaan) hanya diterima jika timnya sama DAN
+      tahun lahirnya cocok: nama Vietnam seperti "Tan Tai Ho" / "Tuan Tai Ho" sangat mirip
+      padahal orang berbeda di tim yang sama.
+    - Satu player_id maksimal satu baris per snapshot, jadi pemain senama di tim
+      berbeda pada minggu yang sama tetap terpisah.
+    - Incremental: hanya snapshot yang belum diproses yang di-resolve. Snapshot yang
+      isinya berubah sejak di-resolve (re-run di hari yang sama, reprocess) -> bangun ulang.
+
+    Disimpan di root/:
+        players.parquet                   : registry (atribut terakhir per player_id)
+        snapshot=YYYYMMDD/ids.parquet     : player_name + team -> player_id per snapshot
+        snapshot=YYYYMMDD/source.json     : hash isi snapshot sumber saat di-resolve
+    """
+
+    BAND_YEARS = 5          # lebar rentang tahun lahir untuk blocking token
+    MAX_BLOCK = 200         # token yang terlalu umum (misal "muhammad") tidak dipakai sebagai blok
+    BLOCK_TOKENS = 2        # jumlah token paling jarang per nama yang dipakai untuk blocking
+    MAX_BIRTH_GAP = 2       # selisih tahun lahir di atas ini dianggap bertentangan
+    FUZZY_MIN_RATIO = 0.88  # kemiripan nama minimal untuk kandidat non-identik
+
+    def __init__(self, root=DEFAULT_IDENTITY_ROOT):
+        self.root = root
+        self._clear()
+        self._load()
+
+    def _clear(self):
+        self.players = {}       # player_id -> atribut terakhir
+        self.snapshots = []     # snapshot yang sudah di-resolve (terurut)
+        self.versions = {}      # snapshot -> hash isi sumber saat di-resolve
+        self._by_name = {}      # name_key -> [player_id]
+        self._by_token = {}     # token -> {band tahun lahir / None -> set(player_id)}
+        self._token_count = {}  # token -> jumlah player_id di semua band
+
+    # --- Index ---
+    def _band(self, birth_year):
+        return None if birth_year is None else birth_year // self.BAND_YEARS
+
+    def _index(self, pid, key, birth_year):
+        ids = self._by_name.setdefault(key, [])
+        if pid not in ids:
+            ids.append(pid)
+        for token in set(key.split()):
+            members = self._by_token.setdefault(token, {}).setdefault(self._band(birth_year), set())
+            if pid not in members:
+                members.add(pid)
+                self._token_count[token] = self._token_count.get(token, 0) + 1
+
+    def _unindex_tokens(self, pid, key, birth_year):
+        for token in set(key.split()):
+            members = self._by_token.get(token, {}).get(self._band(birth_year))
+            if members and pid in members:
+                members.discard(pid)
+                self._token_count[token] -= 1
+
+    def _block(self, key, birth_year):
+        """Kandidat variasi ejaan: token paling jarang dari nama, di band tahun lahir yang masuk akal"""
+        tokens = sorted((t for t in set(key.split()) if 0 < self._token_count.get(t, 0) <= self.MAX_BLOCK),
+                        key=lambda t: (self._token_count[t], t))[:self.BLOCK_TOKENS]
+        candidates = set()
+        for token in tokens:
+            by_band = self._by_token[token]
+            if birth_year is None:
+                bands = by_band.keys()
+            else:
+                bands = {self._band(birth_year + d) for d in range(-self.MAX_BIRTH_GAP, self.MAX_BIRTH_GAP + 1)} | {None}
+            for band in bands:
+                candidates |= by_band.get(band, set())
+        return candidates
+
+    # --- Resolve ---
+    def _score(self, player, name_sim, team, position, birth_year, value):
+        """Return (skor, tim sama, tahun lahir cocok, tahun lahir bertentangan)"""
+        birth_match = birth_conflict = False
+        if birth_year is not None and player['birth_year'] is not None:
+            gap = abs(birth_year - player['birth_year'])
+            birth_match = gap <= 1
+            birth_conflict = gap > self.MAX_BIRTH_GAP
+        same_team = player['team'] == team
+        score = name_sim + 0.5 * same_team + 0.3 * birth_match - 0.5 * birth_conflict
+        score += 0.1 * (player['position'] == position) + 0.1 * (value > 0 and player['market_value_est'] == value)
+        return score, same_team, birth_match, birth_conflict
+
+    def _match(self, df, snapshot):
+        """
+        Langkah 1-3 resolve: kandidat & assignment 1-1, hanya membaca registry.
+        Return (kolom per baris, player_id per baris / None untuk pemain baru, statistik).
+        """
+        year = int(str(snapshot)[:4])
+        league = _league_col(df)
+        names = df['player_name'].astype(str).tolist()
+        ages = pd.to_numeric(df['age'], errors='coerce').fillna(0).astype(int).tolist()
+        unique_keys = {n: name_key(n) for n in set(names)}
+        rows = {
+            'names': names,
+            'teams': df['team'].astype(str).tolist(),
+            'leagues': df[league].astype(str).tolist(),
+            'positions': df['position'].astype(str).tolist(),
+            'values': pd.to_numeric(df['market_value_est'], errors='coerce').fillna(0).astype('int64').tolist(),
+            'keys': [unique_keys[n] for n in names],
+            'births': [year - a if a > 0 else None for a in ages],
+        }
+        keys, teams, positions, births, values = rows['keys'], rows['teams'], rows['positions'], rows['births'], rows['values']
+
+        # 1. Kandidat dari blok nama identik, 2. blok token (hanya jika nama belum pernah terlihat)
+        pairs = []
+        comparisons = 0
+        for i, key in enumerate(keys):
+            exact = self._by_name.get(key, ())
+            for pid in exact:
+                comparisons += 1
+                score = self._score(self.players[pid], 1.0, teams[i], positions[i], births[i], values[i])[0]
+                pairs.append((score, i, pid, 'exact'))
+            if exact:
+                continue
+            for pid in self._block(key, births[i]):
+                comparisons += 1
+                player = self.players[pid]
+                ratio = max(SequenceMatcher(None, key, k).ratio() for k in player['keys'])
+                if ratio < self.FUZZY_MIN_RATIO:
+                    continue
+                score, same_team, birth_match, _ = self._score(player, ratio, teams[i], positions[i], births[i], values[i])
+                if same_team and birth_match:
+                    pairs.append((score, i, pid, 'fuzzy'))
+
+        # 3. Assignment 1-1 (greedy skor tertinggi): satu player_id per baris per snapshot
+        ids = [None] * len(keys)
+        used = set()
+        stats = {'rows': len(keys), 'exact': 0, 'fuzzy': 0, 'new': 0, 'comparisons': comparisons}
+        for score, i, pid, kind in sorted(pairs, key=lambda p: (-p[0], p[1], p[2])):
+            if ids[i] is None and pid not in used:
+                ids[i] = pid
+                used.add(pid)
+                stats[kind] += 1
+        return rows, ids, stats
+
+    def preview(self, df, snapshot):
+        """player_id untuk baris df tanpa mengubah registry (misal untuk change set sebelum snapshot ditulis)"""
+        _, ids, _ = self._match(df, snapshot)
+        next_id = max(self.players, default=0) + 1
+        preview = []
+        for pid in ids:
+            if pid is None:
+                pid, next_id = next_id, next_id + 1
+            preview.append(pid)
+        return preview
+
+    def resolve(self, df, snapshot):
+        """
+        Tetapkan player_id untuk setiap baris satu snapshot dan update registry.
+        Return (array player_id sejajar baris df, statistik).
+        """
+        rows, ids, stats = self._match(df, snapshot)
+        names, teams, leagues, positions = rows['names'], rows['teams'], rows['leagues'], rows['positions']
+        values, keys, births = rows['values'], rows['keys'], rows['births']
+
+        # 4. Sisa baris -> pemain baru; update atribut terakhir semua pemain yang muncul
+        next_id = max(self.players, default=0) + 1
+        for i, key in enumerate(keys):
+            pid = ids[i]
+            if pid is None:
+                pid = ids[i] = next_id
+                next_id += 1
+                stats['new'] += 1
+                self.players[pid] = {'keys': [], 'birth_year': births[i], 'first_seen': str(snapshot)}
+            player = self.players[pid]
+            if player['birth_year'] is None and births[i] is not None:
+                for old_key in player['keys']:
+                    self._unindex_tokens(pid, old_key, None)
+                player['birth_year'] = births[i]
+                for old_key in player['keys']:
+                    self._index(pid, old_key, player['birth_year'])
+            if key not in player['keys']:
+                player['keys'].append(key)
+            self._index(pid, key, player['birth_year'])
+            player.update(player_name=names[i], team=teams[i], league=leagues[i], position=positions[i],
+                          market_value_est=values[i], last_seen=str(snapshot))
+
+        self.snapshots = sorted(set(self.snapshots) | {str(snapshot)})
+        return ids, stats
+
+    # --- Persistensi ---
+    def _snapshot_path(self, snapshot):
+        return os.path.join(self.root, f"snapshot={snapshot}", 'ids.parquet')
+
+    @staticmethod
+    def _write(df, target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        df.to_parquet(f"{target}.tmp", index=False)
+        os.replace(f"{target}.tmp", target)
+
+    def save_snapshot(self, df, snapshot, ids, version=None):
+        self._write(pd.DataFrame({'player_name': df['player_name'].astype(str).to_numpy(),
+                                  'team': df['team'].astype(str).to_numpy(), 'player_id': ids}),
+                    self._snapshot_path(snapshot))
+        source = os.path.join(self.root, f"snapshot={snapshot}", 'source.json')
+        if version is None:
+            if os.path.exists(source):
+                os.remove(source)
+            self.versions.pop(str(snapshot), None)
+            return
+        with open(f"{source}.tmp", 'w', encoding='utf-8') as f:
+            json.dump({'source_hash': version}, f)
+        os.replace(f"{source}.tmp", source)
+        self.versions[str(snapshot)] = version
+
+    def save(self):
+        rows = [{'player_id': pid, 'player_name': p['player_name'], 'name_keys': '|'.join(p['keys']),
+                 'birth_year': p['birth_year'], 'team': p['team'], 'league': p['league'], 'position': p['position'],
+                 'market_value_est': p['market_value_est'], 'first_seen': p['first_seen'], 'last_seen': p['last_seen']}
+                for pid, p in sorted(self.players.items())]
+        players = pd.DataFrame(rows, columns=['player_id', 'player_name', 'name_keys', 'birth_year', 'team', 'league',
+                                              'position', 'market_value_est', 'first_seen', 'last_seen'])
+        players['birth_year'] = players['birth_year'].astype('Int64')
+        self._write(players, os.path.join(self.root, 'players.parquet'))
+
+    def _load(self):
+        path = os.path.join(self.root, 'players.parquet')
+        if not os.path.exists(path):
+            return
+        for row in pd.read_parquet(path).itertuples(index=False):
+            birth_year = None if pd.isna(row.birth_year) else int(row.birth_year)
+            self.players[int(row.player_id)] = {
+                'keys': row.name_keys.split('|'), 'birth_year': birth_year, 'player_name': row.player_name,
+                'team': row.team, 'league': row.league, 'position': row.position,
+                'market_value_est': int(row.market_value_est), 'first_seen': row.first_seen, 'last_seen': row.last_seen,
+            }
+            for key in self.players[int(row.player_id)]['keys']:
+                self._index(int(row.player_id), key, birth_year)
+        self.snapshots = available_snapshots(self.root)
+        for snapshot in self.snapshots:
+            source = os.path.join(self.root, f"snapshot={snapshot}", 'source.json')
+            if os.path.exists(source):
+                with open(source, encoding='utf-8') as f:
+                    self.versions[snapshot] = json.load(f)['source_hash']
+
+    def reset(self):
+        if os.path.exists(self.root):
+            shutil.rmtree(self.root)
+        self._clear()
+
+    def update(self, frames):
+        """
+        Resolve snapshot baru secara berurutan. frames: iterable (snapshot, loader[, version]) dengan
+        loader() -> DataFrame (dipanggil hanya untuk snapshot yang perlu di-resolve) dan version
+        = hash isi sumber (opsional, None = tidak dicek).
+        Bangun ulang semua jika ada snapshot lama yang di-backfill (lebih tua dari yang sudah
+        diproses) atau snapshot yang sudah diproses berubah isinya (version berbeda).
+        """
+        frames = sorted(((str(item[0]), item[1], item[2] if len(item) > 2 else None) for item in frames),
+                        key=lambda item: item[0])
+        pending = [item for item in frames if item[0] not in self.snapshots]
+        changed = [s for s, _, version in frames
+                   if version is not None and s in self.snapshots and self.versions.get(s) != version]
+        if changed:
+            print(f"♻️ Snapshot {', '.join(changed)} berubah sejak di-resolve, registry dibangun ulang")
+            self.reset()
+            pending = frames
+        elif pending and self.snapshots and pending[0][0] < self.snapshots[-1]:
+            print(f"♻️ Snapshot {pending[0][0]} lebih tua dari yang sudah diproses, registry dibangun ulang")
+            self.reset()
+            pending = frames
+
+        results = []
+        for snapshot, loader, version in pending:
+            df = loader()
+            ids, stats = self.resolve(df, snapshot)
+            self.save_snapshot(df, snapshot, ids, version)
+            results.append((snapshot, stats))
+        if results:
+            self.save()
+        return results
+
+
+def available_snapshots(root=DEFAULT_IDENTITY_ROOT):
+    return sorted(os.path.basename(os.path.dirname(path)).split('=', 1)[1]
+                  for path in glob.glob(os.path.join(root, 'snapshot=*', 'ids.parquet')))
+
+
+def load_ids(root=DEFAULT_IDENTITY_ROOT, snapshots=None):
+    """Tabel snapshot + player_name + team -> player_id (default: semua snapshot). None jika belum ada."""
+    available = available_snapshots(root)
+    snapshots = available if snapshots is None else [s for s in snapshots if s in available]
+    if not snapshots:
+        return None
+    return pd.concat([pd.read_parquet(os.path.join(root, f"snapshot={s}", 'ids.parquet')).assign(snapshot=s)
+                      for s in snapshots], ignore_index=True)
+
+
+def attach_ids(df, ids, keys=('player_name', 'team')):
+    """Array player_id sejajar baris df dari tabel load_ids(), -1 untuk baris yang belum di-resolve"""
+    keys = list(keys)
+    if ids is None:
+        return np.full(len(df), -1, dtype='int64')
+    lookup = ids.drop_duplicates(keys).set_index(keys)['player_id']
+    wanted = pd.MultiIndex.from_frame(df[keys].astype(str))
+    return lookup.reindex(wanted).fillna(-1).to_numpy(dtype='int64')
+
+
+def store_frames(store_path=SnapshotStore.DEFAULT_ROOT):
+    """(snapshot, loader, hash isi) untuk semua snapshot di store; hash dari manifest snapshot (tanpa membaca Parquet)"""
+    store = SnapshotStore(store_path)
+    columns = ['player_name', 'team', 'league', 'position', 'age', 'market_value_est']
+    return [(s, lambda s=s: store.load(snapshots=[s], columns=columns), store.snapshot_hash(s)) for s in store.snapshots()]
+
+
+def raw_frames(raw_dir='data/raw'):
+    """(snapshot, loader, hash isi file) untuk semua CSV real_scout_YYYYMMDD.csv"""
+    frames = []
+    for path in sorted(glob.glob(os.path.join(raw_dir, 'real_scout_*.csv'))):
+        match = re.search(r'real_scout_(\d{8})\.csv$', path)
+        if match:
+            with open(path, 'rb') as f:
+                version = hashlib.sha1(f.read()).hexdigest()
+            frames.append((match.group(1), lambda path=path: pd.read_csv(path), version))
+    return frames
+
+
+def print_results(results, registry):
+    for snapshot, stats in results:
+        print(f"🪪 {snapshot}: {stats['rows']} baris -> {stats['exact']} nama identik, {stats['fuzzy']} variasi ejaan, "
+              f"{stats['new']} pemain baru ({stats['comparisons']} perbandingan kandidat)")
+    print(f"👥 Registry: {len(registry.players)} player_id dari {len(registry.snapshots)} snapshot")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Garuda Scout - player_id stabil lintas snapshot (entity resolution)")
+    parser.add_argument('--store', default=SnapshotStore.DEFAULT_ROOT, help="Folder snapshot store (sumber default)")
+    parser.add_argument('--raw', default=None, help="Pakai CSV real_scout_YYYYMMDD.csv di folder ini, bukan store")
+    parser.add_argument('--out', default=DEFAULT_IDENTITY_ROOT, help="Folder registry & tabel player_id")
+    parser.add_argument('--rebuild', action='store_true', help="Hapus registry lama dan resolve ulang semua snapshot")
+    args = parser.parse_args()
+
+    registry = PlayerRegistry(args.out)
+    if args.rebuild:
+        registry.reset()
+    start = time.perf_counter()
+    results = registry.update(raw_frames(args.raw) if args.raw else store_frames(args.store))
+    print_results(results, registry)
+    print(f"⏱️ {time.perf_counter() - start:.2f} detik")
@@ -0,0 +1,258 @@
+import argparse
+import json
+import os
+
+import pandas as pd
+
+from src.identity import DEFAULT_IDENTITY_ROOT, attach_ids, load_ids
+from src.storage import SnapshotStore
+
+KEY = ['player_name', 'team']
+# Pencocokan transfer (pemain hilang dari satu tim & muncul di tim lain)
+TRANSFER_KEY = ['player_name', 'position', 'age']
+DEFAULT_CHANGESET_ROOT = 'data/store/changesets'
+
+
+class ChangeSet:
+    """
+    Perubahan antara master DB dan hasil scraping satu run (kolom player_id ikut
+    disimpan jika perbandingan memakai player_id):
+    - new           : pemain baru (belum pernah ada di master)
+    - departed      : pemain yang hilang dari skuad tim yang berhasil di-scrape, atau
+                      dari tim yang tidak lagi ada di liga (degradasi / ganti nama)
+    - transferred   : pemain yang pindah tim (team_from -> team_to)
+    - value_changed : market value berubah di tim yang sama
+    - upserts       : semua baris hasil scraping dari tim yang diterima
+    - skipped_teams : tim di master yang gagal di-fetch / datanya terlalu sedikit,
+                      baris lamanya dipertahankan (kecuali pemain yang tercatat pindah)
+    """
+
+    KINDS = ['new', 'departed', 'transferred', 'value_changed', 'upserts']
+
+    def __init__(self, new, departed, transferred, value_changed, upserts, skipped_teams):
+        self.new = new
+        self.departed = departed
+        self.transferred = transferred
+        self.value_changed = value_changed
+        self.upserts = upserts
+        self.skipped_teams = sorted(skipped_teams)
+
+    def summary(self):
+        return {
+            'new': len(self.new),
+            'departed': len(self.departed),
+            'transferred': len(self.transferred),
+            'value_changed': len(self.value_changed),
+            'upserts': len(self.upserts),
+            'skipped_teams': self.skipped_teams,
+        }
+
+    def save(self, root, snapshot):
+        """Simpan change set ke root/snapshot=YYYYMMDD/{kind}.parquet + summary.json"""
+        path = os.path.join(root, f"snapshot={snapshot}")
+        os.makedirs(path, exist_ok=True)
+        for kind in self.KINDS:
+            getattr(self, kind).to_parquet(os.path.join(path, f"{kind}.parquet"), index=False)
+        with open(os.path.join(path, 'summary.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=1, ensure_ascii=False)
+        return path
+
+    @classmethod
+    def load(cls, root, snapshot):
+        path = os.path.join(root, f"snapshot={snapshot}")
+        frames = {kind: pd.read_parquet(os.path.join(path, f"{kind}.parquet")) for kind in cls.KINDS}
+        with open(os.path.join(path, 'summary.json'), encoding='utf-8') as f:
+            skipped_teams = json.load(f)['skipped_teams']
+        return cls(skipped_teams=skipped_teams, **frames)
+
+
+def _league_col(df):
+    return 'league_country' if 'league_country' in df.columns else 'league'
+
+
+def _unique_on(df, columns):
+    """Baris yang key-nya unik (pemain senama dengan key sama dibuang semuanya)"""
+    return df[~df.duplicated(columns, keep=False)]
+
+
+def _match_transfers(gone, appeared, league):
+    """
+    Pasangkan pemain yang hilang dengan pemain yang muncul di tim lain (TRANSFER_KEY).
+    Key yang tidak unik di salah satu sisi tidak dipasangkan: lebih aman dicatat
+    sebagai keluar + baru daripada memindahkan pemain senama yang salah.
+    """
+    old = gone.rename(columns={'position_old': 'position', 'age_old': 'age'})
+    new = appeared.rename(columns={'position_new': 'position', 'age_new': 'age'})
+    pairs = _unique_on(old, TRANSFER_KEY).merge(
+        _unique_on(new, TRANSFER_KEY), on=TRANSFER_KEY, suffixes=('_from', '_to'))
+    return pd.DataFrame({
+        'player_name': pairs['player_name'],
+        'team_from': pairs['team_from'],
+        'team_to': pairs['team_to'],
+        'league_from': pairs[f'{league}_old_from'],
+        'league_to': pairs[f'{league}_new_to'],
+        'market_value_old': pairs['market_value_est_old_from'].astype('int64'),
+        'market_value_new': pairs['market_value_est_new_to'].astype('int64'),
+    }).reset_index(drop=True)
+
+
+def compute_change_set(master, scraped, min_team_coverage=0.5, failed_leagues=()):
+    """
+    Bandingkan master DB dengan hasil scraping.
+    Key: player_id jika kedua frame punya kolom player_id (stabil lintas transfer, pemain
+    senama tetap terpisah), selain itu player_name + team dengan pencocokan transfer TRANSFER_KEY.
+    Tim yang di-skip (baris lamanya dipertahankan, tidak disentuh):
+    - jumlah pemainnya kurang dari min_team_coverage x jumlah di master (data parsial), atau
+    - tidak muncul di hasil scraping padahal liganya ada di failed_leagues (halaman liga/tim
+      gagal di-fetch di run ini). Tim yang hilang dari liga tanpa kegagalan (degradasi,
+      ganti nama) diperlakukan sebagai tim yang diterima: pemainnya tercatat keluar.
+    """
+    league = _league_col(master)
+
+    # 1. Tim mana yang hasil scraping-nya bisa dipercaya
+    master_counts = master.groupby('team').size()
+    scraped_counts = scraped.groupby('team').size()
+    coverage = (scraped_counts / master_counts.reindex(scraped_counts.index)).fillna(1.0)
+    accepted_teams = set(coverage.index[coverage >= min_team_coverage])
+    partial_teams = set(coverage.index[coverage < min_team_coverage])
+    absent_teams = set(master_counts.index) - set(scraped_counts.index)
+    failed_teams = set(master.loc[master[league].isin(list(failed_leagues)), 'team'])
+    skipped_teams = partial_teams | (absent_teams & failed_teams)
+
+    upserts = scraped[scraped['team'].isin(accepted_teams)]
+    if 'player_id' in master.columns and 'player_id' in upserts.columns:
+        diff = _diff_by_id(master, upserts, skipped_teams, league)
+    else:
+        diff = _diff_by_name(master, upserts, skipped_teams, league)
+    return ChangeSet(*diff, upserts.reset_index(drop=True), skipped_teams)
+
+
+def _value_changes(kept, league, extra=()):
+    """DataFrame value_changed dari pasangan _old/_new di tim yang sama"""
+    changed = kept[kept['market_value_est_old'] != kept['market_value_est_new']]
+    value_old = changed['market_value_est_old'].astype('int64')
+    value_new = changed['market_value_est_new'].astype('int64')
+    result = pd.DataFrame({
+        'player_name': changed['player_name'],
+        'team': changed['team'],
+        'league': changed[f'{league}_new'],
+        'market_value_old': value_old,
+        'market_value_new': value_new,
+        'delta': value_new - value_old,
+    })
+    for column in extra:
+        result[column] = changed[column]
+    return result.reset_index(drop=True)
+
+
+def _diff_by_name(master, upserts, skipped_teams, league):
+    """(new, departed, transferred, value_changed) dengan key player_name + team"""
+    # Key yang hilang & muncul. Pemain di tim yang di-skip tidak pernah dianggap keluar,
+    # tapi tetap bisa dipasangkan sebagai transfer jika muncul di tim lain.
+    columns = KEY + [league, 'position', 'age', 'market_value_est']
+    both = master[columns].merge(
+        upserts[columns], on=KEY, how='outer', suffixes=('_old', '_new'), indicator=True)
+    gone = both[both['_merge'] == 'left_only']
+    appeared = both[both['_merge'] == 'right_only']
+    kept = both[both['_merge'] == 'both']
+
+    # Transfer: hilang dari tim lama & muncul di tim lain sebagai pemain yang sama
+    transferred = _match_transfers(gone, appeared, league)
+
+    # Pemain baru & pemain keluar (di luar transfer)
+    moved_to = transferred[['player_name', 'team_to']].rename(columns={'team_to': 'team'})
+    moved_from = transferred[['player_name', 'team_from']].rename(columns={'team_from': 'team'})
+    new_keys = _without(appeared[KEY], moved_to)
+    new = upserts.merge(new_keys, on=KEY).reset_index(drop=True)
+
+    departed_keys = _without(gone.loc[~gone['team'].isin(skipped_teams), KEY], moved_from)
+    departed = master.merge(departed_keys, on=KEY).reset_index(drop=True)
+
+    return new, departed, transferred, _value_changes(kept, league)
+
+
+def _diff_by_id(master, upserts, skipped_teams, league):
+    """
+    (new, departed, transferred, value_changed) dengan key player_id.
+    Baris tanpa id (-1, belum di-resolve) tidak pernah dicocokkan: dicatat keluar / baru.
+    Pemain di tim yang di-skip tidak dianggap keluar, tapi pindah jika id-nya muncul di tim lain.
+    """
+    columns = ['player_id', 'player_name', 'team', league, 'market_value_est']
+    pairs = master.loc[master['player_id'] >= 0, columns].merge(
+        upserts.loc[upserts['player_id'] >= 0, columns], on='player_id', suffixes=('_old', '_new'))
+    same_team = pairs['team_old'] == pairs['team_new']
+    kept = pairs[same_team].rename(columns={'player_name_new': 'player_name', 'team_new': 'team'})
+    moved = pairs[~same_team]
+
+    transferred = pd.DataFrame({
+        'player_name': moved['player_name_new'],
+        'team_from': moved['team_old'],
+        'team_to': moved['team_new'],
+        'league_from': moved[f'{league}_old'],
+        'league_to': moved[f'{league}_new'],
+        'market_value_old': moved['market_value_est_old'].astype('int64'),
+        'market_value_new': moved['market_value_est_new'].astype('int64'),
+        'player_id': moved['player_id'],
+    }).reset_index(drop=True)
+
+    matched = pd.concat([kept['player_id'], moved['player_id']])
+    new = upserts[~upserts['player_id'].isin(matched)].reset_index(drop=True)
+    departed = master[~master['team'].isin(skipped_teams) & ~master['player_id'].isin(matched)].reset_index(drop=True)
+    return new, departed, transferred, _value_changes(kept, league, extra=['player_id'])
+
+
+def _without(keys, remove):
+    """Baris keys (KEY) yang tidak ada di remove"""
+    marker = keys.merge(remove, on=KEY, how='left', indicator=True)['_merge'].to_numpy()
+    return keys[marker == 'left_only']
+
+
+def apply_change_set(master, change_set):
+    """
+    Upsert change set ke master: baris tim yang di-skip dipertahankan, kecuali pemain
+    yang pindah keluar ke tim yang diterima (supaya tidak tercatat dua kali). Tim lain
+    diganti dengan hasil scraping terbaru; tim yang hilang dari liga ikut terhapus.
+    """
+    keep = master[master['team'].isin(change_set.skipped_teams)]
+    moved = change_set.transferred
+    if 'player_id' in keep.columns and 'player_id' in moved.columns:
+        keep = keep[~keep['player_id'].isin(moved['player_id'])]
+    else:
+        moved_from = moved[['player_name', 'team_from']].rename(columns={'team_from': 'team'})
+        keep = keep.loc[_without(keep[KEY], moved_from).index]
+    return pd.concat([keep, change_set.upserts], ignore_index=True)
+
+
+def ingest(master, scraped, min_team_coverage=0.5, failed_leagues=()):
+    """Hitung change set lalu terapkan ke master. Return (master_baru, change_set)."""
+    change_set = compute_change_set(master, scraped, min_team_coverage, failed_leagues)
+    return apply_change_set(master, change_set), change_set
+
+
+def print_summary(change_set):
+    summary = change_set.summary()
+    print(f"🆕 Pemain baru   : {summary['new']}")
+    print(f"👋 Keluar        : {summary['departed']}")
+    print(f"🔁 Transfer      : {summary['transferred']}")
+    print(f"💰 Value berubah : {summary['value_changed']}")
+    if summary['skipped_teams']:
+        print(f"⚠️ Tim dipertahankan (gagal fetch / data parsial): {', '.join(summary['skipped_teams'])}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Garuda Scout - change set antar snapshot")
+    parser.add_argument('--store', default=SnapshotStore.DEFAULT_ROOT, help="Folder snapshot store")
+    parser.add_argument('--from', dest='from_snapshot', required=True, help="Snapshot lama (YYYYMMDD)")
+    parser.add_argument('--to', dest='to_snapshot', required=True, help="Snapshot baru (YYYYMMDD)")
+    parser.add_argument('--identity', default=DEFAULT_IDENTITY_ROOT, help="Folder registry player_id (kosongkan untuk key nama + tim)")
+    parser.add_argument('--min-team-coverage', type=float, default=0.5)
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.store)
+    old = store.load(snapshots=[args.from_snapshot])
+    new = store.load(snapshots=[args.to_snapshot])
+    ids = load_ids(args.identity, [args.from_snapshot, args.to_snapshot]) if args.identity else None
+    if ids is not None and set(ids['snapshot']) == {args.from_snapshot, args.to_snapshot}:
+        old['player_id'] = attach_ids(old, ids[ids['snapshot'] == args.from_snapshot])
+        new['player_id'] = attach_ids(new, ids[ids['snapshot'] == args.to_snapshot])
+    print_summary(compute_change_set(old, new, args.min_team_coverage))
@@ -0,0 +1,189 @@
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class Instrumentation:
+    """
+    Pencatat timing terstruktur untuk scraper & ScoutBrain (thread-safe).
+    - record()/timer() mencatat satu event: nama, durasi, dan field bebas
+      (url, status, bytes, rows, method, ...).
+    - Event disimpan di buffer terbatas dan, jika log_path diisi, langsung
+      ditulis sebagai JSON-lines (satu baris per event).
+    - Agregat per event (count, total, max, bytes, rows) bisa diekspor sebagai
+      snapshot teks Prometheus lewat prometheus_text()/write_prometheus().
+    """
+
+    # Field yang dipakai sebagai label Prometheus (nilai diskrit)
+    LABEL_FIELDS = ('method', 'source', 'stage', 'status')
+    # Field numerik yang dijumlahkan per event
+    SUM_FIELDS = ('bytes', 'rows')
+
+    def __init__(self, log_path=None, max_events=10000, prefix='garuda_scout'):
+        self.log_path = log_path
+        self.prefix = prefix
+        self.events = deque(maxlen=max_events)
+        self._stats = {}  # (event, labels) -> {'count', 'seconds', 'max', 'bytes', 'rows'}
+        self._lock = threading.Lock()
+        self._log_file = None
+
+    def record(self, event, duration=None, **fields):
+        """Catat satu event. duration dalam detik (opsional)."""
+        entry = {'ts': round(time.time(), 3), 'event': event}
+        if duration is not None:
+            entry['duration_ms'] = round(duration * 1000, 3)
+        entry.update(fields)
+
+        labels = tuple((k, str(fields[k])) for k in self.LABEL_FIELDS if fields.get(k) is not None)
+        with self._lock:
+            self.events.append(entry)
+            stats = self._stats.setdefault((event, labels), {'count': 0, 'seconds': 0.0, 'max': 0.0, 'bytes': 0, 'rows': 0})
+            stats['count'] += 1
+            if duration is not None:
+                stats['seconds'] += duration
+                stats['max'] = max(stats['max'], duration)
+            for key in self.SUM_FIELDS:
+                if isinstance(fields.get(key), (int, float)):
+                    stats[key] += fields[key]
+            if self.log_path:
+                if self._log_file is None:
+                    os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+                    self._log_file = open(self.log_path, 'a', encoding='utf-8')
+                self._log_file.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+                self._log_file.flush()
+        return entry
+
+    @contextmanager
+    def timer(self, event, **fields):
+        """
+        Ukur durasi blok kode. Yield dict fields yang boleh dilengkapi di dalam blok:
+            with metrics.timer('parse_squad', url=url) as ev:
+                ev['rows'] = len(rows)
+        """
+        start = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.record(event, time.perf_counter() - start, **fields)
+
+    def summary(self):
+        """Total per event (semua label digabung): count, total_s, mean_ms, max_ms, bytes, rows"""
+        with self._lock:
+            items = list(self._stats.items())
+        totals = {}
+        for (event, _), stats in items:
+            total = totals.setdefault(event, {'count': 0, 'total_s': 0.0, 'max_ms': 0.0, 'bytes': 0, 'rows': 0})
+            total['count'] += stats['count']
+            total['total_s'] += stats['seconds']
+            total['max_ms'] = max(total['max_ms'], stats['max'] * 1000)
+            total['bytes'] += stats['bytes']
+            total['rows'] += stats['rows']
+        for total in totals.values():
+            total['mean_ms'] = round(total['total_s'] * 1000 / total['count'], 3) if total['count'] else 0.0
+            total['total_s'] = round(total['total_s'], 3)
+            total['max_ms'] = round(total['max_ms'], 3)
+        return totals
+
+    def breakdown(self, event, label):
+        """Total detik satu event per nilai label, misal breakdown('run_stage', 'stage')"""
+        with self._lock:
+            items = list(self._stats.items())
+        totals = {}
+        for (name, labels), stats in items:
+            if name == event:
+                key = dict(labels).get(label)
+                totals[key] = totals.get(key, 0.0) + stats['seconds']
+        return totals
+
+    def prometheus_text(self):
+        """Snapshot agregat dalam format teks Prometheus (exposition format 0.0.4)"""
+        with self._lock:
+            items = sorted(self._stats.items())
+
+        lines = []
+        by_event = {}
+        for (event, labels), stats in items:
+            by_event.setdefault(event, []).append((labels, stats))
+
+        for event, series in by_event.items():
+            name = f"{self.prefix}_{event}"
+            lines.append(f"# HELP {name}_seconds Durasi event {event}")
+            lines.append(f"# TYPE {name}_seconds summary")
+            for labels, stats in series:
+                label_text = _label_text(labels)
+                lines.append(f"{name}_seconds_count{label_text} {stats['count']}")
+                lines.append(f"{name}_seconds_sum{label_text} {stats['seconds']:.6f}")
+            lines.append(f"# TYPE {name}_seconds_max gauge")
+            for labels, stats in series:
+                lines.append(f"{name}_seconds_max{_label_text(labels)} {stats['max']:.6f}")
+            for key in self.SUM_FIELDS:
+                if any(stats[key] for _, stats in series):
+                    lines.append(f"# TYPE {name}_{key}_total counter")
+                    for labels, stats in series:
+                        lines.append(f"{name}_{key}_total{_label_text(labels)} {stats[key]}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+        return path
+
+    def close(self):
+        """Tutup file run log (dibuka lagi otomatis jika ada event baru)"""
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    escape = lambda v: v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{k}="{escape(v)}"' for k, v in labels) + '}'
+
+
+def timed(method):
+    """
+    Catat durasi setiap panggilan method ke self.metrics sebagai event 'query'
+    (label method=nama method, rows=jumlah baris hasil jika ada).
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.metrics.timer('query', method=method.__name__) as ev:
+            result = method(self, *args, **kwargs)
+            if result is not None and hasattr(result, '__len__'):
+                ev['rows'] = len(result)
+            return result
+    return wrapper
+
+
+@contextmanager
+def profiled(path=None, top=20):
+    """
+    cProfile opsional per run: jika path diisi, profil disimpan ke file .prof
+    dan top fungsi (cumulative time) dicetak. path=None -> tidak melakukan apa-apa.
+    """
+    if not path:
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        profiler.dump_stats(path)
+        print(f"🔬 Profil cProfile disimpan ke {path}")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(top)
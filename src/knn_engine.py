@@ -0,0 +1,170 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+
+class _KDTree:
+    """
+    KD-tree sederhana berbasis array untuk satu partisi (posisi x liga).
+    Setiap node menyimpan bounding box di ruang fitur (untuk batas bawah jarak)
+    dan di kolom constraint (untuk memangkas node yang pasti di luar filter).
+    """
+
+    def __init__(self, X, C, rows, leaf_size=32):
+        n = len(X)
+        perm = np.arange(n)
+        starts, ends, lefts, rights = [], [], [], []
+
+        # Build iteratif: split median di dimensi dengan sebaran terbesar
+        stack = [(0, n, -1, False)]
+        while stack:
+            start, end, parent, is_right = stack.pop()
+            node = len(starts)
+            starts.append(start)
+            ends.append(end)
+            lefts.append(-1)
+            rights.append(-1)
+            if parent >= 0:
+                (rights if is_right else lefts)[parent] = node
+
+            if end - start > leaf_size:
+                pts = X[perm[start:end]]
+                dim = int(np.argmax(pts.max(axis=0) - pts.min(axis=0)))
+                mid = (end - start) // 2
+                part = np.argpartition(pts[:, dim], mid)
+                perm[start:end] = perm[start:end][part]
+                stack.append((start + mid, end, node, True))
+                stack.append((start, start + mid, node, False))
+
+        self.X, self.C, self.rows = X[perm], C[perm], rows[perm]
+        self.start, self.end = np.array(starts), np.array(ends)
+        self.left, self.right = np.array(lefts), np.array(rights)
+
+        # Bounding box tiap node
+        n_nodes = len(starts)
+        self.x_lo = np.empty((n_nodes, X.shape[1]))
+        self.x_hi = np.empty((n_nodes, X.shape[1]))
+        self.c_lo = np.empty((n_nodes, C.shape[1]))
+        self.c_hi = np.empty((n_nodes, C.shape[1]))
+        for node in range(n_nodes):
+            sl = slice(starts[node], ends[node])
+            self.x_lo[node], self.x_hi[node] = self.X[sl].min(axis=0), self.X[sl].max(axis=0)
+            self.c_lo[node], self.c_hi[node] = self.C[sl].min(axis=0), self.C[sl].max(axis=0)
+
+    def min_dist(self, node, q):
+        """Batas bawah jarak dari q ke titik manapun di node"""
+        return float(np.linalg.norm(q - np.clip(q, self.x_lo[node], self.x_hi[node])))
+
+    def may_satisfy(self, node, lo, hi):
+        """False jika seluruh isi node pasti melanggar constraint"""
+        return bool(np.all(self.c_hi[node] >= lo) and np.all(self.c_lo[node] <= hi))
+
+
+class ConstrainedKNN:
+    """
+    Nearest-neighbour dengan filter yang dievaluasi di dalam pencarian.
+    - Partisi per (posisi, liga): filter liga hanya memilih tree yang relevan.
+    - Fitur & bobot bisa diatur; fitur di-standardize per posisi lalu dikali bobot.
+    - Constraint rentang (misal umur & market value) memangkas node KD-tree
+      berdasarkan bounding box-nya, jadi kandidat di luar filter tidak pernah dihitung.
+    - Pencarian best-first lintas partisi: berhenti begitu batas bawah jarak node
+      berikutnya lebih besar dari kandidat ke-k.
+    """
+
+    def __init__(self, df, features=('age', 'market_value_est'), weights=None,
+                 constraint_columns=('age', 'market_value_est'), leaf_size=32):
+        self.df = df
+        self.features = list(features)
+        self.weights = np.ones(len(self.features)) if weights is None else np.asarray(weights, dtype=float)
+        if len(self.weights) != len(self.features):
+            raise ValueError("Jumlah weights harus sama dengan jumlah features")
+        self.constraint_columns = list(constraint_columns)
+        self.leaf_size = leaf_size
+
+        X_all = np.nan_to_num(df[self.features].to_numpy(dtype=float))
+        C_all = np.nan_to_num(df[self.constraint_columns].to_numpy(dtype=float))
+        positions = df['position'].to_numpy()
+
+        self._scaled = np.full_like(X_all, np.nan)
+        self._trees = {}  # posisi -> {liga: _KDTree}
+        for pos, pos_rows in pd.Series(np.arange(len(df))).groupby(positions, sort=False):
+            pos_rows = pos_rows.to_numpy()
+            X = X_all[pos_rows]
+            std = X.std(axis=0)
+            std[std == 0] = 1.0
+            self._scaled[pos_rows] = (X - X.mean(axis=0)) / std * self.weights
+
+            leagues = df['league'].to_numpy()[pos_rows]
+            self._trees[pos] = {}
+            for league, idx in pd.Series(np.arange(len(pos_rows))).groupby(leagues, sort=False):
+                rows = pos_rows[idx.to_numpy()]
+                self._trees[pos][league] = _KDTree(self._scaled[rows], C_all[rows], rows, leaf_size)
+
+    def _bounds(self, constraints):
+        lo = np.full(len(self.constraint_columns), -np.inf)
+        hi = np.full(len(self.constraint_columns), np.inf)
+        for col, (c_lo, c_hi) in (constraints or {}).items():
+            if col not in self.constraint_columns:
+                raise ValueError(f"Kolom constraint tidak di-index: {col} (pilihan: {', '.join(self.constraint_columns)})")
+            i = self.constraint_columns.index(col)
+            if c_lo is not None:
+                lo[i] = c_lo
+            if c_hi is not None:
+                hi[i] = c_hi
+        return lo, hi
+
+    def query(self, row, k=10, leagues=None, constraints=None):
+        """
+        Cari k tetangga terdekat dari baris `row` (iloc di df) dalam posisi yang sama.
+        leagues     : list liga yang boleh (None = semua)
+        constraints : {kolom: (min, max)}, None pada salah satu sisi = tanpa batas
+        Return (rows, distances) terurut dari yang paling dekat (kosong jika k <= 0).
+        """
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        pos = self.df['position'].iat[row]
+        q = self._scaled[row]
+        lo, hi = self._bounds(constraints)
+        # Hanya tree liga yang diminta yang disentuh, jumlah liga lain tidak berpengaruh
+        by_league = self._trees[pos]
+        trees = list(by_league.values()) if leagues is None else [by_league[lg] for lg in leagues if lg in by_league]
+
+        heap = []
+        for tree_id, tree in enumerate(trees):
+            if tree.may_satisfy(0, lo, hi):
+                heapq.heappush(heap, (tree.min_dist(0, q), tree_id, 0))
+
+        best_d = np.empty(0)
+        best_r = np.empty(0, dtype=np.int64)
+        kth = np.inf
+        while heap:
+            bound, tree_id, node = heapq.heappop(heap)
+            if len(best_d) >= k and bound > kth:
+                break
+            tree = trees[tree_id]
+
+            if tree.left[node] < 0:
+                sl = slice(tree.start[node], tree.end[node])
+                mask = np.all((tree.C[sl] >= lo) & (tree.C[sl] <= hi), axis=1) & (tree.rows[sl] != row)
+                if not mask.any():
+                    continue
+                d = np.linalg.norm(tree.X[sl][mask] - q, axis=1)
+                best_d = np.concatenate([best_d, d])
+                best_r = np.concatenate([best_r, tree.rows[sl][mask]])
+                if len(best_d) > k:
+                    keep = np.lexsort((best_r, best_d))[:k]
+                    best_d, best_r = best_d[keep], best_r[keep]
+                if len(best_d) >= k:
+                    kth = best_d.max()
+                continue
+
+            for child in (tree.left[node], tree.right[node]):
+                if not tree.may_satisfy(child, lo, hi):
+                    continue
+                child_bound = tree.min_dist(child, q)
+                if len(best_d) < k or child_bound <= kth:
+                    heapq.heappush(heap, (child_bound, tree_id, child))
+
+        order = np.lexsort((best_r, best_d))
+        return best_r[order], best_d[order]
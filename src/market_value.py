@@ -0,0 +1,102 @@
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.aggregates import DEFAULT_AGGREGATES_ROOT, compute_aggregates, write_aggregates
+from src.storage import SnapshotStore
+
+# Satuan nilai pasar Transfermarkt versi Indonesia
+UNITS = {
+    'Rb': 1e3,      # ribu
+    'Jt': 1e6,      # juta
+    'Mlyr': 1e9,    # milyar
+    'T': 1e12,      # triliun
+}
+
+# "Rp3,91Mlyr." / "Rp434,54Jt." / "Rp1.250Rb." / "-"
+_PATTERN = r'^\s*(?:Rp)?\s*(?P<number>\d[\d.]*(?:,\d+)?)\s*(?P<unit>Rb|Jt|Mlyr|T)?\.?\s*$'
+
+
+def parse_market_values(raw):
+    """
+    Parse kolom market value format Indonesia menjadi Rupiah (int64), vectorized.
+    Titik = pemisah ribuan, koma = desimal. Nilai yang tidak bisa diparse ("-", kosong) -> 0.
+    """
+    raw = pd.Series(raw, dtype='string')
+    parts = raw.str.extract(_PATTERN)
+    number = pd.to_numeric(
+        parts['number'].str.replace('.', '', regex=False).str.replace(',', '.', regex=False),
+        errors='coerce')
+    multiplier = parts['unit'].map(UNITS).astype(float).fillna(1.0)
+    value = (number.astype(float) * multiplier).round()
+    return pd.Series(np.nan_to_num(value.to_numpy(dtype=float), nan=0.0).astype('int64'), index=raw.index)
+
+
+def parse_market_value(raw):
+    """Versi skalar parse_market_values untuk satu string"""
+    return int(parse_market_values([raw]).iloc[0])
+
+
+def format_market_values(values):
+    """Kebalikan parse_market_values: Rupiah -> "Rp3,04Mlyr." / "Rp434,54Jt." / "-" (0)"""
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), '-', dtype=object)
+    for threshold, unit in sorted(((v, k) for k, v in UNITS.items()), reverse=True):
+        mask = (values >= threshold) & (out == '-')
+        out[mask] = [f"Rp{v:.2f}{unit}.".replace('.', ',', 1) for v in values[mask] / threshold]
+    return out
+
+
+def reprocess_frame(df):
+    """Hitung ulang market_value_est dari market_value_raw. Return (df_baru, jumlah baris yang berubah)."""
+    fixed = parse_market_values(df['market_value_raw'])
+    changed = int((fixed.to_numpy() != df['market_value_est'].to_numpy()).sum())
+    df = df.copy()
+    df['market_value_est'] = fixed.to_numpy()
+    return df, changed
+
+
+def reprocess_all(store_path=SnapshotStore.DEFAULT_ROOT, csv_paths=(), aggregates_path=DEFAULT_AGGREGATES_ROOT):
+    """
+    Perbaiki market_value_est di semua snapshot store (satu kali load, vectorized)
+    dan di file CSV yang diberikan (raw mingguan & master).
+    Agregat dashboard tiap snapshot yang ditulis ulang ikut dibangun ulang.
+    """
+    store = SnapshotStore(store_path)
+    snapshots = store.snapshots()
+    if snapshots:
+        df, changed = reprocess_frame(store.load(snapshots=None))
+        for snapshot, part in df.groupby('snapshot', sort=True):
+            part = part.drop(columns='snapshot')
+            store.write_snapshot(part, snapshot=snapshot)
+            write_aggregates(compute_aggregates(part), aggregates_path, snapshot,
+                             source_hash=store.snapshot_hash(snapshot))
+        print(f"📦 Store: {len(snapshots)} snapshot, {changed} dari {len(df)} baris diperbaiki (agregat dibangun ulang)")
+
+    for path in csv_paths:
+        df, changed = reprocess_frame(pd.read_csv(path))
+        df.to_csv(path, index=False)
+        print(f"📄 {path}: {changed} dari {len(df)} baris diperbaiki")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Garuda Scout - hitung ulang market_value_est dari market_value_raw")
+    sub = parser.add_subparsers(dest='command', required=True)
+    reprocess = sub.add_parser('reprocess', help="Perbaiki semua snapshot historis")
+    reprocess.add_argument('--store', default=SnapshotStore.DEFAULT_ROOT, help="Folder snapshot store")
+    reprocess.add_argument('--aggregates', default=DEFAULT_AGGREGATES_ROOT, help="Folder agregat dashboard")
+    reprocess.add_argument('--raw', default='data/raw', help="Folder CSV real_scout_*.csv (kosongkan untuk skip)")
+    reprocess.add_argument('--master', default='data/processed/master_player_db.csv', help="CSV master (kosongkan untuk skip)")
+    args = parser.parse_args()
+
+    csv_paths = sorted(glob.glob(os.path.join(args.raw, 'real_scout_*.csv'))) if args.raw else []
+    if args.master and os.path.exists(args.master):
+        csv_paths.append(args.master)
+
+    start = time.perf_counter()
+    reprocess_all(args.store, csv_paths, args.aggregates)
+    print(f"\n✅ Selesai dalam {time.perf_counter() - start:.2f} detik")
@@ -1,91 +1,678 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics.pairwise import cosine_similarity
+
+from src.aggregates import DEFAULT_AGGREGATES_ROOT, compute_aggregates, load_aggregates
+from src.compact import compact_frame, memory_report
+from src.identity import DEFAULT_IDENTITY_ROOT, attach_ids, load_ids
+from src.instrumentation import Instrumentation, timed
+from src.knn_engine import ConstrainedKNN
+from src.storage import SnapshotStore, fingerprint
+
+
+def _freeze(value):
+    """Ubah argumen (list/set/dict) menjadi bentuk hashable untuk key memo"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, np.ndarray):
+        return tuple(value.tolist())
+    return value
+
+
+def _unit_scaled(X):
+    """
+    Standardize per kolom (z-score, kolom konstan tidak diskalakan) lalu normalisasi
+    tiap baris ke panjang 1. Setara StandardScaler + normalize dari scikit-learn,
+    tanpa biaya import sklearn saat dashboard start.
+    """
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    Z = (X - X.mean(axis=0)) / std
+    norms = np.sqrt(np.einsum('ij,ij->i', Z, Z))
+    norms[norms == 0] = 1.0
+    return Z / norms[:, None]
+
+
+def memoized(method):
+    """
+    Cache hasil query murni per instance ScoutBrain (LRU, thread-safe).
+    Cache dikosongkan setiap rebuild(). Hasil yang dikembalikan dipakai bersama,
+    jadi jangan dimodifikasi in-place oleh pemanggil.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            key = (method.__name__, _freeze(args), _freeze(kwargs))
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+
+        with self._memo_lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+
+        result = method(self, *args, **kwargs)
+        with self._memo_lock:
+            self._memo[key] = result
+            while len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return result
+    return wrapper
+
 
 class ScoutBrain:
-    def __init__(self, data_path='data/processed/master_player_db.csv'):
+    # Kolom minimum yang dipakai semua method ScoutBrain
+    REQUIRED_COLUMNS = ['player_name', 'team', 'league', 'position', 'age', 'market_value_raw', 'market_value_est']
+    # Jumlah hasil query yang disimpan di memo LRU
+    MEMO_SIZE = 512
+    # Squad Planner: budget = rata-rata 15 pemain termahal, kandidat di rentang 0.3x - 2.5x
+    DEFAULT_SQUAD_VALUE = 1000000000 # 1 Milyar default
+    BUDGET_MIN_RATIO = 0.3
+    BUDGET_MAX_RATIO = 2.5
+
+    def __init__(self, data_path='data/processed/master_player_db.csv', store_path=None,
+                 snapshots='latest', leagues=None, columns=None, metrics=None,
+                 aggregates_path=DEFAULT_AGGREGATES_ROOT, compact=False, identity_path=DEFAULT_IDENTITY_ROOT):
+        """
+        Sumber data: CSV (data_path) atau, jika store_path diisi, snapshot store Parquet.
+        Dari store hanya partisi (snapshots, leagues) & kolom (columns) yang diminta yang dibaca.
+        metrics: Instrumentation untuk durasi rebuild & query (default: instance baru).
+        aggregates_path: tabel agregat per snapshot (dipakai jika cocok dengan data yang di-load).
+        compact=True: mode hemat memori untuk riwayat multi-season -> kolom string jadi
+        categorical, angka di-downcast, market_value_raw tidak dibaca dari disk
+        (dibentuk ulang dari market_value_est, hanya nilai uniknya).
+        identity_path: tabel player_id per snapshot (src.identity); jika ada, df mendapat kolom
+        player_id dan query kemiripan bisa memakai player_id selain nama.
+        """
+        self.data_path = data_path
+        self.store_path = store_path
+        self._load_snapshots = snapshots
+        self._load_leagues = leagues
+        self._load_columns = columns
+        self.aggregates_path = aggregates_path
+        self.compact = compact
+        self.identity_path = identity_path
+
+        # Features for similarity (Age & Value)
+        # Kita menggunakan Umur dan Harga Pasar sebagai "Profil" pemain
+        self.features = ['age', 'market_value_est']
+
+        self._memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self.metrics = metrics or Instrumentation()
+
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Load ulang data dari disk dan bangun ulang semua index turunan.
+        Panggil ini setiap kali CSV/store berubah (misal setelah scraping mingguan).
+        """
+        start = time.perf_counter()
+
         # Load Data
-        self.df = pd.read_csv(data_path)
-        
+        self.fingerprint = self.data_fingerprint()
+        self.df = self._load_data()
+
         # Standardize Columns
         if 'league_country' in self.df.columns:
             self.df.rename(columns={'league_country': 'league'}, inplace=True)
-            
-        # Features for similarity (Age & Value)
-        # Kita menggunakan Umur dan Harga Pasar sebagai "Profil" pemain
-        self.features = ['age', 'market_value_est']
+
         self.df[self.features] = self.df[self.features].fillna(0)
-        
-        self.scaler = StandardScaler()
-        
+        self._attach_player_ids()
+        if self.compact:
+            self.df = compact_frame(self.df)
+
+        self._build_hierarchy()
+        self._build_similarity_index()
+        self._build_planner_index()
+        self._load_aggregates()
+
+        with self._memo_lock:
+            self._memo.clear()
+            self._knn_engines = {}
+
+        self.metrics.record('rebuild', time.perf_counter() - start, rows=len(self.df))
+
+    def data_fingerprint(self):
+        """Sidik jari sumber data (CSV atau store) untuk deteksi perubahan file"""
+        return fingerprint(self.store_path if self.store_path is not None else self.data_path)
+
+    def is_stale(self):
+        """True jika file data sudah berubah sejak terakhir di-load"""
+        return self.data_fingerprint() != self.fingerprint
+
+    def memory_report(self):
+        """Pemakaian memori self.df: total, per baris, dan per kolom per baris"""
+        return memory_report(self.df)
+
+    def _load_data(self):
+        # Mode compact: market_value_raw tidak dibaca (dibentuk ulang di compact_frame)
+        skip = {'market_value_raw'} if self.compact else set()
+        if self.store_path is None:
+            return pd.read_csv(self.data_path, usecols=lambda c: c not in skip)
+
+        store = SnapshotStore(self.store_path)
+        columns = None
+        if self._load_columns is not None:
+            columns = self.REQUIRED_COLUMNS + [c for c in self._load_columns if c not in self.REQUIRED_COLUMNS]
+        elif skip:
+            columns = store.columns()
+        if columns is not None:
+            columns = [c for c in columns if c not in skip]
+        return store.load(snapshots=self._load_snapshots, leagues=self._load_leagues,
+                          columns=columns, as_category=self.compact)
+
+    def _attach_player_ids(self):
+        """
+        Kolom player_id (stabil lintas snapshot, -1 = belum di-resolve) dari tabel identity.
+        Key per snapshot: player_name + team (unik dalam satu snapshot).
+        """
+        if self.store_path is None:
+            return
+        if 'snapshot' in self.df.columns:
+            keys = ['snapshot', 'player_name', 'team']
+            ids = load_ids(self.identity_path, sorted(self.df['snapshot'].astype(str).unique()))
+        elif self._load_snapshots == 'latest':
+            keys = ['player_name', 'team']
+            ids = load_ids(self.identity_path, [SnapshotStore(self.store_path).latest_snapshot()])
+        else:
+            return
+        if ids is None:
+            return
+        self.df['player_id'] = attach_ids(self.df, ids, keys)
+
+    def _load_aggregates(self):
+        """
+        Tabel ringkasan dashboard (tim, liga, liga+tim+posisi, pool Wonderkid/Senior).
+        Pakai hasil yang sudah dimaterialisasi saat scraping jika data yang di-load
+        adalah snapshot terbaru utuh dan isinya belum berubah sejak agregat ditulis;
+        selain itu dihitung sekali di sini.
+        """
+        self.aggregates = None
+        if self.store_path is not None and self._load_snapshots == 'latest' and self._load_leagues is None:
+            store = SnapshotStore(self.store_path)
+            snapshot = store.latest_snapshot()
+            self.aggregates = load_aggregates(self.aggregates_path, snapshot, source_hash=store.snapshot_hash(snapshot))
+        if self.aggregates is None:
+            self.aggregates = compute_aggregates(self.df)
+
+    def _build_hierarchy(self):
+        """
+        Index bertingkat liga -> tim -> posisi -> posisi baris (iloc) di self.df.
+        Dibangun sekali dengan satu groupby, sehingga filter dashboard
+        tidak perlu boolean mask ke seluruh dataframe.
+        """
+        groups = self.df.groupby(['league', 'team', 'position'], sort=True, observed=True).indices
+        self._hierarchy = {}
+        # Jumlah baris per liga -> tim dan liga -> posisi, untuk count() tanpa iterasi grup
+        self._team_sizes = {}
+        self._position_sizes = {}
+        for (league, team, pos), rows in groups.items():
+            self._hierarchy.setdefault(league, {}).setdefault(team, {})[pos] = rows
+            team_sizes = self._team_sizes.setdefault(league, {})
+            team_sizes[team] = team_sizes.get(team, 0) + len(rows)
+            pos_sizes = self._position_sizes.setdefault(league, {})
+            pos_sizes[pos] = pos_sizes.get(pos, 0) + len(rows)
+        self._league_sizes = {league: sum(sizes.values()) for league, sizes in self._team_sizes.items()}
+        self._players_cache = {}
+
+    @staticmethod
+    def _as_list(values):
+        if values is None:
+            return None
+        return [values] if isinstance(values, str) else list(values)
+
+    def _groups(self, leagues=None, teams=None, positions=None):
+        """Iterasi (league, team, position, rows) yang lolos filter, tanpa scan baris"""
+        leagues = self._as_list(leagues)
+        teams = None if teams is None else set(self._as_list(teams))
+        positions = None if positions is None else set(self._as_list(positions))
+        for league in (self._hierarchy if leagues is None else leagues):
+            for team, by_pos in self._hierarchy.get(league, {}).items():
+                if teams is not None and team not in teams:
+                    continue
+                for pos, rows in by_pos.items():
+                    if positions is None or pos in positions:
+                        yield league, team, pos, rows
+
+    def leagues(self):
+        return sorted(self._hierarchy)
+
+    @memoized
+    def teams_in(self, leagues=None):
+        """Daftar tim (terurut) di liga yang dipilih"""
+        return sorted({team for _, team, _, _ in self._groups(leagues)})
+
+    @memoized
+    def positions_in(self, leagues=None, teams=None):
+        """Daftar posisi (terurut) di liga/tim yang dipilih"""
+        return sorted({pos for _, _, pos, _ in self._groups(leagues, teams)})
+
+    def players_in(self, league, team, position):
+        """Daftar nama pemain unik (terurut) untuk satu liga + tim + posisi"""
+        key = (league, team, position)
+        if key not in self._players_cache:
+            rows = self._hierarchy.get(league, {}).get(team, {}).get(position)
+            names = [] if rows is None else self.df['player_name'].to_numpy()[rows]
+            self._players_cache[key] = sorted(set(names))
+        return self._players_cache[key]
+
+    def count(self, leagues=None, teams=None, positions=None):
+        """
+        Jumlah baris yang lolos filter dari ukuran grup yang sudah dihitung saat build,
+        tanpa membentuk daftar baris (biaya tidak bergantung jumlah baris).
+        """
+        leagues = list(self._hierarchy) if leagues is None else dict.fromkeys(self._as_list(leagues))
+        if teams is not None and positions is not None:
+            return sum(len(rows) for _, _, _, rows in self._groups(leagues, teams, positions))
+        if teams is not None:
+            teams = dict.fromkeys(self._as_list(teams))
+            return sum(self._team_sizes.get(league, {}).get(team, 0) for league in leagues for team in teams)
+        if positions is not None:
+            positions = dict.fromkeys(self._as_list(positions))
+            return sum(self._position_sizes.get(league, {}).get(pos, 0) for league in leagues for pos in positions)
+        return sum(self._league_sizes.get(league, 0) for league in leagues)
+
+    @memoized
+    def row_index(self, leagues=None, teams=None, positions=None):
+        """Posisi baris (iloc, urut seperti self.df, read-only) yang lolos filter liga/tim/posisi"""
+        parts = [rows for _, _, _, rows in self._groups(leagues, teams, positions)]
+        rows = np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+        rows.setflags(write=False)
+        return rows
+
+    @timed
+    def filter(self, leagues=None, teams=None, positions=None):
+        """
+        Subset self.df berdasarkan liga/tim/posisi (None = semua).
+        Yang di-memo hanya posisi barisnya (row_index), bukan salinan DataFrame per kombinasi filter.
+        """
+        return self.df.iloc[self.row_index(leagues, teams, positions)]
+
+    @timed
+    @memoized
+    def sorted_rows(self, leagues=None, teams=None, positions=None, sort_by=None, ascending=True):
+        """
+        Posisi baris (iloc) hasil filter, terurut berdasarkan kolom sort_by (stabil).
+        market_value_raw diurutkan lewat market_value_est (urutan string tidak bermakna).
+        """
+        rows = self.row_index(leagues, teams, positions)
+        if sort_by is None:
+            return rows
+        if sort_by == 'market_value_raw':
+            sort_by = 'market_value_est'
+        values = self.df[sort_by].iloc[rows].reset_index(drop=True)
+        order = values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+        return rows[order]
+
+    @timed
+    def page(self, leagues=None, teams=None, positions=None, sort_by=None, ascending=True, offset=0, limit=50):
+        """Satu halaman hasil filter yang sudah diurutkan. Return (total baris, DataFrame halaman)."""
+        rows = self.sorted_rows(leagues, teams, positions, sort_by, ascending)
+        return len(rows), self.df.iloc[rows[offset:offset + limit]]
+
+    @timed
+    @memoized
+    def market_stats(self, leagues=None, teams=None, positions=None):
+        """Jumlah pemain, rata-rata & maks market value untuk filter liga/tim/posisi (dari group_summary)"""
+        groups = self.aggregates['group_summary']
+        mask = np.ones(len(groups), dtype=bool)
+        for column, values in (('league', leagues), ('team', teams), ('position', positions)):
+            if values is not None:
+                mask &= groups[column].isin(self._as_list(values)).to_numpy()
+        groups = groups[mask]
+        players = int(groups['players'].sum())
+        return {
+            'players': players,
+            'avg_value': groups['value_sum'].sum() / players if players else float('nan'),
+            'max_value': groups['value_max'].max() if players else float('nan'),
+        }
+
+    @timed
+    @memoized
+    def eligible(self, league, category):
+        """Pool kandidat 'wonderkid' / 'senior' di satu liga (value di atas rata-rata liga)"""
+        pool = self.aggregates['eligibility']
+        return pool[(pool['league'] == league) & (pool['category'] == category)]
+
+    def _similarity_rows(self):
+        """
+        Baris kandidat similarity: satu baris per pemain, dari snapshot terbaru pemain itu.
+        Jika df memuat banyak snapshot, baris minggu-minggu lama tidak ikut sebagai kandidat
+        (pemain tidak muncul di hasilnya sendiri) dan query memakai statistik terbaru.
+        Kunci pemain: player_id jika sudah di-resolve, selain itu player_name.
+        """
+        if 'snapshot' not in self.df.columns or self.df['snapshot'].nunique() <= 1:
+            return np.arange(len(self.df))
+        _, snapshot = np.unique(self.df['snapshot'].astype(str).to_numpy(), return_inverse=True)
+        key = pd.factorize(self.df['player_name'])[0]
+        if 'player_id' in self.df.columns:
+            ids = self.df['player_id'].to_numpy()
+            key = np.where(ids >= 0, ids, -1 - key)
+        latest = pd.Series(snapshot).groupby(key).transform('max').to_numpy()
+        return np.flatnonzero(snapshot == latest)
+
+    def _build_similarity_index(self):
+        """
+        Precompute matriks fitur yang sudah di-standardize per posisi.
+        Setiap baris dinormalisasi ke panjang 1 sehingga cosine similarity
+        cukup dihitung dengan satu dot product saat query.
+        """
+        positions = self.df['position'].to_numpy()
+        # Baris kandidat (iloc, terurut). Baris tanpa posisi (NaN hasil scraping) tidak punya
+        # grup posisi, jadi tidak ikut index (dan tidak bisa dicari) daripada merusak semua query.
+        rows = self._similarity_rows()
+        self._similar_rows = rows[pd.notna(positions[rows])]
+        self._pos_rows = {}     # posisi -> baris kandidat (iloc) di self.df
+        self._pos_matrix = {}   # posisi -> matriks ter-standardize & ter-normalisasi
+        self._name_index = {}   # nama pemain -> (posisi, index lokal di matriks posisi)
+        self._id_index = {}     # player_id -> (posisi, index lokal di matriks posisi)
+
+        X_all = self.df[self.features].to_numpy(dtype=float)
+        for pos, rows in pd.Series(self._similar_rows).groupby(positions[self._similar_rows], sort=False):
+            rows = rows.to_numpy()
+            self._pos_rows[pos] = rows
+            self._pos_matrix[pos] = _unit_scaled(X_all[rows])
+
+        # Sama seperti lookup lama: kemunculan pertama nama (di antara kandidat) yang dipakai
+        names = self.df['player_name'].to_numpy()
+        first_rows = self._similar_rows[~pd.Series(names[self._similar_rows]).duplicated(keep='first').to_numpy()]
+        for row in first_rows:
+            pos = positions[row]
+            local_idx = int(np.searchsorted(self._pos_rows[pos], row))
+            self._name_index[names[row]] = (pos, local_idx)
+
+        # player_id membedakan pemain senama (nama hanya menunjuk kemunculan pertama)
+        if 'player_id' in self.df.columns:
+            player_ids = self.df['player_id'].to_numpy()
+            for row in self._similar_rows[player_ids[self._similar_rows] >= 0]:
+                pos = positions[row]
+                self._id_index[int(player_ids[row])] = (pos, int(np.searchsorted(self._pos_rows[pos], row)))
+
+        self._similar_view = self.df[['player_name', 'team', 'league', 'position', 'age', 'market_value_raw']]
+
+    def _locate(self, player):
+        """Nama pemain atau player_id -> (posisi, index lokal di matriks posisi), None jika tidak ada"""
+        if isinstance(player, (int, np.integer)) and not isinstance(player, bool):
+            return self._id_index.get(int(player))
+        return self._name_index.get(player)
+
+    @timed
+    @memoized
     def get_similar_players(self, player_name, top_n=10):
         """
         Mencari pemain yang mirip secara profil (Umur & Harga).
         Digunakan untuk mencari pengganti 'apple-to-apple'.
+        player_name boleh berupa player_id (int) untuk membedakan pemain senama.
         """
         # Cek apakah pemain ada di database
-        if player_name not in self.df['player_name'].values:
+        located = self._locate(player_name)
+        if located is None:
+            return None
+
+        # Kandidat harus memiliki POSISI YANG SAMA (sudah dipisah di index)
+        target_pos, target_idx = located
+        X_pos = self._pos_matrix[target_pos]
+
+        # Hitung Similarity (Cosine) -> dot product karena baris sudah dinormalisasi
+        similarity_scores = X_pos @ X_pos[target_idx]
+        # Skip diri sendiri
+        similarity_scores[target_idx] = -np.inf
+
+        # Partial selection: ambil top_n tanpa sorting seluruh kandidat
+        k = min(top_n, len(similarity_scores) - 1)
+        if k <= 0:
+            return self._similar_view.iloc[[]].assign(similarity_score=[])
+        top_idx = np.argpartition(-similarity_scores, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-similarity_scores[top_idx], kind='stable')]
+
+        result = self._similar_view.iloc[self._pos_rows[target_pos][top_idx]].copy()
+        result['similarity_score'] = (similarity_scores[top_idx] * 100).round(1)
+
+        return result
+
+    @timed
+    @memoized
+    def get_similar_players_batch(self, player_names=None, team_name=None, top_n=10, max_block_cells=4_000_000):
+        """
+        Versi batch dari get_similar_players untuk banyak pemain sekaligus
+        (daftar nama atau satu skuad penuh via team_name).
+        Similarity dihitung per posisi dengan perkalian matriks per blok,
+        sehingga memori dibatasi max_block_cells dan tidak pernah N x N.
+        """
+        if player_names is None:
+            player_names = []
+        player_names = list(player_names)
+        if team_name is not None:
+            # Skuad saat ini saja: baris kandidat (snapshot terbaru tiap pemain) di tim ini
+            team_rows = np.intersect1d(self.row_index(teams=team_name), self._similar_rows)
+            player_names += pd.unique(self.df['player_name'].to_numpy()[team_rows]).tolist()
+
+        # Kelompokkan query per posisi (nama yang tidak dikenal di-skip)
+        queries_by_pos = {}
+        for name in dict.fromkeys(player_names):
+            located = self._locate(name)
+            if located is not None:
+                pos, local_idx = located
+                queries_by_pos.setdefault(pos, ([], []))
+                queries_by_pos[pos][0].append(name)
+                queries_by_pos[pos][1].append(local_idx)
+
+        columns = ['query_player', 'rank'] + list(self._similar_view.columns) + ['similarity_score']
+        frames = []
+        for pos, (names, local_idx) in queries_by_pos.items():
+            X_pos = self._pos_matrix[pos]
+            n_cand = len(X_pos)
+            k = min(top_n, n_cand - 1)
+            if k <= 0:
+                continue
+
+            local_idx = np.asarray(local_idx)
+            block = max(1, max_block_cells // n_cand)
+            top_idx = np.empty((len(local_idx), k), dtype=np.int64)
+            top_scores = np.empty((len(local_idx), k))
+
+            for start in range(0, len(local_idx), block):
+                q = local_idx[start:start + block]
+                scores = X_pos[q] @ X_pos.T
+                # Skip diri sendiri
+                scores[np.arange(len(q)), q] = -np.inf
+
+                part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                part_scores = np.take_along_axis(scores, part, axis=1)
+                order = np.argsort(-part_scores, axis=1, kind='stable')
+                top_idx[start:start + block] = np.take_along_axis(part, order, axis=1)
+                top_scores[start:start + block] = np.take_along_axis(part_scores, order, axis=1)
+
+            result = self._similar_view.iloc[self._pos_rows[pos][top_idx.ravel()]].copy()
+            result.insert(0, 'query_player', np.repeat(names, k))
+            result.insert(1, 'rank', np.tile(np.arange(1, k + 1), len(names)))
+            result['similarity_score'] = (top_scores.ravel() * 100).round(1)
+            frames.append(result)
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)[columns]
+
+    def knn_engine(self, features=None, weights=None):
+        """
+        ConstrainedKNN untuk kombinasi fitur & bobot tertentu.
+        Dibangun saat pertama dipakai, lalu disimpan sampai rebuild() berikutnya.
+        """
+        features = tuple(features or self.features)
+        weights = None if weights is None else tuple(float(w) for w in weights)
+        key = (features, weights)
+        with self._memo_lock:
+            engine = self._knn_engines.get(key)
+        if engine is None:
+            # Dibangun di atas baris kandidat similarity (satu baris per pemain)
+            df = self.df if len(self._similar_rows) == len(self.df) else self.df.iloc[self._similar_rows]
+            engine = ConstrainedKNN(df, features=features, weights=weights)
+            with self._memo_lock:
+                engine = self._knn_engines.setdefault(key, engine)
+        return engine
+
+    @timed
+    @memoized
+    def find_similar(self, player_name, top_n=10, leagues=None, min_age=None, max_age=None,
+                     min_value=None, max_value=None, features=None, weights=None):
+        """
+        Seperti get_similar_players, tapi dengan filter liga, umur & market value
+        yang diterapkan di dalam pencarian kNN (bukan filter setelah hasil keluar).
+        Contoh: mirip X, umur <= 25, value <= 5 Mlyr, di Thailand atau Vietnam.
+        """
+        located = self._locate(player_name)
+        if located is None:
             return None
-            
-        # Ambil data pemain target
-        target_player_data = self.df[self.df['player_name'] == player_name].iloc[0]
-        target_pos = target_player_data['position']
-        
-        # Filter: Kandidat harus memiliki POSISI YANG SAMA
-        df_pos = self.df[self.df['position'] == target_pos].reset_index(drop=True)
-        
-        # Prepare Data Matrix
-        X = df_pos[self.features]
-        X_scaled = self.scaler.fit_transform(X)
-        
-        # Cari index pemain target di dataframe yang sudah difilter
-        target_idx = df_pos[df_pos['player_name'] == player_name].index[0]
-        target_vector = X_scaled[target_idx].reshape(1, -1)
-        
-        # Hitung Similarity (Cosine)
-        similarity_scores = cosine_similarity(target_vector, X_scaled)[0]
-        
-        # Sorting dari yang paling mirip
-        # [1:top_n+1] artinya skip index 0 (karena index 0 adalah diri sendiri)
-        similar_indices = similarity_scores.argsort()[::-1][1:top_n+1]
-        
-        result = df_pos.iloc[similar_indices].copy()
-        result['similarity_score'] = (similarity_scores[similar_indices] * 100).round(1)
-        
-        return result[['player_name', 'team', 'league', 'position', 'age', 'market_value_raw', 'similarity_score']]
 
+        target_pos, target_idx = located
+        # Index baris di dalam df kandidat milik knn_engine
+        row = int(np.searchsorted(self._similar_rows, self._pos_rows[target_pos][target_idx]))
+
+        constraints = {'age': (min_age, max_age), 'market_value_est': (min_value, max_value)}
+        rows, distances = self.knn_engine(features, weights).query(
+            row, k=top_n, leagues=self._as_list(leagues), constraints=constraints)
+
+        result = self._similar_view.iloc[self._similar_rows[rows]].copy()
+        result['distance'] = distances.round(3)
+        return result
+
+    def _build_planner_index(self):
+        """
+        Materialisasi untuk Squad Planner (sekali per load data):
+        - team_budget: rata-rata 15 pemain termahal per tim + rentang budget (satu groupby)
+        - per posisi: kandidat terurut market value (untuk binary search rentang budget)
+          dan rank scout_score global (untuk memilih top-N tanpa sorting ulang)
+        """
+        values = self.df['market_value_est']
+        top15 = self.df.sort_values('market_value_est', ascending=False, kind='stable').groupby('team', sort=False).head(15)
+        avg = top15.groupby('team', observed=True)['market_value_est'].mean()
+        avg = avg.where(avg.notna() & (avg != 0), self.DEFAULT_SQUAD_VALUE)
+
+        self.team_budget = pd.DataFrame({
+            'squad_size': self.df.groupby('team', observed=True).size(),
+            'avg_top15_value': avg,
+            'min_budget': avg * self.BUDGET_MIN_RATIO,
+            'max_budget': avg * self.BUDGET_MAX_RATIO,
+        })
+
+        self._team_codes, self._team_labels = pd.factorize(self.df['team'])
+        self._team_code_of = {team: code for code, team in enumerate(self._team_labels)}
+
+        # scout_score = value / umur (umur 0 -> inf, sama seperti perhitungan lama)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = values.to_numpy(dtype=float) / self.df['age'].to_numpy(dtype=float)
+        self._scout_scores = scores
+
+        self._planner_index = {}
+        for pos, rows in pd.Series(np.arange(len(self.df))).groupby(self.df['position'].to_numpy(), sort=False):
+            rows = rows.to_numpy()
+            pos_values = values.to_numpy()[rows]
+            by_value = np.argsort(pos_values, kind='stable')
+            # Rank 0 = scout_score tertinggi; seri dipecah urutan baris (seperti nlargest keep='first')
+            pos_scores = scores[rows]
+            rank = np.empty(len(rows), dtype=np.int64)
+            rank[np.lexsort((rows, -np.nan_to_num(pos_scores, nan=-np.inf)))] = np.arange(len(rows))
+            self._planner_index[pos] = {
+                'rows': rows[by_value],
+                'values': pos_values[by_value],
+                'teams': self._team_codes[rows][by_value],
+                'rank': rank[by_value],
+                'valid': ~np.isnan(pos_scores[by_value]),
+            }
+
+    @timed
+    @memoized
     def recommend_for_team_needs(self, team_name, target_position, top_n=5):
         """
         Mencari pemain untuk posisi tertentu yang sesuai dengan budget klub.
         (Fitur Tab Squad Planner)
         """
-        team_players = self.df[self.df['team'] == team_name]
-        
-        if team_players.empty:
+        if team_name not in self.team_budget.index:
             return None
-            
-        avg_squad_value = team_players['market_value_est'].nlargest(15).mean()
-        
-        if pd.isna(avg_squad_value) or avg_squad_value == 0:
-            avg_squad_value = 1000000000 # 1 Milyar default
-            
-        candidates = self.df[
-            (self.df['position'] == target_position) & 
-            (self.df['team'] != team_name)
-        ].copy()
-        
-        if candidates.empty:
+
+        budget = self.team_budget.loc[team_name]
+        index = self._planner_index.get(target_position)
+        own_code = self._team_code_of[team_name]
+        if index is None or not (index['teams'] != own_code).any():
             return pd.DataFrame()
 
-        min_budget = avg_squad_value * 0.3
-        max_budget = avg_squad_value * 2.5 
-        
-        filtered_candidates = candidates[
-            (candidates['market_value_est'] >= min_budget) & 
-            (candidates['market_value_est'] <= max_budget)
-        ].copy()
-        
-        filtered_candidates['scout_score'] = (filtered_candidates['market_value_est'] / filtered_candidates['age'])
-        
-        return filtered_candidates.nlargest(top_n, 'scout_score')[['player_name', 'team', 'league', 'age', 'market_value_raw']]
+        # Binary search rentang budget di kandidat yang terurut market value
+        lo = np.searchsorted(index['values'], budget['min_budget'], side='left')
+        hi = np.searchsorted(index['values'], budget['max_budget'], side='right')
+        in_range = slice(lo, hi)
+        keep = (index['teams'][in_range] != own_code) & index['valid'][in_range]
+        rows = index['rows'][in_range][keep]
+        rank = index['rank'][in_range][keep]
+
+        k = min(top_n, len(rows))
+        if k > 0 and k < len(rows):
+            top = np.argpartition(rank, k - 1)[:k]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(rank[top])][:k]
+
+        return self.df.iloc[rows[top]][['player_name', 'team', 'league', 'age', 'market_value_raw']]
+
+    @timed
+    def squad_planner_report(self, top_n=5, teams=None, positions=None, max_block_cells=4_000_000):
+        """
+        Matriks rekomendasi untuk semua tim x semua posisi sekaligus (laporan transfer target).
+        Per posisi, validitas kandidat (rentang budget & bukan tim sendiri) dihitung untuk
+        satu blok tim sekaligus, lalu top-N dipilih lewat rank scout_score yang sudah dihitung.
+        Hasil identik dengan memanggil recommend_for_team_needs per pasangan tim/posisi.
+        """
+        teams = list(self.team_budget.index) if teams is None else [t for t in self._as_list(teams) if t in self.team_budget.index]
+        positions = list(self._planner_index) if positions is None else [p for p in self._as_list(positions) if p in self._planner_index]
+        budget = self.team_budget.loc[teams]
+        own_codes = np.array([self._team_code_of[t] for t in teams], dtype=np.int64)
+        min_b = budget['min_budget'].to_numpy()
+        max_b = budget['max_budget'].to_numpy()
+
+        frames = []
+        for pos in positions:
+            index = self._planner_index[pos]
+            n_cand = len(index['rows'])
+            block = max(1, max_block_cells // max(n_cand, 1))
+            for start in range(0, len(teams), block):
+                end = start + block
+                lo = np.searchsorted(index['values'], min_b[start:end], side='left')
+                hi = np.searchsorted(index['values'], max_b[start:end], side='right')
+                col = np.arange(n_cand)
+                valid = ((col >= lo[:, None]) & (col < hi[:, None])
+                         & (index['teams'] != own_codes[start:end, None]) & index['valid'])
+
+                # Rank kandidat yang tidak valid dibuat tak terhingga
+                rank = np.where(valid, index['rank'], np.iinfo(np.int64).max)
+                k = min(top_n, n_cand)
+                if k == 0:
+                    continue
+                top = np.argpartition(rank, k - 1, axis=1)[:, :k] if k < n_cand else np.tile(np.arange(n_cand), (len(rank), 1))
+                top_rank = np.take_along_axis(rank, top, axis=1)
+                order = np.argsort(top_rank, axis=1)
+                top = np.take_along_axis(top, order, axis=1)
+                found = np.take_along_axis(top_rank, order, axis=1) != np.iinfo(np.int64).max
+
+                team_idx, slot = np.nonzero(found)
+                result = self.df.iloc[index['rows'][top[team_idx, slot]]][['player_name', 'team', 'league', 'age', 'market_value_raw']].copy()
+                result.insert(0, 'target_team', np.asarray(teams[start:end], dtype=object)[team_idx])
+                result.insert(1, 'target_position', pos)
+                result.insert(2, 'rank', slot + 1)
+                result['scout_score'] = self._scout_scores[index['rows'][top[team_idx, slot]]]
+                frames.append(result)
+
+        columns = ['target_team', 'target_position', 'rank', 'player_name', 'team', 'league', 'age', 'market_value_raw', 'scout_score']
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        report = pd.concat(frames, ignore_index=True)
+        return report.sort_values(['target_team', 'target_position', 'rank'], kind='stable', ignore_index=True)[columns]
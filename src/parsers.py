@@ -0,0 +1,194 @@
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import UnicodeDammit
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+def _has_class(name):
+    """XPath: elemen yang atribut class-nya mengandung `name` (sama seperti class_= di bs4)"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class Bs4Parser:
+    """
+    Backend BeautifulSoup.
+    strainer=False -> parse seluruh halaman dengan html.parser (perilaku lama).
+    strainer=True  -> SoupStrainer: hanya tabel `items` & header `h1` yang dibangun jadi tree.
+    """
+
+    # Hanya h1 header & tabel `items` (class dicocokkan per kata, seperti class_= biasa)
+    _ONLY = SoupStrainer(['h1', 'table'], class_=re.compile(r'(^|\s)(items|data-header__headline-wrapper)(\s|$)'))
+
+    def __init__(self, strainer=False):
+        self.strainer = strainer
+        self.name = 'bs4-strainer' if strainer else 'bs4'
+        self._features = 'lxml' if (strainer and HAS_LXML) else 'html.parser'
+
+    def _soup(self, content):
+        if not self.strainer:
+            return BeautifulSoup(content, 'html.parser')
+        return BeautifulSoup(content, self._features, parse_only=self._ONLY)
+
+    def team_links(self, content):
+        """List href dari kolom nama klub di tabel `items` halaman liga"""
+        soup = self._soup(content)
+        hrefs = []
+        # Mencari tabel klasemen/klub (Selector ini spesifik Transfermarkt)
+        table = soup.find('table', class_='items')
+        if table:
+            # Cari semua link nama tim
+            for link in table.find_all('td', class_='hauptlink'):
+                a_tag = link.find('a', href=True)
+                if a_tag:
+                    hrefs.append(a_tag['href'])
+        return hrefs
+
+    def squad(self, content):
+        """
+        Return (team_name, rows). rows = list dict mentah per pemain
+        (player_name, position, age, market_value) atau None jika tabel tidak ada.
+        """
+        soup = self._soup(content)
+
+        # Ambil Nama Tim dari Header
+        try:
+            team_name = soup.find('h1', class_='data-header__headline-wrapper').text.strip()
+        except AttributeError:
+            team_name = "Unknown Team"
+
+        # Cari Tabel Pemain (Selector "items" biasanya tabel utama di TM)
+        table = soup.find('table', class_='items')
+        if not table:
+            return team_name, None
+
+        rows = []
+        # Loop setiap baris pemain (odd/even rows)
+        for row in table.find_all('tr', class_=['odd', 'even']):
+            try:
+                # 1. Nama & Posisi
+                td_name = row.find('table', class_='inline-table')
+                if not td_name: continue
+
+                name_tag = td_name.find('td', class_='hauptlink').find('a')
+                player_name = name_tag.text.strip()
+
+                # Posisi biasanya di baris terakhir cell tersebut
+                pos_tag = td_name.find_all('tr')[-1].find('td')
+                position = pos_tag.text.strip() if pos_tag else "Unknown"
+
+                # 2. Umur (Kolom ke-3 biasanya di TM, tapi bisa geser)
+                # Kita cari berdasarkan cell text content yang angka
+                age = "0"
+                for cell in row.find_all('td', class_='zentriert'):
+                    # Mencari cell yang berisi umur (2 digit)
+                    if cell.text.strip().isdigit() and 15 < int(cell.text.strip()) < 45:
+                        age = cell.text.strip()
+                        break
+
+                # 3. Market Value (Harga Pasar)
+                mv_cell = row.find('td', class_='rechts hauptlink')
+                market_value = mv_cell.text.strip() if mv_cell else "Rp0"
+
+                rows.append({'player_name': player_name, 'position': position,
+                             'age': age, 'market_value': market_value})
+            except Exception:
+                # Skip row jika error parsing
+                continue
+
+        return team_name, rows
+
+
+class LxmlParser:
+    """
+    Backend lxml + XPath. Tree dibangun di C tanpa objek Python per tag,
+    lalu hanya subtree tabel `items` & `h1` yang disentuh lewat XPath.
+    Hasil ekstraksi identik dengan Bs4Parser.
+    """
+
+    name = 'lxml'
+
+    def _root(self, content):
+        if isinstance(content, bytes):
+            # Deteksi encoding sama seperti BeautifulSoup agar teks identik
+            content = UnicodeDammit(content, is_html=True).unicode_markup
+        return lxml.html.document_fromstring(content)
+
+    @staticmethod
+    def _text(el):
+        return el.text_content().strip()
+
+    def team_links(self, content):
+        root = self._root(content)
+        tables = root.xpath(f"//table[{_has_class('items')}]")
+        if not tables:
+            return []
+        hrefs = []
+        for td in tables[0].xpath(f".//td[{_has_class('hauptlink')}]"):
+            a_tags = td.xpath(".//a[@href]")
+            if a_tags:
+                hrefs.append(a_tags[0].get('href'))
+        return hrefs
+
+    def squad(self, content):
+        root = self._root(content)
+
+        h1 = root.xpath(f"//h1[{_has_class('data-header__headline-wrapper')}]")
+        team_name = self._text(h1[0]) if h1 else "Unknown Team"
+
+        tables = root.xpath(f"//table[{_has_class('items')}]")
+        if not tables:
+            return team_name, None
+
+        rows = []
+        for row in tables[0].xpath(f".//tr[{_has_class('odd')} or {_has_class('even')}]"):
+            try:
+                inline = row.xpath(f".//table[{_has_class('inline-table')}]")
+                if not inline: continue
+                td_name = inline[0]
+
+                name_tag = td_name.xpath(f".//td[{_has_class('hauptlink')}]")[0].xpath(".//a")[0]
+                player_name = self._text(name_tag)
+
+                pos_tag = td_name.xpath(".//tr")[-1].xpath(".//td")
+                position = self._text(pos_tag[0]) if pos_tag else "Unknown"
+
+                age = "0"
+                for cell in row.xpath(f".//td[{_has_class('zentriert')}]"):
+                    text = self._text(cell)
+                    if text.isdigit() and 15 < int(text) < 45:
+                        age = text
+                        break
+
+                mv_cell = row.xpath(".//td[@class='rechts hauptlink']")
+                market_value = self._text(mv_cell[0]) if mv_cell else "Rp0"
+
+                rows.append({'player_name': player_name, 'position': position,
+                             'age': age, 'market_value': market_value})
+            except Exception:
+                continue
+
+        return team_name, rows
+
+
+PARSER_BACKENDS = {
+    'bs4': lambda: Bs4Parser(),
+    'bs4-strainer': lambda: Bs4Parser(strainer=True),
+    'lxml': lambda: LxmlParser(),
+}
+
+
+def get_parser(backend='auto'):
+    """Pilih backend parsing saat runtime. 'auto' -> lxml jika terinstall, kalau tidak bs4."""
+    if backend == 'auto':
+        backend = 'lxml' if HAS_LXML else 'bs4'
+    if backend == 'lxml' and not HAS_LXML:
+        raise ImportError("Backend 'lxml' butuh paket lxml (pip install lxml)")
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Backend parser tidak dikenal: {backend} (pilihan: {', '.join(PARSER_BACKENDS)})")
+    return PARSER_BACKENDS[backend]()
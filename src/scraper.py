@@ -1,30 +1,100 @@
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import random
 import os
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+from src.http_cache import HttpCache
+from src.aggregates import DEFAULT_AGGREGATES_ROOT, compute_aggregates, write_aggregates
+from src.checkpoint import ScrapeCheckpoint
+from src.identity import DEFAULT_IDENTITY_ROOT, PlayerRegistry, attach_ids, load_ids, print_results, store_frames
+from src.ingest import DEFAULT_CHANGESET_ROOT, ingest, print_summary
+from src.instrumentation import Instrumentation, profiled
+from src.market_value import parse_market_values
+from src.parsers import PARSER_BACKENDS, get_parser
+from src.rate_limiter import HostRateLimiter
+from src.storage import SnapshotStore
+
 class RealScout:
-    def __init__(self):
-        self.raw_path = 'data/raw'
-        self.processed_path = 'data/processed'
+    # Rata-rata 1 request / 4 detik per host, setara jeda acak 3-7 detik
+    DEFAULT_CONCURRENT_RATE = 0.25
+    DEFAULT_CACHE_DIR = 'data/cache/http'
+    DEFAULT_CHECKPOINT_DIR = 'data/cache/checkpoints'
+    # Status HTTP yang layak dicoba ulang (blokir sementara / rate limit / server error)
+    RETRY_STATUSES = {403, 429, 500, 502, 503, 504}
+
+    def __init__(self, concurrency=1, rate_per_host=None, burst=1,
+                 base_url="https://www.transfermarkt.co.id", targets=None,
+                 raw_path='data/raw', processed_path='data/processed',
+                 cache_dir=None, cache_ttl=HttpCache.DEFAULT_TTL, replay=False,
+                 parser='auto', store_path=SnapshotStore.DEFAULT_ROOT,
+                 changeset_path=DEFAULT_CHANGESET_ROOT, aggregates_path=DEFAULT_AGGREGATES_ROOT,
+                 identity_path=DEFAULT_IDENTITY_ROOT, run_log=None, metrics_path=None, checkpoint_dir=None, run_id=None, fresh=False,
+                 max_retries=3, backoff_base=5.0, backoff_max=120.0):
+        self.raw_path = raw_path
+        self.processed_path = processed_path
         os.makedirs(self.raw_path, exist_ok=True)
         os.makedirs(self.processed_path, exist_ok=True)
         
         # Base URL Transfermarkt (Versi Indonesia agar mudah diparsing)
-        self.base_url = "https://www.transfermarkt.co.id"
+        self.base_url = base_url
         
         # Target Liga (URL Startseite masing-masing liga)
         # ID: Liga 1, TH: Thai League, MY: Super League, VN: V.League 1
-        self.targets = {
+        self.targets = targets or {
             'Indonesia': 'https://www.transfermarkt.co.id/super-league/startseite/wettbewerb/IN1L',
             'Thailand': 'https://www.transfermarkt.co.id/thai-league/startseite/wettbewerb/THA1',
             'Malaysia': 'https://www.transfermarkt.co.id/super-league/startseite/wettbewerb/MYS1',
             'Vietnam': 'https://www.transfermarkt.co.id/v-league-1/startseite/wettbewerb/VIE1'
         }
 
+        # Mode concurrent: jumlah worker paralel & rate limit per host (request/detik).
+        # rate_per_host=None -> pakai jeda acak 3-7 detik seperti biasa (sequential),
+        # atau DEFAULT_CONCURRENT_RATE jika concurrency > 1.
+        self.concurrency = max(1, int(concurrency))
+        if rate_per_host is None and self.concurrency > 1:
+            rate_per_host = self.DEFAULT_CONCURRENT_RATE
+        self.limiter = HostRateLimiter(rate_per_host, burst) if rate_per_host else None
+
+        # Cache HTML di disk (opsional). replay=True -> semua halaman hanya dari cache.
+        self.replay = replay
+        if replay and cache_dir is None:
+            cache_dir = self.DEFAULT_CACHE_DIR
+        self.cache = HttpCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+
+        # Snapshot mingguan disimpan di store Parquet (menggantikan CSV per minggu)
+        self.store = SnapshotStore(store_path)
+        # Change set per run (pemain baru, keluar, transfer, perubahan value)
+        self.changeset_path = changeset_path
+        # Tabel agregat dashboard per snapshot (ringkasan tim/liga, pool Wonderkid/Senior)
+        self.aggregates_path = aggregates_path
+        # Registry player_id stabil lintas snapshot (entity resolution, incremental per minggu)
+        self.identity_path = identity_path
+
+        # Backend parsing HTML: 'auto' (lxml jika ada), 'lxml', 'bs4-strainer', atau 'bs4'
+        self.parser = get_parser(parser)
+
+        # Timing per request/parse/stage. run_log -> JSON-lines, metrics_path -> snapshot Prometheus
+        self.metrics = Instrumentation(log_path=run_log)
+        self.metrics_path = metrics_path
+
+        # Retry dengan exponential backoff + jitter untuk 403/429/5xx & timeout
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # Antrian kerja persisten per run (default: satu run per tanggal snapshot).
+        # Run yang terputus/gagal sebagian dilanjutkan: hanya liga/tim yang belum selesai di-fetch.
+        self.checkpoint = None
+        if checkpoint_dir:
+            self.checkpoint = ScrapeCheckpoint(checkpoint_dir, run_id or datetime.now().strftime('%Y%m%d'), fresh=fresh)
+        # Liga yang halaman liga/timnya gagal di-fetch di run terakhir: tim yang hilang dari
+        # hasil scraping di liga ini dipertahankan di master (bukan dianggap keluar)
+        self.failed_leagues = set()
+
     def _get_headers(self):
         """Memalsukan identitas browser agar tidak ditolak server"""
         user_agents = [
@@ -39,126 +109,154 @@ class RealScout:
             'Referer': 'https://www.google.com/'
         }
 
-    def get_soup(self, url):
-        """Helper function untuk request + parsing dengan error handling"""
-        try:
+    def _wait_turn(self, url):
+        """Jeda sebelum request: token bucket per host jika diset, kalau tidak jeda acak"""
+        with self.metrics.timer('rate_limit_wait', url=url):
+            if self.limiter is not None:
+                self.limiter.wait(url)
+                return
+
             # Random Delay (PENTING: Agar tidak di-banned)
             delay = random.uniform(3, 7)
             print(f"⏳ Waiting {delay:.1f}s before fetching {url.split('/')[-1]}...")
             time.sleep(delay)
+
+    def fetch_html(self, url):
+        """
+        Ambil isi halaman (bytes) dengan error handling.
+        Jika cache aktif: entry fresh dipakai langsung, entry stale direvalidasi
+        (304 -> pakai cache), dan mode replay tidak pernah menyentuh jaringan.
+        """
+        meta = None
+        if self.cache is not None:
+            if self.replay:
+                with self.metrics.timer('http_request', url=url, source='replay') as ev:
+                    content = self.cache.read(url)
+                    ev['status'] = 'hit' if content is not None else 'miss'
+                    ev['bytes'] = len(content or b'')
+                if content is None:
+                    print(f"📭 Tidak ada di cache (replay): {url}")
+                return content
+
+            meta = self.cache.load_meta(url)
+            if self.cache.is_fresh(meta):
+                with self.metrics.timer('http_request', url=url, source='cache') as ev:
+                    content = self.cache.read(url)
+                    ev['status'] = 'hit' if content is not None else 'miss'
+                    ev['bytes'] = len(content or b'')
+                if content is not None:
+                    return content
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._backoff(url, attempt)
+            content, retryable = self._request(url, meta)
+            if content is not None or not retryable:
+                return content
+        print(f"🛑 Menyerah setelah {self.max_retries + 1} percobaan: {url}")
+        return None
+
+    def _backoff(self, url, attempt):
+        """Exponential backoff dengan jitter: acak antara 50%-100% dari base x 2^(attempt-1), maks backoff_max"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        delay = random.uniform(delay / 2, delay)
+        print(f"🔁 Retry #{attempt} dalam {delay:.1f}s: {url.split('/')[-1]}")
+        with self.metrics.timer('retry_backoff', url=url, attempt=attempt):
+            time.sleep(delay)
+
+    def _request(self, url, meta):
+        """Satu percobaan request ke server. Return (content atau None, layak di-retry)."""
+        try:
+            self._wait_turn(url)
+
+            headers = self._get_headers()
+            if self.cache is not None:
+                headers.update(self.cache.conditional_headers(meta))
             
-            response = requests.get(url, headers=self._get_headers(), timeout=15)
+            with self.metrics.timer('http_request', url=url, source='network') as ev:
+                ev['status'] = 'error'
+                response = requests.get(url, headers=headers, timeout=15)
+                ev['status'] = response.status_code
+                ev['bytes'] = len(response.content)
             
-            if response.status_code == 200:
-                return BeautifulSoup(response.content, 'html.parser')
+            if response.status_code == 304 and self.cache is not None:
+                self.cache.touch(url, response.headers)
+                return self.cache.read(url), False
+            elif response.status_code == 200:
+                if self.cache is not None:
+                    self.cache.store(url, response.content, response.headers)
+                return response.content, False
             elif response.status_code == 403:
                 print(f"⛔ Akses Ditolak (403) ke {url}. IP mungkin di-blokir.")
-                return None
+                return None, True
             else:
                 print(f"⚠️ Error {response.status_code} ke {url}")
-                return None
+                return None, response.status_code in self.RETRY_STATUSES
         except Exception as e:
             print(f"❌ Connection Error: {e}")
-            return None
+            return None, True
 
     def scrape_teams_from_league(self, league_url):
         """Mengambil URL setiap tim dari halaman klasemen liga"""
-        soup = self.get_soup(league_url)
-        if not soup: return []
+        content = self.fetch_html(league_url)
+        if not content: return []
         
+        with self.metrics.timer('parse_html', url=league_url, method='team_links', bytes=len(content)) as ev:
+            hrefs = self.parser.team_links(content)
+            ev['rows'] = len(hrefs)
+
         team_urls = []
-        # Mencari tabel klasemen/klub (Selector ini spesifik Transfermarkt)
-        table = soup.find('table', class_='items')
-        if table:
-            # Cari semua link nama tim
-            links = table.find_all('td', class_='hauptlink')
-            for link in links:
-                a_tag = link.find('a', href=True)
-                if a_tag:
-                    full_url = self.base_url + a_tag['href']
-                    # Filter: hindari link yang bukan tim (kadang ada link sorting)
-                    if '/verein/' in full_url and full_url not in team_urls:
-                        team_urls.append(full_url)
+        for href in hrefs:
+            full_url = self.base_url + href
+            # Filter: hindari link yang bukan tim (kadang ada link sorting)
+            if '/verein/' in full_url and full_url not in team_urls:
+                team_urls.append(full_url)
         
         # Hapus duplikat dan bersihkan
         return list(set(team_urls))
 
     def scrape_players_from_team(self, team_url, country_name):
         """Mengambil data skuad pemain dari halaman tim"""
-        soup = self.get_soup(team_url)
-        if not soup: return []
-        
-        players_data = []
-        
-        # Ambil Nama Tim dari Header
-        try:
-            team_name = soup.find('h1', class_='data-header__headline-wrapper').text.strip()
-        except:
-            team_name = "Unknown Team"
+        with self.metrics.timer('scrape_team', url=team_url) as team_ev:
+            players_data = self._scrape_players_from_team(team_url, country_name)
+            team_ev['rows'] = len(players_data)
+        return players_data
 
-        print(f"   ⚽ Scouting Squad: {team_name}...")
+    def _scrape_players_from_team(self, team_url, country_name):
+        content = self.fetch_html(team_url)
+        if not content: return []
         
-        # Cari Tabel Pemain (Selector "items" biasanya tabel utama di TM)
-        table = soup.find('table', class_='items')
-        if not table: return []
+        with self.metrics.timer('parse_html', url=team_url, method='squad', bytes=len(content)) as ev:
+            team_name, rows = self.parser.squad(content)
+            ev['rows'] = len(rows or [])
+        print(f"   ⚽ Scouting Squad: {team_name}...")
+        if rows is None: return []
 
-        # Loop setiap baris pemain (odd/even rows)
-        rows = table.find_all('tr', class_=['odd', 'even'])
-        
-        for row in rows:
-            try:
-                # 1. Nama & Posisi
-                td_name = row.find('table', class_='inline-table')
-                if not td_name: continue
-                
-                name_tag = td_name.find('td', class_='hauptlink').find('a')
-                player_name = name_tag.text.strip()
-                
-                # Posisi biasanya di baris terakhir cell tersebut
-                pos_tag = td_name.find_all('tr')[-1].find('td')
-                position = pos_tag.text.strip() if pos_tag else "Unknown"
-
-                # 2. Umur (Kolom ke-3 biasanya di TM, tapi bisa geser)
-                # Kita cari berdasarkan cell text content yang angka
-                cells = row.find_all('td', class_='zentriert')
-                age = "0"
-                for cell in cells:
-                    # Mencari cell yang berisi umur (2 digit)
-                    if cell.text.strip().isdigit() and 15 < int(cell.text.strip()) < 45:
-                        age = cell.text.strip()
-                        break
-                
-                # 3. Kewarganegaraan
-                nat_cell = row.find('td', class_='zentriert', recursive=False)
-                # Logic extraksi bendera (skip untuk simplifikasi, anggap local jika tidak ada data)
-                
-                # 4. Market Value (Harga Pasar)
-                mv_cell = row.find('td', class_='rechts hauptlink')
-                market_value = mv_cell.text.strip() if mv_cell else "Rp0"
-                
-                # Bersihkan format Market Value (contoh: "Rp1,2Mlyr")
-                market_value_clean = market_value.replace('Rp', '').replace('Mlyr.', '000000').replace('Jt.', '000').replace(',', '').strip()
-                if not market_value_clean.isdigit(): market_value_clean = 0
-                
-                players_data.append({
-                    'player_name': player_name,
-                    'team': team_name,
-                    'league_country': country_name,
-                    'position': position,
-                    'age': int(age),
-                    'market_value_raw': market_value,
-                    'market_value_est': int(market_value_clean),
-                    'scraped_date': datetime.now().strftime('%Y-%m-%d')
-                })
-                
-            except Exception as e:
-                # Skip row jika error parsing
-                continue
+        # Parse market value sekaligus untuk satu skuad (contoh: "Rp1,2Mlyr." -> 1200000000)
+        market_values = parse_market_values([row['market_value'] for row in rows])
+        scraped_date = datetime.now().strftime('%Y-%m-%d')
+
+        players_data = []
+        for row, market_value_est in zip(rows, market_values):
+            players_data.append({
+                'player_name': row['player_name'],
+                'team': team_name,
+                'league_country': country_name,
+                'position': row['position'],
+                'age': int(row['age']),
+                'market_value_raw': row['market_value'],
+                'market_value_est': int(market_value_est),
+                'scraped_date': scraped_date
+            })
                 
         return players_data
 
-    def run(self):
-        print(f"🚀 Memulai Real Data Scraping Agent...")
+    def scrape_all(self):
+        """Scrape semua liga target, return list data pemain (urut sesuai liga & tim)"""
+        self.failed_leagues = set()
+        if self.concurrency > 1:
+            return self._scrape_all_concurrent()
+
         all_players = []
         
         for country, league_url in self.targets.items():
@@ -166,37 +264,212 @@ class RealScout:
             print(f"🔗 URL: {league_url}")
             
             # 1. Dapatkan Link semua tim
-            team_links = self.scrape_teams_from_league(league_url)
+            team_links = self._league_teams(league_url, country)
             print(f"📊 Menemukan {len(team_links)} tim di {country}.")
             
-            # 2. Loop setiap tim (Batasi 3 tim per negara untuk testing awal, HAPUS [:3] untuk full)
+            # 2. Loop setiap tim (yang sudah selesai di checkpoint tidak di-fetch lagi)
             for team_url in team_links: 
-                try:
-                    squad = self.scrape_players_from_team(team_url, country)
-                    all_players.extend(squad)
-                except Exception as e:
-                    print(f"Error scraping team {team_url}: {e}")
+                all_players.extend(self._team_squad(team_url, country))
+
+        return all_players
+
+    def _league_teams(self, league_url, country):
+        """Daftar URL tim satu liga; diambil dari checkpoint jika liga ini sudah selesai"""
+        if self.checkpoint is not None:
+            self.checkpoint.add(league_url, 'league', country)
+            if self.checkpoint.is_done(league_url):
+                return self.checkpoint.league_teams(league_url)
+
+        team_links = self.scrape_teams_from_league(league_url)
+        if not team_links:
+            self.failed_leagues.add(country)
+        if self.checkpoint is not None:
+            if team_links:
+                self.checkpoint.mark_done(league_url, teams=team_links)
+            else:
+                self.checkpoint.mark_failed(league_url, "tidak ada link tim (gagal fetch / struktur berubah)")
+        return team_links
+
+    def _team_squad(self, team_url, country):
+        """Skuad satu tim; dari checkpoint jika sudah pernah berhasil, kalau tidak scrape & simpan"""
+        if self.checkpoint is not None:
+            self.checkpoint.add(team_url, 'team', country)
+            if self.checkpoint.is_done(team_url):
+                return self.checkpoint.load_rows(team_url)
+
+        error = "skuad kosong (gagal fetch / struktur berubah)"
+        try:
+            squad = self.scrape_players_from_team(team_url, country)
+        except Exception as e:
+            print(f"Error scraping team {team_url}: {e}")
+            squad, error = [], e
+
+        if not squad:
+            self.failed_leagues.add(country)
+        if self.checkpoint is not None:
+            if squad:
+                self.checkpoint.save_rows(team_url, squad)
+            else:
+                self.checkpoint.mark_failed(team_url, error)
+        return squad
+
+    def _scrape_all_concurrent(self):
+        """
+        Versi paralel dari scrape_all: halaman liga & tim di-fetch oleh thread pool,
+        sementara TokenBucket per host menjaga kecepatan request tetap sopan.
+        """
+        print(f"⚡ Mode concurrent: {self.concurrency} worker")
+        squads = {country: [] for country in self.targets}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            # 1. Semua halaman liga sekaligus
+            league_futures = {
+                pool.submit(self._league_teams, league_url, country): country
+                for country, league_url in self.targets.items()
+            }
+
+            # 2. Begitu satu liga selesai, tim-timnya langsung masuk antrian
+            for future in as_completed(league_futures):
+                country = league_futures[future]
+                team_links = future.result()
+                print(f"📊 Menemukan {len(team_links)} tim di {country}.")
+                squads[country] = [pool.submit(self._team_squad, url, country) for url in team_links]
+
+            all_players = []
+            for country in self.targets:
+                for future in squads[country]:
+                    all_players.extend(future.result())
+
+        return all_players
+
+    def run(self, profile_path=None):
+        """
+        Scrape, upsert ke master, lalu simpan snapshot. profile_path -> jalankan
+        di bawah cProfile dan simpan hasilnya (.prof) untuk run ini saja.
+        """
+        with profiled(profile_path):
+            with self.metrics.timer('run') as run_ev:
+                run_ev['rows'] = self._run()
+        self.print_timing()
+        if self.metrics_path:
+            self.metrics.write_prometheus(self.metrics_path)
+            print(f"📈 Metrics Prometheus disimpan ke {self.metrics_path}")
+        self.metrics.close()
+
+    def _run(self):
+        print(f"🚀 Memulai Real Data Scraping Agent...")
+        with self.metrics.timer('run_stage', stage='scrape'):
+            all_players = self.scrape_all()
+        self.print_checkpoint()
         
         # 3. Simpan Data
         if all_players:
-            df = pd.DataFrame(all_players)
-            
-            # Basic Cleaning
-            df = df.drop_duplicates(subset=['player_name', 'team'])
+            with self.metrics.timer('run_stage', stage='dataframe'):
+                df = pd.DataFrame(all_players)
+                
+                # Basic Cleaning
+                df = df.drop_duplicates(subset=['player_name', 'team'])
+
+            # Incremental merge: upsert ke master DB, tim yang gagal di-fetch tidak dihapus
+            master_file = f"{self.processed_path}/master_player_db.csv"
+            snapshot = datetime.now().strftime('%Y%m%d')
+            if os.path.exists(master_file):
+                with self.metrics.timer('run_stage', stage='ingest'):
+                    previous, scraped = pd.read_csv(master_file), df
+                    registry = PlayerRegistry(self.identity_path)
+                    if registry.snapshots:
+                        # Key player_id: master = snapshot terakhir yang sudah di-resolve,
+                        # hasil scraping di-resolve tanpa mengubah registry (ditulis di stage identity)
+                        previous['player_id'] = attach_ids(previous, load_ids(self.identity_path, registry.snapshots[-1:]))
+                        scraped = df.assign(player_id=registry.preview(df, snapshot))
+                    master, change_set = ingest(previous, scraped, failed_leagues=self.failed_leagues)
+                    master = master.drop(columns='player_id', errors='ignore')
+                    change_set.save(self.changeset_path, snapshot)
+                print_summary(change_set)
+            else:
+                master = df
             
-            # Simpan Raw
-            filename = f"{self.raw_path}/real_scout_{datetime.now().strftime('%Y%m%d')}.csv"
-            df.to_csv(filename, index=False)
+            # Simpan snapshot master (hasil upsert) ke store Parquet terpartisi (snapshot/liga)
+            with self.metrics.timer('run_stage', stage='store_write'):
+                self.store.write_snapshot(master, snapshot=snapshot)
+            filename = f"{self.store.root}/snapshot={snapshot}"
+
+            # Agregat dashboard dihitung sekali di sini, bukan di setiap interaksi
+            with self.metrics.timer('run_stage', stage='aggregates'):
+                write_aggregates(compute_aggregates(master), self.aggregates_path, snapshot,
+                                 source_hash=self.store.snapshot_hash(snapshot))
+
+            # player_id stabil: hanya snapshot yang belum di-resolve yang diproses
+            with self.metrics.timer('run_stage', stage='identity'):
+                registry = PlayerRegistry(self.identity_path)
+                identity_results = registry.update(store_frames(self.store.root))
+            print_results(identity_results[-1:], registry)
             
             # Simpan Processed untuk Dashboard
-            df.to_csv(f"{self.processed_path}/master_player_db.csv", index=False)
+            with self.metrics.timer('run_stage', stage='csv_write'):
+                master.to_csv(master_file, index=False)
             
             print(f"\n✅ SCRAPING SELESAI!")
-            print(f"Total Pemain: {len(df)}")
+            print(f"Total Pemain di-scrape: {len(df)} | Total di master: {len(master)}")
             print(f"File tersimpan di: {filename}")
+            return len(df)
         else:
             print("\n❌ Gagal mendapatkan data (Mungkin terblokir atau struktur web berubah).")
+            return 0
+
+    def print_checkpoint(self):
+        """Ringkasan antrian kerja: berapa liga/tim selesai & gagal di run ini"""
+        if self.checkpoint is None:
+            return
+        summary = self.checkpoint.summary()
+        for kind, label in (('league', 'Liga'), ('team', 'Tim')):
+            counts = summary.get(kind, {})
+            print(f"📋 {label}: {counts.get('done', 0)} selesai, {counts.get('failed', 0)} gagal")
+        failed = self.checkpoint.failed()
+        if failed:
+            for url, item in failed.items():
+                print(f"   ⚠️ {url} ({item['attempts']}x): {item['error']}")
+            print(f"🔁 Jalankan ulang untuk mengambil yang gagal saja (checkpoint: {self.checkpoint.path})")
+
+    def print_timing(self):
+        """Ringkasan waktu run: jeda rate limit, network, parsing HTML, dan pandas/IO"""
+        summary = self.metrics.summary()
+        total = lambda event: summary.get(event, {}).get('total_s', 0.0)
+        pandas_s = sum(sec for stage, sec in self.metrics.breakdown('run_stage', 'stage').items() if stage != 'scrape')
+        http = summary.get('http_request', {})
+        parse = summary.get('parse_html', {})
+
+        print(f"\n⏱️ Waktu run: {total('run'):.1f}s" + (f" ({self.concurrency} worker, waktu di bawah dijumlah per thread)" if self.concurrency > 1 else ""))
+        print(f"   😴 Jeda rate limit : {total('rate_limit_wait'):.1f}s")
+        print(f"   🌐 Network/cache   : {total('http_request'):.1f}s ({http.get('count', 0)} request, {http.get('bytes', 0) / 2**20:.1f} MB)")
+        print(f"   🧩 Parsing HTML    : {total('parse_html'):.1f}s ({parse.get('count', 0)} halaman)")
+        print(f"   🐼 Pandas/IO       : {pandas_s:.1f}s")
 
 if __name__ == "__main__":
-    scout = RealScout()
-    scout.run()
+    parser = argparse.ArgumentParser(description="Garuda Scout - Transfermarkt scraper")
+    parser.add_argument('--concurrency', type=int, default=1, help="Jumlah worker paralel (1 = sequential)")
+    parser.add_argument('--rate', type=float, default=None, help="Maks request/detik per host (default: jeda acak 3-7 detik)")
+    parser.add_argument('--burst', type=int, default=1, help="Ukuran burst token bucket")
+    parser.add_argument('--cache-dir', default=RealScout.DEFAULT_CACHE_DIR, help="Folder cache HTML di disk")
+    parser.add_argument('--no-cache', action='store_true', help="Matikan cache HTML")
+    parser.add_argument('--cache-ttl', type=float, default=HttpCache.DEFAULT_TTL, help="Umur (detik) cache yang dianggap masih fresh")
+    parser.add_argument('--replay', action='store_true', help="Scrape ulang sepenuhnya dari cache, tanpa request ke server")
+    parser.add_argument('--parser', default='auto', choices=['auto'] + list(PARSER_BACKENDS), help="Backend parsing HTML")
+    parser.add_argument('--checkpoint-dir', default=RealScout.DEFAULT_CHECKPOINT_DIR, help="Folder antrian kerja & hasil parsial per run")
+    parser.add_argument('--no-checkpoint', action='store_true', help="Matikan checkpoint (selalu crawl dari awal)")
+    parser.add_argument('--run-id', default=None, help="ID run yang dilanjutkan (default: tanggal hari ini, YYYYMMDD)")
+    parser.add_argument('--fresh', action='store_true', help="Buang checkpoint run ini dan mulai dari awal")
+    parser.add_argument('--max-retries', type=int, default=3, help="Maks retry per URL untuk 403/429/5xx/timeout")
+    parser.add_argument('--backoff', type=float, default=5.0, help="Backoff awal (detik), dikali 2 setiap retry")
+    parser.add_argument('--run-log', default=None, help="Tulis event timing per request/parse sebagai JSON-lines ke file ini")
+    parser.add_argument('--metrics', default=None, help="Tulis snapshot metrics format Prometheus ke file ini")
+    parser.add_argument('--profile', default=None, help="Jalankan di bawah cProfile dan simpan hasilnya (.prof) ke file ini")
+    args = parser.parse_args()
+
+    scout = RealScout(concurrency=args.concurrency, rate_per_host=args.rate, burst=args.burst,
+                      cache_dir=None if args.no_cache else args.cache_dir,
+                      cache_ttl=args.cache_ttl, replay=args.replay, parser=args.parser,
+                      run_log=args.run_log, metrics_path=args.metrics,
+                      checkpoint_dir=None if args.no_checkpoint else args.checkpoint_dir,
+                      run_id=args.run_id, fresh=args.fresh, max_retries=args.max_retries, backoff_base=args.backoff)
+    scout.run(profile_path=args.profile)
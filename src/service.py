@@ -0,0 +1,345 @@
+"""
+Garuda Scout - layanan query HTTP/JSON lokal di depan satu ScoutBrain yang sudah "hangat".
+
+    python -m src.service [--port 8765] [--workers 8] [--store | --csv path] [--watch 60]
+
+Endpoint (GET, parameter lewat query string; nilai list dipisah koma):
+    /health                       jumlah baris, sidik jari data, statistik cache
+    /leagues  /teams?leagues=     /positions?leagues=&teams=
+    /filter?leagues=&teams=&positions=&offset=0&limit=100
+    /market-stats?leagues=&teams=&positions=
+    /similar?player=&top_n=10[&leagues=&min_age=&max_age=&min_value=&max_value=]
+                                  (atau ?player_id= untuk pemain senama)
+    /team-needs?team=&position=&top_n=5
+    /metrics                      snapshot teks Prometheus (durasi request & query)
+POST /reload[?force=1]            load ulang data jika berubah (atau paksa)
+
+Request dilayani bersamaan oleh thread pool berukuran tetap. Response JSON
+disimpan di cache LRU; cache dikosongkan setiap kali data di-load ulang.
+Error: 400 parameter tidak valid (misal top_n < 1), 404 endpoint/pemain/tim tidak ada,
+500 kesalahan lain -> selalu dengan body JSON {"error": ...}.
+"""
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from src.instrumentation import Instrumentation
+from src.ml_engine import ScoutBrain
+from src.storage import SnapshotStore
+
+
+class BadRequest(Exception):
+    pass
+
+
+class ResponseCache:
+    """LRU response JSON (bytes), thread-safe. Key menyertakan generasi data."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {'entries': len(self._items), 'max_entries': self.max_entries, 'hits': self.hits,
+                    'misses': self.misses, 'hit_rate': round(self.hits / total, 4) if total else None}
+
+
+class ScoutService:
+    """
+    Logika layanan tanpa HTTP: routing, validasi parameter, cache & reload.
+    brain_factory() membuat ScoutBrain baru; saat reload brain baru dibangun
+    dulu lalu ditukar, jadi request yang sedang jalan tetap memakai brain lama.
+    """
+
+    # Batas baris untuk /filter agar response tetap kecil
+    MAX_LIMIT = 1000
+
+    def __init__(self, brain_factory, cache_size=1024, metrics=None):
+        self.brain_factory = brain_factory
+        self.metrics = metrics or Instrumentation()
+        self.cache = ResponseCache(cache_size)
+        self._reload_lock = threading.Lock()
+        self.generation = 0
+        self.loaded_at = None
+        self.brain = None
+        self._swap(brain_factory())
+
+        self.routes = {
+            '/health': self.health,
+            '/leagues': lambda p: self.brain.leagues(),
+            '/teams': lambda p: self.brain.teams_in(self._list(p, 'leagues')),
+            '/positions': lambda p: self.brain.positions_in(self._list(p, 'leagues'), self._list(p, 'teams')),
+            '/filter': self.filter,
+            '/market-stats': self.market_stats,
+            '/similar': self.similar,
+            '/team-needs': self.team_needs,
+        }
+        # Response yang tidak boleh di-cache (berubah tanpa reload data)
+        self.uncached = {'/health'}
+
+    def _swap(self, brain):
+        brain.metrics = self.metrics
+        with self._reload_lock:
+            self.brain = brain
+            self.generation += 1
+            self.loaded_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+            self.cache.clear()
+
+    def reload(self, force=False):
+        """Load ulang data jika file berubah (atau force). Return True jika brain diganti."""
+        if not force and not self.brain.is_stale():
+            return False
+        with self.metrics.timer('service_reload'):
+            self._swap(self.brain_factory())
+        return True
+
+    # --- Parameter ---
+    @staticmethod
+    def _get(params, name, default=None, cast=str, required=False, minimum=None):
+        values = params.get(name)
+        if not values or values[-1] == '':
+            if required:
+                raise BadRequest(f"parameter '{name}' wajib diisi")
+            return default
+        try:
+            value = cast(values[-1])
+        except ValueError:
+            raise BadRequest(f"parameter '{name}' tidak valid: {values[-1]!r}")
+        if minimum is not None and value < minimum:
+            raise BadRequest(f"parameter '{name}' minimal {minimum}: {values[-1]!r}")
+        return value
+
+    @staticmethod
+    def _list(params, name):
+        """Nilai list: ?leagues=A,B atau ?leagues=A&leagues=B. Kosong -> None (semua)."""
+        values = [v for raw in params.get(name, []) for v in raw.split(',') if v]
+        return values or None
+
+    @staticmethod
+    def _records(df):
+        if df is None:
+            return None
+        return json.loads(df.to_json(orient='records', force_ascii=False))
+
+    # --- Handler ---
+    def health(self, params):
+        return {'rows': len(self.brain.df), 'fingerprint': self.brain.fingerprint, 'generation': self.generation,
+                'loaded_at': self.loaded_at, 'compact': self.brain.compact, 'cache': self.cache.stats()}
+
+    def filter(self, params):
+        offset = max(self._get(params, 'offset', 0, int), 0)
+        limit = min(max(self._get(params, 'limit', 100, int), 0), self.MAX_LIMIT)
+        df = self.brain.filter(self._list(params, 'leagues'), self._list(params, 'teams'), self._list(params, 'positions'))
+        return {'total': len(df), 'offset': offset, 'limit': limit, 'rows': self._records(df.iloc[offset:offset + limit])}
+
+    def market_stats(self, params):
+        stats = self.brain.market_stats(self._list(params, 'leagues'), self._list(params, 'teams'), self._list(params, 'positions'))
+        # NaN (filter kosong) bukan JSON valid -> null
+        as_float = lambda v: None if v != v else float(v)
+        return {'players': stats['players'], 'avg_value': as_float(stats['avg_value']), 'max_value': as_float(stats['max_value'])}
+
+    def similar(self, params):
+        player = self._get(params, 'player_id', None, int)
+        if player is None:
+            player = self._get(params, 'player', required=True)
+        top_n = self._get(params, 'top_n', 10, int, minimum=1)
+        constraints = {
+            'leagues': self._list(params, 'leagues'),
+            'min_age': self._get(params, 'min_age', None, int),
+            'max_age': self._get(params, 'max_age', None, int),
+            'min_value': self._get(params, 'min_value', None, float),
+            'max_value': self._get(params, 'max_value', None, float),
+        }
+        # Sama seperti dashboard: filter -> kNN terkendala, tanpa filter -> cosine similarity
+        if any(v is not None for v in constraints.values()):
+            result = self.brain.find_similar(player, top_n=top_n, **constraints)
+        else:
+            result = self.brain.get_similar_players(player, top_n=top_n)
+        if result is None:
+            raise LookupError(f"pemain tidak ditemukan: {player}")
+        return {'player': player, 'results': self._records(result)}
+
+    def team_needs(self, params):
+        team = self._get(params, 'team', required=True)
+        position = self._get(params, 'position', required=True)
+        result = self.brain.recommend_for_team_needs(team, position, top_n=self._get(params, 'top_n', 5, int, minimum=1))
+        if result is None:
+            raise LookupError(f"tim tidak ditemukan: {team}")
+        return {'team': team, 'position': position, 'results': self._records(result)}
+
+    def handle(self, path, params):
+        """Return (status HTTP, body JSON bytes, sumber: 'cache' / 'brain' / 'error')"""
+        route = self.routes.get(path)
+        if route is None:
+            return 404, self._encode({'error': f"endpoint tidak dikenal: {path}"}), 'error'
+
+        generation = self.generation
+        key = (generation, path, tuple(sorted((k, tuple(v)) for k, v in params.items())))
+        if path not in self.uncached:
+            body = self.cache.get(key)
+            if body is not None:
+                return 200, body, 'cache'
+
+        try:
+            body = self._encode(route(params))
+        except BadRequest as e:
+            return 400, self._encode({'error': str(e)}), 'error'
+        except LookupError as e:
+            return 404, self._encode({'error': str(e)}), 'error'
+        except Exception as e:
+            # Tetap balas JSON (jangan sampai koneksi diputus tanpa response)
+            return 500, self._encode({'error': f"kesalahan internal: {type(e).__name__}: {e}"}), 'error'
+
+        # Jangan simpan hasil dari brain lama jika reload terjadi di tengah request
+        if path not in self.uncached and generation == self.generation:
+            self.cache.put(key, body)
+        return 200, body, 'brain'
+
+    @staticmethod
+    def _encode(payload):
+        return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer yang melayani setiap koneksi di thread pool berukuran tetap"""
+
+    # Backlog default (5) membuat koneksi ditolak saat banyak klien -> retry SYN 1 detik
+    request_queue_size = 128
+
+    def __init__(self, address, handler, workers=8):
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scout-worker')
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def make_handler(service, quiet=True):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Koneksi keep-alive yang diam dilepas agar tidak menahan worker
+        timeout = 30
+
+        def _send(self, status, body, content_type='application/json; charset=utf-8'):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            start = time.perf_counter()
+            url = urlsplit(self.path)
+            if url.path == '/metrics':
+                self._send(200, service.metrics.prometheus_text().encode('utf-8'), 'text/plain; version=0.0.4')
+                return
+            status, body, source = service.handle(url.path, parse_qs(url.query))
+            self._send(status, body)
+            service.metrics.record('api_request', time.perf_counter() - start, method=url.path,
+                                   status=status, source=source, bytes=len(body))
+
+        def do_POST(self):
+            url = urlsplit(self.path)
+            if url.path != '/reload':
+                self._send(404, service._encode({'error': f"endpoint tidak dikenal: {url.path}"}))
+                return
+            force = parse_qs(url.query).get('force', ['0'])[-1] not in ('0', 'false', '')
+            try:
+                reloaded = service.reload(force=force)
+            except Exception as e:
+                # Brain lama tetap dipakai jika load data baru gagal
+                self._send(500, service._encode({'error': f"reload gagal: {type(e).__name__}: {e}"}))
+                return
+            self._send(200, service._encode({'reloaded': reloaded, **service.health({})}))
+
+        def log_message(self, format, *args):
+            if not quiet:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def serve(service, host='127.0.0.1', port=8765, workers=8, watch=None, quiet=True):
+    """Jalankan server sampai dihentikan. watch: interval (detik) cek perubahan data untuk reload otomatis."""
+    server = PooledHTTPServer((host, port), make_handler(service, quiet), workers=workers)
+    stop = threading.Event()
+
+    def watcher():
+        while not stop.wait(watch):
+            if service.reload():
+                print(f"🔄 Data berubah, brain di-load ulang ({len(service.brain.df)} baris)")
+
+    if watch:
+        threading.Thread(target=watcher, name='scout-watcher', daemon=True).start()
+    print(f"🚀 Garuda Scout service di http://{host}:{server.server_address[1]} ({workers} worker)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Garuda Scout - layanan query HTTP/JSON lokal")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=8, help="Ukuran thread pool")
+    parser.add_argument('--cache-size', type=int, default=1024, help="Jumlah response di cache LRU")
+    parser.add_argument('--csv', default=None, help="Pakai CSV master, bukan snapshot store")
+    parser.add_argument('--store', default=SnapshotStore.DEFAULT_ROOT, help="Folder snapshot store")
+    parser.add_argument('--no-compact', action='store_true', help="Load dengan dtype default (bukan mode compact)")
+    parser.add_argument('--watch', type=float, default=None, help="Cek perubahan data tiap N detik & reload otomatis")
+    parser.add_argument('--verbose', action='store_true', help="Cetak log setiap request")
+    args = parser.parse_args()
+
+    compact = not args.no_compact
+    if args.csv:
+        factory = lambda: ScoutBrain(data_path=args.csv, compact=compact)
+    else:
+        factory = lambda: ScoutBrain(store_path=args.store, snapshots='latest', compact=compact)
+    serve(ScoutService(factory, cache_size=args.cache_size), args.host, args.port, args.workers,
+          watch=args.watch, quiet=not args.verbose)
@@ -0,0 +1,243 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Urutan kolom standar satu snapshot pemain
+COLUMNS = ['player_name', 'team', 'league', 'position', 'age',
+           'market_value_raw', 'market_value_est', 'scraped_date', 'snapshot']
+# Kolom string berulang -> disimpan dictionary-encoded di Parquet
+DICTIONARY_COLUMNS = ['team', 'position']
+PARTITION_COLUMNS = ['snapshot', 'league']
+# Per snapshot: hash isi + sidik jari stat file Parquet (prefix '_' diabaikan pyarrow saat load)
+MANIFEST_FILE = '_manifest.json'
+
+
+def fingerprint(path):
+    """
+    Sidik jari murah untuk file atau folder data (mtime + ukuran semua file).
+    Berubah setiap kali ada file yang ditulis ulang, ditambah, atau dihapus.
+    """
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    entries = []
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            stat = os.stat(os.path.join(dirpath, name))
+            entries.append((os.path.relpath(os.path.join(dirpath, name), path), stat.st_mtime_ns, stat.st_size))
+    return hashlib.sha1(repr(sorted(entries)).encode('utf-8')).hexdigest()
+
+
+class SnapshotStore:
+    """
+    Penyimpanan snapshot mingguan sebagai dataset Parquet terpartisi (hive):
+
+        data/store/snapshots/snapshot=20260504/league=Indonesia/part-0.parquet
+
+    Partisi snapshot & liga + statistik row group Parquet membuat filter
+    (predicate pushdown) dan pemilihan kolom (column pushdown) hanya membaca
+    file/kolom yang dibutuhkan, berapapun panjang riwayat mingguannya.
+    """
+
+    DEFAULT_ROOT = 'data/store/snapshots'
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+
+    def exists(self):
+        return bool(self.snapshots())
+
+    def snapshots(self):
+        """Daftar ID snapshot (YYYYMMDD) yang tersedia, terurut. Hanya membaca nama folder."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name.split('=', 1)[1] for name in os.listdir(self.root)
+            if name.startswith('snapshot=')
+        )
+
+    def latest_snapshot(self):
+        snapshots = self.snapshots()
+        return snapshots[-1] if snapshots else None
+
+    @staticmethod
+    def _normalize(df, snapshot):
+        df = df.rename(columns={'league_country': 'league'}).copy()
+        df['snapshot'] = snapshot
+        for col in DICTIONARY_COLUMNS:
+            df[col] = df[col].astype('category')
+        return df[[c for c in COLUMNS if c in df.columns]]
+
+    def write_snapshot(self, df, snapshot=None):
+        """
+        Tulis satu snapshot (DataFrame hasil scraping). Snapshot yang sama ditimpa
+        utuh (termasuk partisi liga yang tidak ada lagi), jadi re-run di hari yang sama aman.
+        Ditulis ke folder sementara dulu lalu ditukar, jadi pembaca tidak melihat snapshot setengah jadi.
+        """
+        if snapshot is None:
+            snapshot = pd.to_datetime(df['scraped_date'].iloc[0]).strftime('%Y%m%d')
+        table = pa.Table.from_pandas(self._normalize(df, snapshot), preserve_index=False)
+        folder = os.path.join(self.root, f"snapshot={snapshot}")
+        staging = os.path.join(self.root, f".staging-{snapshot}")  # prefix '.' diabaikan pyarrow & snapshots()
+        shutil.rmtree(staging, ignore_errors=True)
+        pq.write_to_dataset(
+            table, staging,
+            partition_cols=PARTITION_COLUMNS,
+            basename_template='part-{i}.parquet',
+        )
+        old = os.path.join(self.root, f".old-{snapshot}")
+        shutil.rmtree(old, ignore_errors=True)
+        if os.path.exists(folder):
+            os.replace(folder, old)
+        os.replace(os.path.join(staging, f"snapshot={snapshot}"), folder)
+        shutil.rmtree(old, ignore_errors=True)
+        shutil.rmtree(staging, ignore_errors=True)
+        self._write_manifest(snapshot)
+        return snapshot
+
+    def _parquet_files(self, snapshot):
+        folder = os.path.join(self.root, f"snapshot={snapshot}")
+        return folder, sorted(glob.glob(os.path.join(folder, '**', '*.parquet'), recursive=True))
+
+    def _files_stat(self, snapshot):
+        """Sidik jari murah (path relatif, mtime, ukuran) semua file Parquet satu snapshot"""
+        folder, paths = self._parquet_files(snapshot)
+        return [[os.path.relpath(path, folder), os.stat(path).st_mtime_ns, os.stat(path).st_size] for path in paths]
+
+    def _hash_files(self, snapshot):
+        digest = hashlib.sha1()
+        folder, paths = self._parquet_files(snapshot)
+        for path in paths:
+            digest.update(os.path.relpath(path, folder).encode('utf-8'))
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def _write_manifest(self, snapshot):
+        path = os.path.join(self.root, f"snapshot={snapshot}", MANIFEST_FILE)
+        manifest = {'source_hash': self._hash_files(snapshot), 'files': self._files_stat(snapshot)}
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(f"{path}.tmp", path)
+
+    def snapshot_hash(self, snapshot):
+        """
+        Hash isi file satu snapshot (semua partisi liga). Berbeda jika snapshot ditulis
+        ulang dengan isi lain (re-run di hari yang sama, reprocess market value).
+        Diambil dari manifest yang ditulis write_snapshot; file hanya dibaca & di-hash
+        ulang jika manifest tidak ada atau stat file Parquet-nya sudah berbeda.
+        """
+        path = os.path.join(self.root, f"snapshot={snapshot}", MANIFEST_FILE)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest['files'] == self._files_stat(snapshot):
+                return manifest['source_hash']
+        return self._hash_files(snapshot)
+
+    def _dataset(self, as_category):
+        if as_category:
+            partitioning = ds.HivePartitioning.discover(infer_dictionary=True)
+        else:
+            partitioning = ds.partitioning(
+                pa.schema([('snapshot', pa.string()), ('league', pa.string())]), flavor='hive')
+        return ds.dataset(self.root, format='parquet', partitioning=partitioning)
+
+    def columns(self):
+        """Kolom yang tersedia di store (urutan COLUMNS). Hanya membaca schema."""
+        names = self._dataset(as_category=False).schema.names
+        return [c for c in COLUMNS if c in names]
+
+    def load(self, snapshots='latest', leagues=None, columns=None, filter=None, as_category=False):
+        """
+        Load snapshot ke DataFrame.
+        snapshots : 'latest', None (semua), atau list ID snapshot
+        leagues   : list liga (None = semua)
+        columns   : list kolom yang dibaca (None = semua)
+        filter    : pyarrow.dataset Expression tambahan, misal ds.field('age') < 25
+        as_category=False -> kolom dictionary dikembalikan sebagai string biasa
+        """
+        if snapshots == 'latest':
+            latest = self.latest_snapshot()
+            snapshots = [latest] if latest else []
+
+        expr = filter
+        if snapshots is not None:
+            expr = self._and(expr, ds.field('snapshot').isin(list(snapshots)))
+        if leagues is not None:
+            expr = self._and(expr, ds.field('league').isin(list(leagues)))
+
+        dataset = self._dataset(as_category)
+        if columns is None:
+            columns = [c for c in COLUMNS if c in dataset.schema.names]
+        table = dataset.to_table(columns=list(columns), filter=expr)
+
+        df = table.to_pandas()
+        if not as_category:
+            for col in df.columns:
+                if isinstance(df[col].dtype, pd.CategoricalDtype):
+                    df[col] = df[col].astype(df[col].cat.categories.dtype)
+        return df
+
+    @staticmethod
+    def _and(expr, other):
+        return other if expr is None else (expr & other)
+
+    def migrate_csvs(self, raw_dir='data/raw', identity_path='data/store/identity'):
+        """
+        Konversi semua real_scout_YYYYMMDD.csv lama menjadi partisi snapshot, lalu
+        resolve ulang player_id (src.identity) untuk snapshot yang ditulis ulang.
+        identity_path=None -> registry tidak disentuh.
+        """
+        migrated = []
+        for path in sorted(glob.glob(os.path.join(raw_dir, 'real_scout_*.csv'))):
+            match = re.search(r'real_scout_(\d{8})\.csv$', path)
+            if not match:
+                continue
+            df = pd.read_csv(path)
+            snapshot = self.write_snapshot(df, snapshot=match.group(1))
+            migrated.append((snapshot, len(df)))
+            print(f"📦 {os.path.basename(path)} -> snapshot={snapshot} ({len(df)} baris)")
+
+        if migrated and identity_path:
+            # Import lokal: src.identity sendiri bergantung pada SnapshotStore
+            from src.identity import PlayerRegistry, print_results, store_frames
+
+            registry = PlayerRegistry(identity_path)
+            print_results(registry.update(store_frames(self.root)), registry)
+        return migrated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Garuda Scout - snapshot store (Parquet)")
+    parser.add_argument('--root', default=SnapshotStore.DEFAULT_ROOT, help="Folder dataset Parquet")
+    sub = parser.add_subparsers(dest='command', required=True)
+    migrate = sub.add_parser('migrate', help="Migrasi CSV mingguan di data/raw ke store")
+    migrate.add_argument('--raw', default='data/raw', help="Folder CSV real_scout_*.csv")
+    migrate.add_argument('--aggregates', default='data/store/aggregates', help="Folder agregat dashboard (dibangun ulang)")
+    migrate.add_argument('--identity', default='data/store/identity', help="Folder registry player_id (di-resolve ulang)")
+    sub.add_parser('info', help="Tampilkan daftar snapshot")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.root)
+    if args.command == 'migrate':
+        from src.aggregates import build_aggregates
+
+        migrated = store.migrate_csvs(args.raw, args.identity)
+        # Snapshot yang ditulis ulang -> agregat lamanya tidak berlaku lagi
+        build_aggregates(args.root, args.aggregates, [snapshot for snapshot, _ in migrated])
+        print(f"\n✅ {len(migrated)} snapshot dimigrasi ke {args.root} (agregat dibangun ulang di {args.aggregates})")
+    else:
+        for snapshot in store.snapshots():
+            n_rows = store._dataset(False).count_rows(filter=ds.field('snapshot') == snapshot)
+            print(f"snapshot={snapshot}: {n_rows} baris")
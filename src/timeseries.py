@@ -0,0 +1,178 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.identity import DEFAULT_IDENTITY_ROOT, attach_ids, available_snapshots, load_ids
+from src.storage import SnapshotStore, fingerprint
+
+
+class ValueTimeSeries:
+    """
+    Matriks pemain x minggu dari `market_value_est` untuk semua snapshot di store.
+    - Baris = player_id dari PlayerRegistry (stabil lintas transfer, pemain senama
+      di tim berbeda punya riwayat sendiri). Registry hanya dibaca, tidak pernah ditulis
+      dari sini (entity resolution jalan di scraper / migrate). Jika ada snapshot yang belum
+      di-resolve, baris = player_name (fallback, pemain senama tergabung) sampai lengkap.
+    - Dibangun sekali dengan satu pivot (vectorized), lalu di-update incremental
+      lewat refresh() saat ada snapshot minggu baru. Snapshot yang ditulis ulang
+      (re-run di hari yang sama, reprocess market value) membuat matriks dibangun ulang.
+    - Value 0 (market value "-" di Transfermarkt) dianggap tidak diketahui (NaN).
+    """
+
+    ATTR_COLUMNS = ['player_name', 'team', 'league', 'position']
+
+    def __init__(self, store_path=SnapshotStore.DEFAULT_ROOT, identity_path=DEFAULT_IDENTITY_ROOT):
+        self.store = SnapshotStore(store_path)
+        self.identity_path = identity_path
+        self.weeks = []
+        self.players = pd.DataFrame(columns=self.ATTR_COLUMNS)
+        self.values = np.empty((0, 0))
+        self._row = {}
+        self._versions = {}  # snapshot -> sidik jari folder partisinya
+        self.key = 'player_id'  # kolom kunci baris: 'player_id' atau fallback 'player_name'
+        self._stale_identity = None  # sidik jari folder identity saat id-nya ketahuan basi
+        self._lock = threading.Lock()
+        self._velocity_cache = {}
+        self.refresh()
+
+    def _load_weeks(self, weeks, key):
+        df = self.store.load(snapshots=weeks, columns=self.ATTR_COLUMNS + ['market_value_est', 'snapshot'])
+        if key == 'player_id':
+            df['player_id'] = attach_ids(df, load_ids(self.identity_path, weeks), ['snapshot', 'player_name', 'team'])
+        df['market_value_est'] = df['market_value_est'].where(df['market_value_est'] > 0)
+        return df
+
+    def _version(self, week):
+        return fingerprint(os.path.join(self.store.root, f"snapshot={week}"))
+
+    def refresh(self):
+        """
+        Tambahkan snapshot yang belum ada di matriks. Return jumlah minggu yang dibaca.
+        Jika ada snapshot lama yang berubah/hilang, semua minggu dibaca ulang.
+        State baru dibangun terpisah lalu diganti sekaligus, jadi aman dibaca
+        thread lain selama refresh berjalan.
+        """
+        with self._lock:
+            versions = {w: self._version(w) for w in self.store.snapshots()}
+            resolved = set(versions) <= set(available_snapshots(self.identity_path))
+            key = 'player_id' if resolved and fingerprint(self.identity_path) != self._stale_identity else 'player_name'
+            rebuild = key != self.key or any(versions.get(w) != v for w, v in self._versions.items())
+            if rebuild:
+                base_weeks, base_values, base_players, base_row = [], np.empty((0, 0)), pd.DataFrame(columns=self.ATTR_COLUMNS), {}
+            else:
+                base_weeks, base_values, base_players, base_row = self.weeks, self.values, self.players, self._row
+
+            new_weeks = [w for w in versions if w not in set(base_weeks)]
+            if not new_weeks:
+                if rebuild:  # semua snapshot lama sudah dihapus
+                    self.weeks, self.values, self.players, self._row = base_weeks, base_values, base_players, base_row
+                    self._versions, self._velocity_cache, self.key = {}, {}, key
+                return 0
+
+            df = self._load_weeks(new_weeks, key)
+            if key == 'player_id' and (df['player_id'] < 0).any():
+                # Snapshot ditulis ulang tapi belum di-resolve ulang -> semua minggu pakai nama
+                key, self._stale_identity = 'player_name', fingerprint(self.identity_path)
+                base_weeks, base_values, base_players, base_row = [], np.empty((0, 0)), pd.DataFrame(columns=self.ATTR_COLUMNS), {}
+                new_weeks = list(versions)
+                df = self._load_weeks(new_weeks, key)
+            if key == 'player_name' and self.key == 'player_id':
+                print("⚠️ player_id belum lengkap untuk semua snapshot, riwayat value memakai nama pemain "
+                      "(jalankan: python -m src.identity)")
+
+            # Atribut terbaru (nama/tim/liga/posisi) per pemain
+            latest = df.sort_values('snapshot').drop_duplicates(key, keep='last').set_index(key, drop=False)[self.ATTR_COLUMNS]
+            new_ids = latest.index[~latest.index.isin(base_players.index)]
+            players = pd.concat([base_players, latest.loc[new_ids]])
+            players.update(latest)
+            row = dict(base_row)
+            for player_id in new_ids:
+                row[player_id] = len(row)
+
+            # Pivot minggu baru saja, lalu sambungkan ke matriks lama
+            pivot = df.pivot_table(index=key, columns='snapshot', values='market_value_est', aggfunc='max', dropna=False)
+            pivot = pivot.reindex(columns=new_weeks)
+            block = np.full((len(row), len(new_weeks)), np.nan)
+            rows = np.fromiter((row[player_id] for player_id in pivot.index), dtype=np.int64, count=len(pivot.index))
+            block[rows] = pivot.to_numpy(dtype=float)
+
+            old = np.full((len(row), len(base_weeks)), np.nan)
+            old[:base_values.shape[0]] = base_values
+            values = np.hstack([old, block])
+            weeks = base_weeks + new_weeks
+
+            # Urutkan kolom jika snapshot lama di-backfill belakangan
+            order = np.argsort(weeks, kind='stable')
+            weeks = [weeks[i] for i in order]
+            values = values[:, order]
+
+            self.weeks, self.values, self.players, self._row = weeks, values, players, row
+            self._versions = {w: versions[w] for w in weeks}
+            self.key, self._velocity_cache = key, {}
+            return len(new_weeks)
+
+    @property
+    def week_dates(self):
+        return pd.to_datetime(self.weeks, format='%Y%m%d')
+
+    def _filled(self):
+        """Forward-fill NaN sepanjang minggu (vectorized)"""
+        mask = ~np.isnan(self.values)
+        idx = np.where(mask, np.arange(self.values.shape[1]), 0)
+        np.maximum.accumulate(idx, axis=1, out=idx)
+        return self.values[np.arange(self.values.shape[0])[:, None], idx]
+
+    def history(self, player_id):
+        """
+        Riwayat market value satu pemain (Series per tanggal snapshot, name = player_name terbaru).
+        player_id = nilai index self.players (player_name jika self.key == 'player_name').
+        """
+        if player_id not in self._row:
+            return None
+        return pd.Series(self.values[self._row[player_id]], index=self.week_dates,
+                         name=self.players.at[player_id, 'player_name'])
+
+    def ids_for(self, player_name):
+        """Index (player_id) semua pemain yang nama terbarunya player_name (bisa lebih dari satu)"""
+        return self.players.index[self.players['player_name'] == player_name].tolist()
+
+    def velocity(self, weeks=4):
+        """
+        Perubahan value per minggu dalam `weeks` snapshot terakhir untuk semua pemain.
+        Return DataFrame: value_start, value_now, change, change_pct, velocity_per_week.
+        """
+        if not self.weeks:
+            return pd.DataFrame()
+        weeks = max(1, min(weeks, len(self.weeks) - 1))
+        cache = self._velocity_cache
+        if weeks in cache:
+            return cache[weeks]
+
+        filled = self._filled()
+        start, now = filled[:, -1 - weeks], filled[:, -1]
+        change = now - start
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change_pct = change / start * 100
+
+        result = self.players.reindex(list(self._row)).copy()
+        result['value_start'] = start
+        result['value_now'] = now
+        result['change'] = change
+        result['change_pct'] = np.round(change_pct, 1)
+        result['velocity_per_week'] = change / weeks
+        result.index.name = self.key
+        cache[weeks] = result
+        return result
+
+    def movers(self, n=10, weeks=4, league=None, position=None, direction='up'):
+        """Top riser (direction='up') atau faller ('down') per liga/posisi"""
+        vel = self.velocity(weeks).dropna(subset=['change'])
+        if league is not None:
+            vel = vel[vel['league'] == league]
+        if position is not None:
+            vel = vel[vel['position'] == position]
+        if direction == 'up':
+            return vel[vel['change'] > 0].nlargest(n, 'change')
+        return vel[vel['change'] < 0].nsmallest(n, 'change')
@@ -0,0 +1,67 @@
+import os
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from src.market_value import format_market_values
+from src.storage import SnapshotStore
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+DATABASE_TAB = "📝 Database"
+
+
+def make_players():
+    """95 pemain sintetis: 60 Indonesia, 35 Thailand, value unik (urutan sort pasti)"""
+    rows = []
+    for i in range(95):
+        league = 'Indonesia' if i < 60 else 'Thailand'
+        rows.append({
+            'player_name': f"Pemain {i:03d}",
+            'team': f"{league} FC {i % 3}",
+            'league': league,
+            'position': ['Bek', 'Gelandang', 'Penyerang'][i % 3],
+            'age': 18 + i % 17,
+            'market_value_est': (i + 1) * 10_000_000,
+        })
+    df = pd.DataFrame(rows)
+    df['market_value_raw'] = format_market_values(df['market_value_est'])
+    df['scraped_date'] = '2026-01-05'
+    return df
+
+
+def test_database_tab_pages_and_resets_page_on_filter_change(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    SnapshotStore().write_snapshot(make_players(), snapshot='20260105')
+    at = AppTest.from_file(APP, default_timeout=60)
+
+    def run(widget=None, value=None):
+        # AppTest tidak menyimpan tab yang terbuka antar run -> set ulang tiap interaksi
+        if widget is not None:
+            widget.set_value(value)
+        at.session_state["main_tab"] = DATABASE_TAB
+        at.run()
+        assert not at.exception
+        return [c.value for c in at.caption if c.value.startswith("Baris")][0]
+
+    run()
+    assert run(at.selectbox(key="t5_page_size"), 25) == "Baris 1-25 dari 95"
+    assert len(at.dataframe[0].value) == 25
+    assert run(at.number_input(key="t5_page"), 2) == "Baris 26-50 dari 95"
+    # Halaman terakhir parsial
+    assert run(at.number_input(key="t5_page"), 4) == "Baris 76-95 dari 95"
+    assert len(at.dataframe[0].value) == 20
+    assert at.dataframe[0].value['market_value_est'].iloc[-1] == 10_000_000
+
+    # Filter sidebar berubah -> kembali ke halaman 1
+    assert run(at.sidebar.multiselect[0], ['Indonesia']) == "Baris 1-25 dari 60"
+    assert at.number_input(key="t5_page").value == 1
+    assert run(at.number_input(key="t5_page"), 3) == "Baris 51-60 dari 60"
+
+    # Urutan berubah -> halaman 1
+    assert run(at.radio(key="t5_dir"), "⬆️ Terkecil") == "Baris 1-25 dari 60"
+    assert at.dataframe[0].value['market_value_est'].iloc[0] == 10_000_000
+
+    # Ukuran halaman berubah -> halaman 1
+    run(at.number_input(key="t5_page"), 2)
+    assert run(at.selectbox(key="t5_page_size"), 50) == "Baris 1-50 dari 60"
+    assert at.number_input(key="t5_page").value == 1
@@ -0,0 +1,78 @@
+import pandas as pd
+
+from src.identity import PlayerRegistry, load_ids, store_frames
+from src.storage import SnapshotStore
+
+COLUMNS = ['player_name', 'team', 'league', 'position', 'age', 'market_value_est']
+
+
+def week(rows):
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def test_player_registry_keeps_ids_across_transfers_and_splits_namesakes(tmp_path):
+    registry = PlayerRegistry(str(tmp_path))
+    registry.update([('20260105', lambda: week([
+        ('João Pedro', 'Kuching City', 'Malaysia', 'Penyerang', 22, 2610000000),
+        ('João Pedro', 'Immigration FC', 'Malaysia', 'Bek', 0, 3910000000),
+        ('Tan Tai Ho', 'Becamex Ho Chi Minh City FC', 'Vietnam', 'Bek', 25, 1300000000),
+    ]))])
+    first = load_ids(str(tmp_path)).set_index(['player_name', 'team'])['player_id']
+    assert first.nunique() == 3
+
+    # Minggu berikutnya (run baru, registry dibaca dari disk): satu João Pedro pindah tim,
+    # ejaan tanpa aksen tetap dikenali, dan nama mirip di tim yang sama tidak mengambil ID pemain lain
+    registry = PlayerRegistry(str(tmp_path))
+    results = registry.update([('20260105', None), ('20260112', lambda: week([
+        ('Joao Pedro', 'Sabah FC', 'Malaysia', 'Penyerang', 22, 2610000000),
+        ('João Pedro', 'Immigration FC', 'Malaysia', 'Bek', 0, 3910000000),
+        ('Tan Tai Ho', 'Becamex Ho Chi Minh City FC', 'Vietnam', 'Bek', 25, 1300000000),
+        ('Tuan Tai Ho', 'Becamex Ho Chi Minh City FC', 'Vietnam', 'Bek', 25, 1300000000),
+    ]))])
+    assert [snapshot for snapshot, _ in results] == ['20260112']
+    second = load_ids(str(tmp_path), ['20260112']).set_index(['player_name', 'team'])['player_id']
+    assert second[('Joao Pedro', 'Sabah FC')] == first[('João Pedro', 'Kuching City')]
+    assert second[('João Pedro', 'Immigration FC')] == first[('João Pedro', 'Immigration FC')]
+    assert second[('Tan Tai Ho', 'Becamex Ho Chi Minh City FC')] == first[('Tan Tai Ho', 'Becamex Ho Chi Minh City FC')]
+    assert second[('Tuan Tai Ho', 'Becamex Ho Chi Minh City FC')] not in set(first)
+
+
+
+def test_rewritten_snapshot_is_resolved_again(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'store'))
+    squad = [('Marc Klok', 'PERSIB Bandung', 'Indonesia', 'Gelandang', 32, 5220000000),
+             ('Beckham Putra', 'PERSIB Bandung', 'Indonesia', 'Gelandang', 23, 3910000000)]
+    store.write_snapshot(week(squad), snapshot='20260105')
+    store.write_snapshot(week(squad), snapshot='20260112')
+    identity = str(tmp_path / 'identity')
+    PlayerRegistry(identity).update(store_frames(store.root))
+    before = load_ids(identity, ['20260112']).set_index('player_name')['player_id']
+
+    # Tanpa perubahan isi: tidak ada yang di-resolve ulang
+    assert PlayerRegistry(identity).update(store_frames(store.root)) == []
+
+    # Run ulang di hari yang sama menulis ulang snapshot terakhir dengan pemain baru
+    store.write_snapshot(week(squad + [('Teja Paku Alam', 'PERSIB Bandung', 'Indonesia', 'Penjaga Gawang', 31, 4350000000)]),
+                         snapshot='20260112')
+    results = PlayerRegistry(identity).update(store_frames(store.root))
+    assert [snapshot for snapshot, _ in results] == ['20260105', '20260112']
+    after = load_ids(identity, ['20260112']).set_index('player_name')['player_id']
+    assert len(after) == 3 and (after >= 0).all() and after.is_unique
+    assert after[['Marc Klok', 'Beckham Putra']].tolist() == before[['Marc Klok', 'Beckham Putra']].tolist()
+
+
+def test_preview_matches_resolve_without_changing_registry(tmp_path):
+    registry = PlayerRegistry(str(tmp_path))
+    registry.update([('20260105', lambda: week([
+        ('Marc Klok', 'PERSIB Bandung', 'Indonesia', 'Gelandang', 32, 5220000000),
+        ('Beckham Putra', 'PERSIB Bandung', 'Indonesia', 'Gelandang', 23, 3910000000),
+    ]))])
+    df = week([
+        ('Beckham Putra', 'PERSIB Bandung', 'Indonesia', 'Gelandang', 23, 3910000000),
+        ('Teja Paku Alam', 'PERSIB Bandung', 'Indonesia', 'Penjaga Gawang', 31, 4350000000),
+        ('Marc Klok', 'Persija Jakarta', 'Indonesia', 'Gelandang', 32, 5220000000),
+    ])
+    players, snapshots = dict(registry.players), list(registry.snapshots)
+    preview = registry.preview(df, '20260112')
+    assert registry.players == players and registry.snapshots == snapshots
+    assert preview == list(registry.resolve(df, '20260112')[0])
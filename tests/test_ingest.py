@@ -0,0 +1,180 @@
+import pandas as pd
+
+from src.ingest import apply_change_set, compute_change_set
+
+COLUMNS = ['player_name', 'team', 'league_country', 'position', 'age', 'market_value_est']
+
+
+def squad(team, players, league='Indonesia'):
+    """players: list (nama, posisi, umur, value)"""
+    return pd.DataFrame([(name, team, league, pos, age, value) for name, pos, age, value in players], columns=COLUMNS)
+
+
+def master_db():
+    return pd.concat([
+        squad('Arema FC', [('Rizky', 'Bek', 24, 100), ('Dendi', 'Gelandang', 27, 200), ('Charles', 'Penyerang', 29, 300)]),
+        squad('PERSIB Bandung', [('Marc Klok', 'Gelandang', 32, 500), ('Beckham', 'Penyerang', 23, 400),
+                                 ('Teja', 'Penjaga Gawang', 30, 150)]),
+        squad('PSM Makassar', [('Yuran', 'Bek', 30, 250), ('Ananda', 'Penyerang', 22, 180)]),
+    ], ignore_index=True)
+
+
+def test_skipped_team_keeps_player_when_namesake_appears_elsewhere():
+    master = master_db()
+    # Arema gagal di-fetch (scraper melaporkan kegagalan di liga Indonesia);
+    # "Rizky" lain (posisi & umur berbeda) muncul di PSM
+    scraped = pd.concat([
+        squad('PERSIB Bandung', [('Marc Klok', 'Gelandang', 32, 550), ('Beckham', 'Penyerang', 23, 400),
+                                 ('Teja', 'Penjaga Gawang', 30, 150)]),
+        squad('PSM Makassar', [('Yuran', 'Bek', 30, 250), ('Ananda', 'Penyerang', 22, 180), ('Rizky', 'Gelandang', 19, 50)]),
+    ], ignore_index=True)
+
+    change_set = compute_change_set(master, scraped, failed_leagues=['Indonesia'])
+    assert change_set.skipped_teams == ['Arema FC']
+    assert change_set.transferred.empty
+    assert change_set.new[['player_name', 'team']].values.tolist() == [['Rizky', 'PSM Makassar']]
+    assert change_set.departed.empty
+    assert change_set.value_changed['player_name'].tolist() == ['Marc Klok']
+
+    updated = apply_change_set(master, change_set)
+    assert sorted(updated.loc[updated['player_name'] == 'Rizky', 'team']) == ['Arema FC', 'PSM Makassar']
+    assert len(updated) == len(master) + 1
+
+
+def test_player_moving_out_of_skipped_team_is_not_duplicated():
+    master = master_db()
+    # Arema gagal di-fetch, tapi Rizky (profil sama) sudah muncul di skuad PERSIB
+    scraped = pd.concat([
+        squad('PERSIB Bandung', [('Marc Klok', 'Gelandang', 32, 500), ('Beckham', 'Penyerang', 23, 400),
+                                 ('Teja', 'Penjaga Gawang', 30, 150), ('Rizky', 'Bek', 24, 100)]),
+        squad('PSM Makassar', [('Yuran', 'Bek', 30, 250), ('Ananda', 'Penyerang', 22, 180)]),
+    ], ignore_index=True)
+
+    change_set = compute_change_set(master, scraped, failed_leagues=['Indonesia'])
+    assert change_set.skipped_teams == ['Arema FC']
+    assert change_set.transferred[['player_name', 'team_from', 'team_to']].values.tolist() == [
+        ['Rizky', 'Arema FC', 'PERSIB Bandung']]
+    assert change_set.new.empty and change_set.departed.empty
+
+    updated = apply_change_set(master, change_set)
+    assert updated.loc[updated['player_name'] == 'Rizky', 'team'].tolist() == ['PERSIB Bandung']
+    assert sorted(updated.loc[updated['team'] == 'Arema FC', 'player_name']) == ['Charles', 'Dendi']
+    assert len(updated) == len(master)
+
+
+def test_team_missing_without_reported_failure_departs():
+    master = master_db()
+    # Arema degradasi: tidak ada di klasemen & tidak ada halaman yang gagal di liga Indonesia
+    scraped = pd.concat([
+        squad('PERSIB Bandung', [('Marc Klok', 'Gelandang', 32, 500), ('Beckham', 'Penyerang', 23, 400),
+                                 ('Teja', 'Penjaga Gawang', 30, 150)]),
+        squad('PSM Makassar', [('Yuran', 'Bek', 30, 250), ('Ananda', 'Penyerang', 22, 180)]),
+    ], ignore_index=True)
+
+    for failed_leagues in ([], ['Thailand']):
+        change_set = compute_change_set(master, scraped, failed_leagues=failed_leagues)
+        assert change_set.skipped_teams == []
+        assert sorted(change_set.departed['player_name']) == ['Charles', 'Dendi', 'Rizky']
+        updated = apply_change_set(master, change_set)
+        assert 'Arema FC' not in set(updated['team']) and len(updated) == len(master) - 3
+
+    change_set = compute_change_set(master, scraped, failed_leagues=['Indonesia'])
+    assert change_set.skipped_teams == ['Arema FC'] and change_set.departed.empty
+
+
+def test_partial_week_keeps_old_rows_and_matches_transfers():
+    master = master_db()
+    scraped = pd.concat([
+        # Arema: Charles pindah ke PSM, Dendi keluar, Fajar baru
+        squad('Arema FC', [('Rizky', 'Bek', 24, 120), ('Fajar', 'Gelandang', 20, 60)]),
+        # PERSIB parsial (1 dari 3 pemain < 50%) -> dipertahankan
+        squad('PERSIB Bandung', [('Marc Klok', 'Gelandang', 32, 900)]),
+        squad('PSM Makassar', [('Yuran', 'Bek', 30, 250), ('Ananda', 'Penyerang', 22, 180), ('Charles', 'Penyerang', 29, 320)]),
+    ], ignore_index=True)
+
+    change_set = compute_change_set(master, scraped, min_team_coverage=0.3)
+    assert change_set.skipped_teams == []
+    change_set = compute_change_set(master, scraped)
+    assert change_set.skipped_teams == ['PERSIB Bandung']
+    assert change_set.transferred[['player_name', 'team_from', 'team_to', 'market_value_old', 'market_value_new']].values.tolist() == [
+        ['Charles', 'Arema FC', 'PSM Makassar', 300, 320]]
+    assert change_set.departed['player_name'].tolist() == ['Dendi']
+    assert change_set.new['player_name'].tolist() == ['Fajar']
+    assert set(change_set.value_changed['player_name']) == {'Rizky'}
+
+    updated = apply_change_set(master, change_set)
+    assert len(updated[updated['team'] == 'PERSIB Bandung']) == 3
+    assert updated.loc[updated['player_name'] == 'Marc Klok', 'market_value_est'].tolist() == [500]
+    assert updated.loc[updated['player_name'] == 'Charles', 'team'].tolist() == ['PSM Makassar']
+
+
+def test_namesakes_are_not_collapsed_into_one_transfer():
+    master = pd.concat([
+        squad('Arema FC', [('Rizky', 'Bek', 24, 100), ('Dendi', 'Gelandang', 27, 200)]),
+        squad('PSM Makassar', [('Rizky', 'Penyerang', 21, 80), ('Yuran', 'Bek', 30, 250)]),
+    ], ignore_index=True)
+    # Kedua Rizky pindah: Rizky (Bek) ke PERSIB, Rizky (Penyerang) ke Bali United
+    scraped = pd.concat([
+        squad('Arema FC', [('Dendi', 'Gelandang', 27, 200)]),
+        squad('PSM Makassar', [('Yuran', 'Bek', 30, 250)]),
+        squad('PERSIB Bandung', [('Rizky', 'Bek', 24, 110)]),
+        squad('Bali United', [('Rizky', 'Penyerang', 21, 90)]),
+    ], ignore_index=True)
+
+    change_set = compute_change_set(master, scraped)
+    moves = sorted(change_set.transferred[['team_from', 'team_to']].values.tolist())
+    assert moves == [['Arema FC', 'PERSIB Bandung'], ['PSM Makassar', 'Bali United']]
+    assert change_set.new.empty and change_set.departed.empty
+
+
+def with_ids(df, ids):
+    """ids: {(nama, tim): player_id}"""
+    return df.assign(player_id=[ids[key] for key in zip(df['player_name'], df['team'])])
+
+
+def test_player_id_pairs_identical_namesakes_and_renames():
+    master = pd.concat([
+        squad('Arema FC', [('Rizky', 'Bek', 24, 100), ('Dendi', 'Gelandang', 27, 200)]),
+        squad('PSM Makassar', [('Rizky', 'Bek', 24, 80), ('Yuran', 'Bek', 30, 250)]),
+    ], ignore_index=True)
+    # Dua Rizky dengan posisi & umur sama sama-sama pindah; Dendi ganti ejaan nama
+    scraped = pd.concat([
+        squad('Arema FC', [('Dendi S.', 'Gelandang', 27, 210)]),
+        squad('PSM Makassar', [('Yuran', 'Bek', 30, 250)]),
+        squad('PERSIB Bandung', [('Rizky', 'Bek', 24, 110)]),
+        squad('Bali United', [('Rizky', 'Bek', 24, 90), ('Fajar', 'Gelandang', 20, 60)]),
+    ], ignore_index=True)
+
+    by_name = compute_change_set(master, scraped)
+    assert by_name.transferred.empty and len(by_name.departed) == 3
+
+    master = with_ids(master, {('Rizky', 'Arema FC'): 1, ('Dendi', 'Arema FC'): 2,
+                               ('Rizky', 'PSM Makassar'): 3, ('Yuran', 'PSM Makassar'): 4})
+    scraped = with_ids(scraped, {('Dendi S.', 'Arema FC'): 2, ('Yuran', 'PSM Makassar'): 4,
+                                 ('Rizky', 'PERSIB Bandung'): 3, ('Rizky', 'Bali United'): 1,
+                                 ('Fajar', 'Bali United'): -1})
+    change_set = compute_change_set(master, scraped)
+    moves = sorted(change_set.transferred[['player_id', 'team_from', 'team_to', 'market_value_old']].values.tolist())
+    assert moves == [[1, 'Arema FC', 'Bali United', 100], [3, 'PSM Makassar', 'PERSIB Bandung', 80]]
+    assert change_set.value_changed[['player_id', 'player_name', 'delta']].values.tolist() == [[2, 'Dendi S.', 10]]
+    assert change_set.new['player_name'].tolist() == ['Fajar']
+    assert change_set.departed.empty
+
+
+def test_player_id_moving_out_of_skipped_team_is_not_duplicated():
+    master = master_db().assign(player_id=range(len(master_db())))
+    # Arema gagal di-fetch; Rizky (id sama, ganti ejaan) muncul di PSM -> pindah, baris Arema lainnya dipertahankan
+    rizky = master.loc[master['player_name'] == 'Rizky', 'player_id'].iloc[0]
+    scraped = pd.concat([
+        master[master['team'] == 'PERSIB Bandung'],
+        master[master['team'] == 'PSM Makassar'],
+        squad('PSM Makassar', [('Rizky A.', 'Bek', 24, 100)]).assign(player_id=rizky),
+    ], ignore_index=True)
+
+    change_set = compute_change_set(master, scraped, failed_leagues=['Indonesia'])
+    assert change_set.skipped_teams == ['Arema FC']
+    assert change_set.transferred[['player_id', 'team_from', 'team_to']].values.tolist() == [[rizky, 'Arema FC', 'PSM Makassar']]
+    assert change_set.new.empty and change_set.departed.empty
+    updated = apply_change_set(master, change_set)
+    assert len(updated) == len(master) and updated['player_id'].is_unique
+    assert sorted(updated.loc[updated['team'] == 'Arema FC', 'player_name']) == ['Charles', 'Dendi']
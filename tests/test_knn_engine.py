@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from src.knn_engine import ConstrainedKNN
+
+
+def random_players(n=3000, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'position': rng.choice(['Bek', 'Gelandang', 'Penyerang'], n),
+        'league': rng.choice(['Indonesia', 'Thailand', 'Vietnam', 'Malaysia'], n),
+        'age': rng.integers(16, 38, n),
+        # Value dibulatkan supaya banyak jarak seri (urutan seri harus sama: row terkecil dulu)
+        'market_value_est': rng.integers(1, 60, n) * 50_000_000,
+        'height': rng.normal(178, 6, n).round(),
+    })
+
+
+def brute_force(engine, df, row, k, leagues, constraints):
+    """Scan semua baris posisi yang sama, filter, lalu urutkan (jarak, row)"""
+    candidates = np.flatnonzero((df['position'] == df['position'].iat[row]).to_numpy())
+    candidates = candidates[candidates != row]
+    if leagues is not None:
+        candidates = candidates[np.isin(df['league'].to_numpy()[candidates], leagues)]
+    for col, (lo, hi) in constraints.items():
+        values = df[col].to_numpy()[candidates]
+        keep = np.ones(len(candidates), dtype=bool)
+        if lo is not None:
+            keep &= values >= lo
+        if hi is not None:
+            keep &= values <= hi
+        candidates = candidates[keep]
+    d = np.linalg.norm(engine._scaled[candidates] - engine._scaled[row], axis=1)
+    order = np.lexsort((candidates, d))[:k]
+    return candidates[order], d[order]
+
+
+def test_constrained_knn_matches_brute_force_on_random_queries():
+    df = random_players()
+    rng = np.random.default_rng(5)
+    engines = [
+        ConstrainedKNN(df, leaf_size=8),
+        ConstrainedKNN(df, features=('age', 'market_value_est', 'height'), weights=(1.0, 2.0, 0.5), leaf_size=16),
+    ]
+    for engine in engines:
+        for _ in range(150):
+            row = int(rng.integers(len(df)))
+            k = int(rng.choice([1, 3, 10, 50, 5000]))
+            leagues = None if rng.random() < 0.3 else list(rng.choice(['Indonesia', 'Thailand', 'Vietnam', 'Laos'], 2, replace=False))
+            min_age = None if rng.random() < 0.5 else int(rng.integers(16, 30))
+            max_age = None if rng.random() < 0.5 else int(rng.integers(20, 38))
+            max_value = None if rng.random() < 0.5 else float(rng.integers(1, 60) * 50_000_000)
+            constraints = {'age': (min_age, max_age), 'market_value_est': (None, max_value)}
+
+            rows, distances = engine.query(row, k=k, leagues=leagues, constraints=constraints)
+            expected_rows, expected_distances = brute_force(engine, df, row, k, leagues, constraints)
+            assert rows.tolist() == expected_rows.tolist()
+            assert np.allclose(distances, expected_distances)
+
+
+def test_constrained_knn_non_positive_k_returns_empty():
+    engine = ConstrainedKNN(random_players(n=200))
+    for k in (0, -3):
+        rows, distances = engine.query(0, k=k)
+        assert len(rows) == 0 and len(distances) == 0
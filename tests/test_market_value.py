@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from src.market_value import format_market_values, parse_market_value, parse_market_values
+
+
+def test_parse_indonesian_market_values():
+    raw = ['Rp3,91Mlyr.', 'Rp434,54Jt.', 'Rp1.250Rb.', '-', '', None, np.nan, 'Rp1,2T.']
+    expected = [3_910_000_000, 434_540_000, 1_250_000, 0, 0, 0, 0, 1_200_000_000_000]
+    parsed = parse_market_values(raw)
+    assert parsed.dtype == 'int64'
+    assert parsed.tolist() == expected
+    assert [parse_market_value(r) for r in raw] == expected
+
+
+def test_parse_keeps_index_of_series():
+    raw = pd.Series(['Rp3,91Mlyr.', '-'], index=[10, 20])
+    assert parse_market_values(raw).index.tolist() == [10, 20]
+
+
+def test_format_then_parse_round_trip():
+    values = [3_910_000_000, 434_540_000, 1_250_000, 25_000, 1_200_000_000_000, 0]
+    formatted = format_market_values(values)
+    assert formatted.tolist() == ['Rp3,91Mlyr.', 'Rp434,54Jt.', 'Rp1,25Jt.', 'Rp25,00Rb.', 'Rp1,20T.', '-']
+    assert parse_market_values(formatted).tolist() == values
+
+    raw = ['Rp3,91Mlyr.', 'Rp434,54Jt.', '-']
+    assert format_market_values(parse_market_values(raw)).tolist() == raw
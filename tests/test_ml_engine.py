@@ -0,0 +1,300 @@
+import numpy as np
+import pandas as pd
+
+from src.aggregates import build_aggregates, load_aggregates
+from src.identity import PlayerRegistry, store_frames
+from src.market_value import format_market_values, reprocess_all
+from src.ml_engine import ScoutBrain
+from src.storage import SnapshotStore
+
+TEAMS = {'Indonesia': ['PERSIB Bandung', 'Arema FC', 'PSM Makassar'], 'Thailand': ['Buriram United', 'BG Pathum United']}
+POSITIONS = ['Penjaga Gawang', 'Bek', 'Gelandang', 'Penyerang']
+WEEKS = ['20260105', '20260112', '20260119']
+
+
+def make_week(week, n_players=60, seed=7):
+    """Satu snapshot sintetis: pemain yang sama tiap minggu, value & umur sedikit berubah"""
+    rng = np.random.default_rng(seed)
+    teams = [(league, team) for league, names in TEAMS.items() for team in names]
+    rows = []
+    for i in range(n_players):
+        league, team = teams[i % len(teams)]
+        rows.append({
+            'player_name': f"Pemain {i:03d}",
+            'team': team,
+            'league': league,
+            'position': POSITIONS[rng.integers(len(POSITIONS))],
+            'age': int(rng.integers(17, 36)),
+            'market_value_est': int(rng.integers(1, 400)) * 10_000_000,
+        })
+    df = pd.DataFrame(rows)
+    # Value bergeser per minggu, jadi statistik minggu lama != minggu terbaru
+    df['market_value_est'] += WEEKS.index(week) * 5_000_000 * (df.index % 3)
+    df['market_value_raw'] = format_market_values(df['market_value_est'])
+    df['scraped_date'] = pd.to_datetime(week).strftime('%Y-%m-%d')
+    return df
+
+
+def write_store(root, weeks=WEEKS, **kwargs):
+    store = SnapshotStore(str(root))
+    for week in weeks:
+        store.write_snapshot(make_week(week, **kwargs), snapshot=week)
+    return store
+
+
+def test_similar_players_over_all_snapshots_use_one_row_per_player(tmp_path):
+    write_store(tmp_path / 'store')
+    latest = ScoutBrain(store_path=str(tmp_path / 'store'), identity_path=str(tmp_path / 'identity'))
+    names = sorted(latest.df['player_name'])
+
+    # Tanpa player_id (kunci nama), lalu dengan player_id dari registry
+    history = ScoutBrain(store_path=str(tmp_path / 'store'), snapshots=None, identity_path=str(tmp_path / 'identity'))
+    PlayerRegistry(str(tmp_path / 'identity')).update(store_frames(str(tmp_path / 'store')))
+    with_ids = ScoutBrain(store_path=str(tmp_path / 'store'), snapshots=None, identity_path=str(tmp_path / 'identity'))
+    assert (with_ids.df['player_id'] >= 0).all()
+
+    columns = ['player_name', 'team', 'age', 'market_value_raw', 'similarity_score']
+    for brain in (history, with_ids):
+        for name in names:
+            result = brain.get_similar_players(name, top_n=10)
+            assert name not in set(result['player_name'])
+            # Kandidat & statistik query = snapshot terbaru
+            expected = latest.get_similar_players(name, top_n=10)
+            assert result[columns].reset_index(drop=True).equals(expected[columns].reset_index(drop=True))
+
+            constrained = brain.find_similar(name, top_n=5, max_age=30)
+            assert name not in set(constrained['player_name'])
+
+        batch = brain.get_similar_players_batch(team_name='PERSIB Bandung', top_n=5)
+        assert set(batch['query_player']) == set(latest.df.loc[latest.df['team'] == 'PERSIB Bandung', 'player_name'])
+        assert not (batch['query_player'] == batch['player_name']).any()
+
+    player_id = int(with_ids.df['player_id'].iloc[0])
+    by_id = with_ids.get_similar_players(player_id, top_n=10)
+    assert with_ids.df['player_name'].iloc[0] not in set(by_id['player_name'])
+
+
+def test_count_matches_row_index(tmp_path):
+    write_store(tmp_path / 'store')
+    brain = ScoutBrain(store_path=str(tmp_path / 'store'), snapshots=None, identity_path=str(tmp_path / 'identity'))
+    filters = [
+        {},
+        {'leagues': ['Indonesia']},
+        {'leagues': 'Thailand', 'positions': ['Bek', 'Bek', 'Gelandang']},
+        {'teams': ['Arema FC', 'Buriram United']},
+        {'leagues': ['Indonesia'], 'teams': ['Arema FC', 'Buriram United'], 'positions': ['Penyerang']},
+        {'leagues': ['Liga Antah'], 'teams': ['Tim Antah']},
+    ]
+    for kwargs in filters:
+        assert brain.count(**kwargs) == len(brain.row_index(**kwargs))
+    assert brain.count() == len(brain.df)
+
+
+def test_pages_cover_the_sorted_filter_exactly(tmp_path):
+    write_store(tmp_path / 'store', weeks=WEEKS[:1], n_players=103)
+    brain = ScoutBrain(store_path=str(tmp_path / 'store'), identity_path=str(tmp_path / 'identity'))
+    filters = {'leagues': ['Indonesia'], 'positions': ['Bek', 'Gelandang', 'Penyerang']}
+    total = brain.count(**filters)
+    assert total % 10 != 0
+    expected = brain.filter(**filters).sort_values('market_value_est', ascending=False, kind='stable')
+
+    pages = []
+    for offset in range(0, total, 10):
+        n_rows, page = brain.page(**filters, sort_by='market_value_raw', ascending=False, offset=offset, limit=10)
+        assert n_rows == total
+        pages.append(page)
+    # Halaman penuh, halaman terakhir parsial, tanpa baris ganda / terlewat
+    assert [len(p) for p in pages] == [10] * (total // 10) + [total % 10]
+    assert pd.concat(pages).equals(expected)
+    assert brain.page(**filters, offset=total, limit=10)[1].empty
+    assert brain.page(leagues=['Liga Antah'], limit=10)[0] == 0
+
+
+def test_filter_memo_is_bounded_and_invalidated_when_store_changes(tmp_path):
+    store = write_store(tmp_path / 'store', weeks=WEEKS[:1])
+    brain = ScoutBrain(store_path=store.root, identity_path=str(tmp_path / 'identity'))
+    brain.MEMO_SIZE = 3
+    for team in TEAMS['Indonesia'] + TEAMS['Thailand']:
+        subset = brain.filter(teams=[team])
+        assert set(subset['team']) == {team}
+    # Memo menyimpan posisi baris (read-only), bukan salinan DataFrame per filter
+    assert len(brain._memo) == 3
+    assert not any(isinstance(v, pd.DataFrame) for v in brain._memo.values())
+    assert not brain.row_index(teams=['Arema FC']).flags.writeable
+    assert brain.filter(teams=['Arema FC']).equals(brain.df[brain.df['team'] == 'Arema FC'])
+
+    # Snapshot baru -> sidik jari store berubah -> rebuild mengosongkan memo
+    before = len(brain.filter(leagues=['Indonesia']))
+    store.write_snapshot(make_week(WEEKS[1], n_players=90), snapshot=WEEKS[1])
+    assert brain.is_stale()
+    brain.rebuild()
+    assert not brain.is_stale() and len(brain._memo) == 0
+    assert len(brain.filter(leagues=['Indonesia'])) == 54 != before
+
+
+def test_batch_matches_single_player_queries(tmp_path):
+    write_store(tmp_path / 'store')
+    identity = str(tmp_path / 'identity')
+    PlayerRegistry(identity).update(store_frames(str(tmp_path / 'store')))
+    for kwargs in ({}, {'snapshots': None}):
+        brain = ScoutBrain(store_path=str(tmp_path / 'store'), identity_path=identity, **kwargs)
+        names = ['Pemain 003', 'Pemain 017', 'Pemain 003', 'Pemain Antah', 'Pemain 042']
+        squad = brain.get_similar_players_batch(team_name='Arema FC', top_n=4)
+        assert set(squad['query_player']) == set(brain.df.loc[brain.df['team'] == 'Arema FC', 'player_name'])
+
+        for batch, queries in ((brain.get_similar_players_batch(names, top_n=4), dict.fromkeys(names[:3] + names[4:])),
+                               (squad, dict.fromkeys(squad['query_player']))):
+            assert queries and set(batch['query_player']) == set(queries)
+            for name in queries:
+                rows = batch[batch['query_player'] == name]
+                assert rows['rank'].tolist() == list(range(1, len(rows) + 1))
+                single = brain.get_similar_players(name, top_n=4)
+                assert rows.drop(columns=['query_player', 'rank']).reset_index(drop=True).equals(single.reset_index(drop=True))
+
+
+def test_row_without_position_does_not_break_similarity_queries(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'store'))
+    for week in WEEKS[:2]:
+        df = make_week(week)
+        df.loc[5, 'position'] = np.nan  # posisi gagal di-parse
+        store.write_snapshot(df, snapshot=week)
+    nameless = df.loc[5, 'player_name']
+    team = df.loc[5, 'team']
+
+    for kwargs in ({}, {'snapshots': None}, {'compact': True}):
+        brain = ScoutBrain(store_path=store.root, identity_path=str(tmp_path / 'identity'), **kwargs)
+        assert brain.get_similar_players(nameless) is None
+        result = brain.get_similar_players('Pemain 000', top_n=5)
+        assert len(result) == 5 and result['position'].notna().all()
+        batch = brain.get_similar_players_batch(team_name=team, top_n=3)
+        assert nameless not in set(batch['query_player']) and len(set(batch['query_player'])) > 0
+        assert len(brain.find_similar('Pemain 000', top_n=3)) == 3
+
+
+def reference_team_needs(df, team_name, target_position, top_n=5):
+    """Implementasi awal (scan dataframe penuh per query) sebagai referensi"""
+    team_players = df[df['team'] == team_name]
+    if team_players.empty:
+        return None
+    avg_squad_value = team_players['market_value_est'].nlargest(15).mean()
+    if pd.isna(avg_squad_value) or avg_squad_value == 0:
+        avg_squad_value = ScoutBrain.DEFAULT_SQUAD_VALUE
+    candidates = df[(df['position'] == target_position) & (df['team'] != team_name)].copy()
+    if candidates.empty:
+        return pd.DataFrame()
+    candidates = candidates[(candidates['market_value_est'] >= avg_squad_value * ScoutBrain.BUDGET_MIN_RATIO)
+                            & (candidates['market_value_est'] <= avg_squad_value * ScoutBrain.BUDGET_MAX_RATIO)].copy()
+    candidates['scout_score'] = candidates['market_value_est'] / candidates['age']
+    return candidates.nlargest(top_n, 'scout_score')[['player_name', 'team', 'league', 'age', 'market_value_raw', 'scout_score']]
+
+
+def planner_fixture(tmp_path):
+    df = make_week(WEEKS[-1], n_players=120, seed=11)
+    # Kasus tepi: umur 0 (skor inf), value 0 (skor NaN/0), skor seri, satu tim tanpa value
+    df.loc[::9, 'age'] = 0
+    df.loc[::13, 'market_value_est'] = 0
+    df.loc[20:29, ['age', 'market_value_est']] = (25, 500_000_000)
+    df.loc[df['team'] == 'BG Pathum United', 'market_value_est'] = 0
+    df['market_value_raw'] = format_market_values(df['market_value_est'])
+    SnapshotStore(str(tmp_path / 'store')).write_snapshot(df, snapshot=WEEKS[-1])
+    return ScoutBrain(store_path=str(tmp_path / 'store'), identity_path=str(tmp_path / 'identity'))
+
+
+def test_squad_planner_matches_reference_scan(tmp_path):
+    brain = planner_fixture(tmp_path)
+    columns = ['player_name', 'team', 'league', 'age', 'market_value_raw']
+    expected_report = []
+    for team in brain.teams_in():
+        for pos in POSITIONS + ['Posisi Antah']:
+            for top_n in (1, 5, 200):
+                expected = reference_team_needs(brain.df, team, pos, top_n)
+                result = brain.recommend_for_team_needs(team, pos, top_n)
+                if expected.empty:
+                    assert result.empty
+                    continue
+                assert result[columns].reset_index(drop=True).equals(expected[columns].reset_index(drop=True))
+            if pos in POSITIONS:
+                expected = reference_team_needs(brain.df, team, pos, 5)
+                expected_report.append(expected.assign(target_team=team, target_position=pos, rank=np.arange(1, len(expected) + 1)))
+    assert brain.recommend_for_team_needs('Tim Antah', 'Bek') is None
+
+    expected_report = pd.concat(expected_report).sort_values(['target_team', 'target_position', 'rank'], kind='stable')
+    report = brain.squad_planner_report(top_n=5, max_block_cells=50)
+    report_columns = ['target_team', 'target_position', 'rank'] + columns + ['scout_score']
+    assert report.equals(expected_report[report_columns].reset_index(drop=True))
+
+
+def test_stale_aggregates_are_recomputed_and_reprocess_rebuilds_them(tmp_path):
+    store = write_store(tmp_path / 'store', weeks=WEEKS[-1:])
+    aggregates = str(tmp_path / 'aggregates')
+    build_aggregates(store.root, aggregates)
+    brain = ScoutBrain(store_path=store.root, aggregates_path=aggregates, identity_path=str(tmp_path / 'identity'))
+    before = brain.market_stats()['avg_value']
+    assert load_aggregates(aggregates, WEEKS[-1], source_hash=store.snapshot_hash(WEEKS[-1])) is not None
+
+    # Snapshot ditulis ulang (re-run hari yang sama) tanpa membangun ulang agregat
+    df = store.load()
+    df['market_value_est'] *= 2
+    store.write_snapshot(df.drop(columns='snapshot'), snapshot=WEEKS[-1])
+    assert load_aggregates(aggregates, WEEKS[-1], source_hash=store.snapshot_hash(WEEKS[-1])) is None
+    brain = ScoutBrain(store_path=store.root, aggregates_path=aggregates, identity_path=str(tmp_path / 'identity'))
+    assert brain.market_stats()['avg_value'] == 2 * before
+
+    # reprocess: market_value_est dihitung ulang dari market_value_raw, agregat ikut diperbarui
+    reprocess_all(store.root, aggregates_path=aggregates)
+    fresh = load_aggregates(aggregates, WEEKS[-1], source_hash=store.snapshot_hash(WEEKS[-1]))
+    assert fresh is not None
+    brain = ScoutBrain(store_path=store.root, aggregates_path=aggregates, identity_path=str(tmp_path / 'identity'))
+    assert brain.market_stats()['avg_value'] == before
+    assert fresh['league_summary']['total_value'].sum() == brain.df['market_value_est'].sum()
+
+
+def as_plain(df):
+    """Samakan dtype compact (categorical / int kecil) dengan mode default untuk perbandingan"""
+    df = df.copy()
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(df[col]):
+            df[col] = df[col].astype(object)
+        elif pd.api.types.is_integer_dtype(df[col]):
+            df[col] = df[col].astype('int64')
+    return df.reset_index(drop=True)
+
+
+def test_compact_mode_matches_default_mode(tmp_path):
+    store = write_store(tmp_path / 'store')
+    df = store.load()
+    # Value 0 -> market_value_raw "-" juga harus terbentuk ulang dengan benar
+    df.loc[::7, 'market_value_est'] = 0
+    df['market_value_raw'] = format_market_values(df['market_value_est'])
+    store.write_snapshot(df.drop(columns='snapshot'), snapshot=WEEKS[-1])
+    PlayerRegistry(str(tmp_path / 'identity')).update(store_frames(store.root))
+
+    for snapshots in ('latest', None):
+        kwargs = dict(store_path=store.root, snapshots=snapshots, identity_path=str(tmp_path / 'identity'),
+                      aggregates_path=str(tmp_path / 'aggregates'))
+        default, compact = ScoutBrain(**kwargs), ScoutBrain(compact=True, **kwargs)
+        assert compact.memory_report()['total_bytes'] < default.memory_report()['total_bytes']
+        pd.testing.assert_frame_equal(as_plain(compact.df), as_plain(default.df))
+
+        leagues = default.leagues()
+        assert compact.leagues() == leagues and compact.teams_in() == default.teams_in()
+        for filter_ in ({}, {'leagues': leagues[:1]}, {'teams': ['Arema FC'], 'positions': ['Bek', 'Penyerang']}):
+            pd.testing.assert_frame_equal(as_plain(compact.filter(**filter_)), as_plain(default.filter(**filter_)))
+            assert compact.market_stats(**filter_) == default.market_stats(**filter_)
+            pd.testing.assert_frame_equal(as_plain(compact.page(**filter_, sort_by='market_value_raw', offset=5, limit=20)[1]),
+                                          as_plain(default.page(**filter_, sort_by='market_value_raw', offset=5, limit=20)[1]))
+        for league in leagues:
+            for category in ('wonderkid', 'senior'):
+                pd.testing.assert_frame_equal(as_plain(compact.eligible(league, category)), as_plain(default.eligible(league, category)))
+
+        for name in default.df['player_name'].unique()[::5]:
+            pd.testing.assert_frame_equal(as_plain(compact.get_similar_players(name)), as_plain(default.get_similar_players(name)))
+            pd.testing.assert_frame_equal(as_plain(compact.find_similar(name, leagues=['Thailand'], max_age=28)),
+                                          as_plain(default.find_similar(name, leagues=['Thailand'], max_age=28)))
+        pd.testing.assert_frame_equal(as_plain(compact.get_similar_players_batch(team_name='PSM Makassar')),
+                                      as_plain(default.get_similar_players_batch(team_name='PSM Makassar')))
+        for team in default.teams_in():
+            for pos in POSITIONS:
+                pd.testing.assert_frame_equal(as_plain(compact.recommend_for_team_needs(team, pos)),
+                                              as_plain(default.recommend_for_team_needs(team, pos)))
+        pd.testing.assert_frame_equal(as_plain(compact.squad_planner_report()), as_plain(default.squad_planner_report()))
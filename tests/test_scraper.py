@@ -0,0 +1,194 @@
+import glob
+import json
+import os
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.identity import load_ids
+from src.ingest import ChangeSet
+from src.parsers import PARSER_BACKENDS, get_parser
+from src.rate_limiter import TokenBucket
+from src.scraper import RealScout
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'transfermarkt')
+
+
+class SavedPageHandler(SimpleHTTPRequestHandler):
+    """Menyajikan halaman Transfermarkt tersimpan: /a/b/c -> a/b/c.html"""
+
+    def translate_path(self, path):
+        return super().translate_path(path.rstrip('/') + '.html')
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def saved_site():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(SavedPageHandler, directory=FIXTURE_DIR))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_scout(base_url, tmp_path, **kwargs):
+    targets = {
+        'Indonesia': f"{base_url}/super-league/startseite/wettbewerb/IN1L",
+        'Thailand': f"{base_url}/thai-league/startseite/wettbewerb/THA1",
+    }
+    return RealScout(base_url=base_url, targets=targets,
+                     raw_path=str(tmp_path / 'raw'), processed_path=str(tmp_path / 'processed'), **kwargs)
+
+
+def test_concurrent_scrape_matches_sequential(saved_site, tmp_path):
+    sequential = make_scout(saved_site, tmp_path, rate_per_host=1000).scrape_all()
+    concurrent = make_scout(saved_site, tmp_path, concurrency=4, rate_per_host=1000, burst=4).scrape_all()
+
+    key = lambda p: (p['league_country'], p['team'], p['player_name'])
+    assert len(sequential) == 45
+    assert sorted(sequential, key=key) == sorted(concurrent, key=key)
+    assert {p['league_country'] for p in concurrent} == {'Indonesia', 'Thailand'}
+    assert {p['team'] for p in concurrent if p['league_country'] == 'Indonesia'} == {'Arema FC', 'PERSIB Bandung', 'PSM Makassar'}
+
+
+def test_concurrent_scrape_respects_host_rate(saved_site, tmp_path):
+    # 2 halaman liga + 5 halaman tim = 7 request; burst 1 @ 20 req/s -> minimal 6 x 50ms
+    scout = make_scout(saved_site, tmp_path, concurrency=8, rate_per_host=20)
+    start = time.monotonic()
+    players = scout.scrape_all()
+    assert players
+    assert time.monotonic() - start >= 0.3
+
+
+def test_token_bucket_allows_burst_then_throttles():
+    bucket = TokenBucket(rate=50, capacity=3)
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_cache_revalidates_and_replays_offline(saved_site, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    first = make_scout(saved_site, tmp_path, rate_per_host=1000, cache_dir=cache_dir).scrape_all()
+
+    # ttl=0 -> semua entry stale, server (Last-Modified) harus menjawab 304
+    import src.scraper as scraper_module
+    statuses = []
+    real_get = scraper_module.requests.get
+
+    def recording_get(url, headers=None, **kwargs):
+        assert 'If-Modified-Since' in headers
+        response = real_get(url, headers=headers, **kwargs)
+        statuses.append(response.status_code)
+        return response
+
+    monkeypatch.setattr(scraper_module.requests, 'get', recording_get)
+    revalidated = make_scout(saved_site, tmp_path, rate_per_host=1000, cache_dir=cache_dir, cache_ttl=0).scrape_all()
+    assert statuses and set(statuses) == {304}
+    assert revalidated == first
+
+    # Replay: tidak boleh ada request jaringan sama sekali
+    def no_network(*args, **kwargs):
+        raise AssertionError("replay mode tidak boleh request ke server")
+
+    monkeypatch.setattr(scraper_module.requests, 'get', no_network)
+    replayed = make_scout(saved_site, tmp_path, cache_dir=cache_dir, replay=True).scrape_all()
+    assert replayed == first
+
+
+@pytest.mark.parametrize('backend', [b for b in PARSER_BACKENDS if b != 'bs4'])
+def test_parser_backends_extract_identical_records(backend):
+    pages = [open(path, 'rb').read() for path in glob.glob(os.path.join(FIXTURE_DIR, '**', 'verein', '**', '*.html'), recursive=True)]
+    assert pages
+    league_page = open(os.path.join(FIXTURE_DIR, 'super-league', 'startseite', 'wettbewerb', 'IN1L.html'), 'rb').read()
+    reference = get_parser('bs4')
+    parser = get_parser(backend)
+
+    assert parser.team_links(league_page) == reference.team_links(league_page)
+    for page in pages:
+        assert parser.squad(page) == reference.squad(page)
+
+
+def test_run_writes_run_log_and_prometheus_snapshot(saved_site, tmp_path):
+    run_log = tmp_path / 'logs' / 'run.jsonl'
+    metrics_path = tmp_path / 'logs' / 'metrics.prom'
+    scout = make_scout(saved_site, tmp_path, rate_per_host=1000, store_path=str(tmp_path / 'store'),
+                       changeset_path=str(tmp_path / 'changesets'), aggregates_path=str(tmp_path / 'aggregates'),
+                       identity_path=str(tmp_path / 'identity'), run_log=str(run_log), metrics_path=str(metrics_path))
+    scout.run()
+
+    events = [json.loads(line) for line in run_log.read_text(encoding='utf-8').splitlines()]
+    requests_ = [e for e in events if e['event'] == 'http_request']
+    assert len(requests_) == 7
+    assert all(e['status'] == 200 and e['bytes'] > 0 and e['duration_ms'] >= 0 for e in requests_)
+    squads = [e for e in events if e['event'] == 'parse_html' and e['method'] == 'squad']
+    assert sum(e['rows'] for e in squads) == 45
+    # Semua parsing lewat backend get_parser() tetap tercatat di parse_html
+    assert len([e for e in events if e['event'] == 'parse_html' and e['method'] == 'team_links']) == 2
+    assert {e['method'] for e in events if e['event'] == 'parse_html'} == {'team_links', 'squad'}
+    assert events[-1]['event'] == 'run' and events[-1]['rows'] == 45
+    assert {e['stage'] for e in events if e['event'] == 'run_stage'} >= {'scrape', 'dataframe', 'store_write', 'aggregates', 'identity', 'csv_write'}
+    assert (tmp_path / 'aggregates' / f"snapshot={scout.store.latest_snapshot()}" / 'team_summary.parquet').exists()
+    assert len(load_ids(str(tmp_path / 'identity'))) == 45
+
+    prom = metrics_path.read_text(encoding='utf-8')
+    assert 'garuda_scout_http_request_seconds_count{source="network",status="200"} 7' in prom
+    assert 'garuda_scout_parse_html_rows_total{method="squad"} 45' in prom
+
+    # Run ulang di hari yang sama: change set pakai player_id, snapshot yang ditulis ulang di-resolve lagi
+    first_ids = load_ids(str(tmp_path / 'identity'))
+    rerun = make_scout(saved_site, tmp_path, rate_per_host=1000, store_path=str(tmp_path / 'store'),
+                       changeset_path=str(tmp_path / 'changesets'), aggregates_path=str(tmp_path / 'aggregates'),
+                       identity_path=str(tmp_path / 'identity'))
+    rerun.run()
+    change_set = ChangeSet.load(str(tmp_path / 'changesets'), rerun.store.latest_snapshot())
+    assert change_set.summary()['upserts'] == 45 and change_set.new.empty and change_set.departed.empty
+    assert sorted(change_set.upserts['player_id']) == sorted(first_ids['player_id'])
+    assert 'player_id' not in rerun.store.load(columns=None).columns
+    assert load_ids(str(tmp_path / 'identity')).equals(first_ids)
+
+
+def test_resume_fetches_only_failed_teams(saved_site, tmp_path, monkeypatch):
+    import src.scraper as scraper_module
+
+    real_get = scraper_module.requests.get
+    requested = []
+    broken = {'/psm-makassar/'}
+
+    def failing_get(url, **kwargs):
+        requested.append(url)
+        response = real_get(url, **kwargs)
+        if any(part in url for part in broken):
+            response.status_code = 503
+        return response
+
+    monkeypatch.setattr(scraper_module.requests, 'get', failing_get)
+    kwargs = dict(rate_per_host=1000, checkpoint_dir=str(tmp_path / 'checkpoints'), run_id='test',
+                  max_retries=2, backoff_base=0.001)
+
+    first_scout = make_scout(saved_site, tmp_path, **kwargs)
+    first = first_scout.scrape_all()
+    assert len([u for u in requested if '/psm-makassar/' in u]) == 3  # 1 percobaan + 2 retry
+    assert 'PSM Makassar' not in {p['team'] for p in first}
+    # Ingest tidak menganggap PSM keluar: liganya dilaporkan gagal sebagian
+    assert first_scout.failed_leagues == {'Indonesia'}
+
+    # Run berikutnya: liga & tim yang sudah selesai diambil dari checkpoint
+    broken.clear()
+    requested.clear()
+    scout = make_scout(saved_site, tmp_path, **kwargs)
+    resumed = scout.scrape_all()
+    assert len(requested) == 1 and '/psm-makassar/' in requested[0]
+    assert len(resumed) == 45 and scout.failed_leagues == set()
+    assert scout.checkpoint.summary() == {'league': {'done': 2}, 'team': {'done': 5}}
+
@@ -0,0 +1,151 @@
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+import pandas as pd
+import pytest
+
+from src.identity import PlayerRegistry, store_frames
+from src.market_value import format_market_values
+from src.ml_engine import ScoutBrain
+from src.service import PooledHTTPServer, ScoutService, make_handler
+from src.storage import SnapshotStore
+
+PLAYERS = [
+    # nama, tim, liga, posisi, umur, value
+    ('Marc Klok', 'PERSIB Bandung', 'Indonesia', 'Gelandang', 32, 5_220_000_000),
+    ('Beckham Putra', 'PERSIB Bandung', 'Indonesia', 'Gelandang', 23, 3_910_000_000),
+    ('Teja Paku Alam', 'PERSIB Bandung', 'Indonesia', 'Penjaga Gawang', 31, 4_350_000_000),
+    ('Dendi Santoso', 'Arema FC', 'Indonesia', 'Gelandang', 35, 434_540_000),
+    ('Charles Lokolingoy', 'Arema FC', 'Indonesia', 'Penyerang', 30, 6_090_000_000),
+    ('Yuran Fernandes', 'PSM Makassar', 'Indonesia', 'Bek', 30, 6_960_000_000),
+    ('Ananda Raehan', 'PSM Makassar', 'Indonesia', 'Gelandang', 20, 1_740_000_000),
+    ('Supachok Sarachat', 'Buriram United', 'Thailand', 'Gelandang', 27, 17_390_000_000),
+    ('Ekanit Panya', 'BG Pathum United', 'Thailand', 'Gelandang', 25, 8_700_000_000),
+    ('Teerasak Poeiphimai', 'BG Pathum United', 'Thailand', 'Penyerang', 22, 3_040_000_000),
+]
+
+
+@pytest.fixture(scope='module')
+def service_url(tmp_path_factory):
+    root = tmp_path_factory.mktemp('service')
+    df = pd.DataFrame(PLAYERS, columns=['player_name', 'team', 'league', 'position', 'age', 'market_value_est'])
+    df['market_value_raw'] = format_market_values(df['market_value_est'])
+    df['scraped_date'] = '2026-05-04'
+    store = SnapshotStore(str(root / 'store'))
+    store.write_snapshot(df, snapshot='20260504')
+    PlayerRegistry(str(root / 'identity')).update(store_frames(store.root))
+
+    factory = lambda: ScoutBrain(store_path=store.root, identity_path=str(root / 'identity'),
+                                 aggregates_path=str(root / 'aggregates'), compact=True)
+    service = ScoutService(factory, cache_size=64)
+    server = PooledHTTPServer(('127.0.0.1', 0), make_handler(service), workers=4)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", service
+    server.shutdown()
+    server.server_close()
+
+
+def call(base_url, path, params=None, method='GET'):
+    """Return (status, body JSON / teks)"""
+    url = f"{base_url}{path}" + (f"?{urlencode(params)}" if params else '')
+    try:
+        with urlopen(Request(url, method=method), timeout=30) as resp:
+            status, body, content_type = resp.status, resp.read(), resp.headers['Content-Type']
+    except HTTPError as e:
+        status, body, content_type = e.code, e.read(), e.headers['Content-Type']
+    if content_type.startswith('application/json'):
+        return status, json.loads(body)
+    return status, body.decode('utf-8')
+
+
+def test_endpoints_return_json(service_url):
+    base_url, service = service_url
+    assert call(base_url, '/health')[1]['rows'] == len(PLAYERS)
+    assert call(base_url, '/leagues') == (200, ['Indonesia', 'Thailand'])
+    assert call(base_url, '/teams', {'leagues': 'Thailand'}) == (200, ['BG Pathum United', 'Buriram United'])
+    assert call(base_url, '/positions', {'teams': 'PERSIB Bandung'}) == (200, ['Gelandang', 'Penjaga Gawang'])
+
+    status, body = call(base_url, '/filter', {'leagues': 'Indonesia', 'positions': 'Gelandang', 'limit': 2})
+    assert status == 200 and body['total'] == 4 and len(body['rows']) == 2
+
+    status, body = call(base_url, '/market-stats', {'teams': 'Arema FC,PSM Makassar'})
+    assert status == 200 and body['players'] == 4 and body['max_value'] == 6_960_000_000
+    assert call(base_url, '/market-stats', {'teams': 'Tim Antah'})[1]['avg_value'] is None
+
+    status, body = call(base_url, '/similar', {'player': 'Marc Klok', 'top_n': 3})
+    assert status == 200 and len(body['results']) == 3 and 'Marc Klok' not in {r['player_name'] for r in body['results']}
+    status, body = call(base_url, '/similar', {'player': 'Marc Klok', 'top_n': 3, 'leagues': 'Thailand', 'max_age': 26})
+    assert status == 200 and {r['player_name'] for r in body['results']} == {'Ekanit Panya'}
+    player_id = int(service.brain.df.loc[service.brain.df['player_name'] == 'Marc Klok', 'player_id'].iloc[0])
+    assert call(base_url, '/similar', {'player_id': player_id, 'top_n': 3})[1]['results'] == \
+        call(base_url, '/similar', {'player': 'Marc Klok', 'top_n': 3})[1]['results']
+
+    status, body = call(base_url, '/team-needs', {'team': 'Arema FC', 'position': 'Gelandang', 'top_n': 2})
+    assert status == 200 and body['results'] and all(r['team'] != 'Arema FC' for r in body['results'])
+
+    assert call(base_url, '/tidak-ada', method='POST')[0] == 404
+    status, text = call(base_url, '/metrics')
+    assert status == 200 and 'api_request' in text
+
+
+@pytest.mark.parametrize('path, params', [
+    ('/similar', {}),
+    ('/similar', {'player': 'Marc Klok', 'top_n': 0, 'max_age': 25}),
+    ('/similar', {'player': 'Marc Klok', 'top_n': -2}),
+    ('/similar', {'player': 'Marc Klok', 'top_n': 'abc'}),
+    ('/similar', {'player': 'Marc Klok', 'top_n': '1.5'}),
+    ('/similar', {'player': 'Marc Klok', 'max_age': 'tua'}),
+    ('/similar', {'player_id': 'x'}),
+    ('/team-needs', {'team': 'Arema FC'}),
+    ('/team-needs', {'team': 'Arema FC', 'position': 'Bek', 'top_n': 0}),
+    ('/filter', {'limit': 'semua'}),
+])
+def test_invalid_parameters_return_400(service_url, path, params):
+    status, body = call(service_url[0], path, params)
+    assert status == 400 and 'error' in body
+
+
+@pytest.mark.parametrize('path, params', [
+    ('/tidak-ada', {}),
+    ('/similar', {'player': 'Pemain Antah'}),
+    ('/similar', {'player_id': 99999}),
+    ('/team-needs', {'team': 'Tim Antah', 'position': 'Bek'}),
+])
+def test_unknown_resources_return_404(service_url, path, params):
+    status, body = call(service_url[0], path, params)
+    assert status == 404 and 'error' in body
+
+
+def test_unexpected_errors_return_json_500(service_url, monkeypatch):
+    base_url, service = service_url
+
+    def broken(*args, **kwargs):
+        raise ValueError("index rusak")
+
+    monkeypatch.setattr(service.brain, 'get_similar_players', broken)
+    status, body = call(base_url, '/similar', {'player': 'Beckham Putra', 'top_n': 4})
+    assert status == 500 and 'index rusak' in body['error']
+    # Server tetap melayani request berikutnya
+    assert call(base_url, '/leagues')[0] == 200
+
+
+def test_repeated_queries_are_served_from_cache_until_reload(service_url):
+    base_url, service = service_url
+    params = {'team': 'PSM Makassar', 'position': 'Penyerang', 'top_n': 3}
+    first = call(base_url, '/team-needs', params)
+    hits = service.cache.stats()['hits']
+    assert call(base_url, '/team-needs', params) == first
+    assert service.cache.stats()['hits'] == hits + 1
+    assert service.handle('/team-needs', {k: [str(v)] for k, v in params.items()})[2] == 'cache'
+
+    # Error tidak di-cache
+    call(base_url, '/similar', {'player': 'Pemain Antah'})
+    assert service.handle('/similar', {'player': ['Pemain Antah']})[2] == 'error'
+
+    status, body = call(base_url, '/reload', {'force': 1}, method='POST')
+    assert status == 200 and body['reloaded'] and body['cache']['entries'] == 0
+    assert service.handle('/team-needs', {k: [str(v)] for k, v in params.items()})[2] == 'brain'
+    assert call(base_url, '/reload', method='POST')[1]['reloaded'] is False
@@ -0,0 +1,110 @@
+import pandas as pd
+
+import src.storage as storage
+from src.storage import SnapshotStore
+
+
+def squad(rows, scraped_date='2026-01-05'):
+    """rows: list (nama, tim, liga, posisi, umur, value)"""
+    df = pd.DataFrame(rows, columns=['player_name', 'team', 'league_country', 'position', 'age', 'market_value_est'])
+    df['market_value_raw'] = '-'
+    df['scraped_date'] = scraped_date
+    return df
+
+
+PLAYERS = [
+    ('Marc Klok', 'PERSIB Bandung', 'Indonesia', 'Gelandang', 32, 5_220_000_000),
+    ('Dendi Santoso', 'Arema FC', 'Indonesia', 'Gelandang', 35, 434_540_000),
+    ('Supachok Sarachat', 'Buriram United', 'Thailand', 'Gelandang', 27, 17_390_000_000),
+]
+
+
+def test_snapshot_hash_comes_from_manifest_until_files_change(tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path))
+    store.write_snapshot(squad(PLAYERS), snapshot='20260105')
+    expected = store._hash_files('20260105')
+
+    # Manifest cocok dengan stat file -> Parquet tidak dibaca ulang
+    monkeypatch.setattr(SnapshotStore, '_hash_files', lambda self, snapshot: 'dibaca ulang')
+    assert store.snapshot_hash('20260105') == expected
+    monkeypatch.undo()
+
+    # Manifest tidak ada (snapshot lama) atau file diubah di luar write_snapshot -> hash ulang
+    (tmp_path / 'snapshot=20260105' / storage.MANIFEST_FILE).unlink()
+    assert store.snapshot_hash('20260105') == expected
+    store.write_snapshot(squad(PLAYERS), snapshot='20260105')
+    part = next((tmp_path / 'snapshot=20260105').glob('league=Thailand/*.parquet'))
+    squad(PLAYERS[2:]).drop(columns='league_country').to_parquet(part)
+    assert store.snapshot_hash('20260105') == store._hash_files('20260105') != expected
+    # Manifest tidak ikut terbaca sebagai data
+    assert len(store.load()) == 3
+
+
+def test_write_load_round_trip(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    assert not store.exists() and store.latest_snapshot() is None
+    assert store.write_snapshot(squad(PLAYERS)) == '20260105'  # ID dari scraped_date
+    store.write_snapshot(squad(PLAYERS[:2], scraped_date='2026-01-12'))
+    assert store.snapshots() == ['20260105', '20260112']
+
+    df = store.load()
+    assert df['snapshot'].unique().tolist() == ['20260112']
+    assert sorted(df['player_name']) == ['Dendi Santoso', 'Marc Klok']
+    history = store.load(snapshots=None).sort_values(['snapshot', 'player_name']).reset_index(drop=True)
+    first = history[history['snapshot'] == '20260105']
+    assert first[['player_name', 'team', 'league', 'position', 'age', 'market_value_est']].values.tolist() == \
+        sorted([list(p) for p in PLAYERS])
+    assert history['market_value_est'].dtype == 'int64'
+    assert not isinstance(history['team'].dtype, pd.CategoricalDtype)
+    assert isinstance(store.load(as_category=True)['team'].dtype, pd.CategoricalDtype)
+
+
+def test_league_and_column_pushdown(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.write_snapshot(squad(PLAYERS), snapshot='20260105')
+    store.write_snapshot(squad(PLAYERS), snapshot='20260112')
+
+    thai = store.load(snapshots=['20260105'], leagues=['Thailand'], columns=['player_name', 'market_value_est'])
+    assert thai.columns.tolist() == ['player_name', 'market_value_est']
+    assert thai['player_name'].tolist() == ['Supachok Sarachat']
+    young = store.load(snapshots=None, filter=storage.ds.field('age') < 30, columns=['player_name', 'snapshot'])
+    assert sorted(young['snapshot']) == ['20260105', '20260112']
+    assert store.columns() == [c for c in storage.COLUMNS]
+
+
+def test_rewriting_a_snapshot_removes_partitions_of_dropped_leagues(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.write_snapshot(squad(PLAYERS), snapshot='20260105')
+    first_hash = store.snapshot_hash('20260105')
+
+    # Re-run: liga Thailand tidak ikut lagi -> partisi lamanya harus hilang
+    store.write_snapshot(squad(PLAYERS[:2]), snapshot='20260105')
+    assert sorted(p.name for p in (tmp_path / 'snapshot=20260105').iterdir() if p.is_dir()) == ['league=Indonesia']
+    assert sorted(store.load()['league']) == ['Indonesia', 'Indonesia']
+    assert store.snapshot_hash('20260105') != first_hash
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['snapshot=20260105']  # tanpa folder sementara
+
+
+def test_migrate_csvs_writes_snapshots_and_resolves_identity(tmp_path):
+    from src.identity import load_ids
+
+    raw = tmp_path / 'raw'
+    raw.mkdir()
+    squad(PLAYERS).to_csv(raw / 'real_scout_20260105.csv', index=False)
+    squad(PLAYERS[:2], scraped_date='2026-01-12').to_csv(raw / 'real_scout_20260112.csv', index=False)
+    (raw / 'catatan.csv').write_text('bukan snapshot')
+
+    store = SnapshotStore(str(tmp_path / 'store'))
+    identity = str(tmp_path / 'identity')
+    assert store.migrate_csvs(str(raw), identity) == [('20260105', 3), ('20260112', 2)]
+    assert store.snapshots() == ['20260105', '20260112']
+    assert len(store.load(snapshots=None)) == 5
+    ids = load_ids(identity)
+    assert len(ids) == 5 and ids.groupby('player_name')['player_id'].nunique().eq(1).all()
+
+    # Migrasi ulang dengan CSV yang diperbaiki -> snapshot ditulis ulang & player_id ikut di-resolve ulang
+    squad(PLAYERS[:2] + [('Teja Paku Alam', 'PERSIB Bandung', 'Indonesia', 'Penjaga Gawang', 31, 4_350_000_000)],
+          scraped_date='2026-01-12').to_csv(raw / 'real_scout_20260112.csv', index=False)
+    store.migrate_csvs(str(raw), identity)
+    latest = load_ids(identity, ['20260112'])
+    assert len(latest) == 3 and (latest['player_id'] >= 0).all()
@@ -0,0 +1,95 @@
+import os
+
+import pandas as pd
+
+from src.identity import PlayerRegistry, store_frames
+from src.storage import SnapshotStore, fingerprint
+from src.timeseries import ValueTimeSeries
+
+
+def week(values, team='PERSIB Bandung'):
+    """values: {nama: market_value_est}"""
+    return pd.DataFrame({
+        'player_name': list(values),
+        'team': team,
+        'league': 'Indonesia',
+        'position': 'Gelandang',
+        'age': 25,
+        'market_value_raw': '-',
+        'market_value_est': list(values.values()),
+        'scraped_date': '2026-01-05',
+    })
+
+
+def resolve(store, identity):
+    """Entity resolution seperti yang dijalankan scraper / migrate setelah menulis snapshot"""
+    PlayerRegistry(identity).update(store_frames(store.root))
+
+
+def history(trends, name):
+    ids = trends.ids_for(name)
+    assert len(ids) == 1
+    return trends.history(ids[0])
+
+
+def test_refresh_appends_new_weeks_and_rereads_rewritten_snapshots(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'store'))
+    identity = str(tmp_path / 'identity')
+    store.write_snapshot(week({'Marc Klok': 100, 'Beckham': 200}), snapshot='20260105')
+    store.write_snapshot(week({'Marc Klok': 110, 'Beckham': 200}), snapshot='20260112')
+    resolve(store, identity)
+    trends = ValueTimeSeries(store.root, identity_path=identity)
+    assert trends.key == 'player_id'
+    assert history(trends, 'Marc Klok').tolist() == [100, 110]
+    assert history(trends, 'Marc Klok').name == 'Marc Klok'
+    assert trends.refresh() == 0
+
+    store.write_snapshot(week({'Marc Klok': 120, 'Beckham': 210}), snapshot='20260119')
+    resolve(store, identity)
+    assert trends.refresh() == 1
+    assert history(trends, 'Beckham').tolist() == [200, 200, 210]
+
+    # Re-run di hari yang sama / reprocess menulis ulang snapshot yang sudah dibaca.
+    # Sebelum di-resolve ulang: fallback ke nama, registry tidak ditulis dari sini.
+    store.write_snapshot(week({'Marc Klok': 150, 'Beckham': 210, 'Teja': 50}), snapshot='20260119')
+    before = fingerprint(identity)
+    assert trends.refresh() == 3
+    assert fingerprint(identity) == before
+    assert trends.key == 'player_name'
+    assert history(trends, 'Teja').isna().tolist() == [True, True, False]
+    assert trends.refresh() == 0
+
+    resolve(store, identity)
+    assert trends.refresh() == 3
+    assert trends.key == 'player_id'
+    assert history(trends, 'Marc Klok').tolist() == [100, 110, 150]
+    assert history(trends, 'Teja').isna().tolist() == [True, True, False]
+    klok = trends.ids_for('Marc Klok')[0]
+    assert trends.velocity(weeks=1).loc[klok, 'change'] == 40
+
+
+def test_unresolved_store_falls_back_to_names_without_writing_identity(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'store'))
+    store.write_snapshot(week({'Marc Klok': 100}), snapshot='20260105')
+    store.write_snapshot(week({'Marc Klok': 110}), snapshot='20260112')
+    trends = ValueTimeSeries(store.root, identity_path=str(tmp_path / 'identity'))
+    assert trends.key == 'player_name'
+    assert trends.history('Marc Klok').tolist() == [100, 110]
+    assert trends.velocity(weeks=1).index.name == 'player_name'
+    assert not os.path.exists(tmp_path / 'identity')
+
+
+def test_namesakes_in_the_same_week_keep_separate_histories(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'store'))
+    for snapshot, persib, arema in [('20260105', 100, 900), ('20260112', 110, 800)]:
+        both = pd.concat([week({'Ricky Kambuaya': persib}), week({'Ricky Kambuaya': arema}, team='Arema FC')])
+        store.write_snapshot(both, snapshot=snapshot)
+    resolve(store, str(tmp_path / 'identity'))
+    trends = ValueTimeSeries(store.root, identity_path=str(tmp_path / 'identity'))
+
+    ids = trends.ids_for('Ricky Kambuaya')
+    assert len(ids) == 2
+    by_team = {trends.players.at[pid, 'team']: trends.history(pid).tolist() for pid in ids}
+    assert by_team == {'PERSIB Bandung': [100, 110], 'Arema FC': [900, 800]}
+    velocity = trends.velocity(weeks=1)
+    assert sorted(velocity.loc[ids, 'change']) == [-100, 10]